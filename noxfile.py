@@ -41,11 +41,27 @@ def tests(session: nox.Session) -> None:
     """
     Run the unit and regular tests.
     """
-    test_grp = nox.project.dependency_groups(PYPROJECT, "test")
+    test_grp = nox.project.dependency_groups(PYPROJECT, "test", "corpus")
     session.install("-e.", *test_grp)
     session.run("pytest", "-nauto", *session.posargs, env={"COVERAGE_CORE": "sysmon"})
 
 
+@nox.session(default=False)
+def downstream(session: nox.Session) -> None:
+    """
+    Check real projects cloned from GitHub (needs network access).
+    """
+    test_grp = nox.project.dependency_groups(PYPROJECT, "test")
+    session.install("-e.", *test_grp)
+    session.run(
+        "pytest",
+        "-nauto",
+        "tests/test_downstream.py",
+        *session.posargs,
+        env={"CHECK_SDIST_DOWNSTREAM": "1"},
+    )
+
+
 @nox.session(default=False)
 def coverage(session: nox.Session) -> None:
     """
@@ -62,6 +78,26 @@ def coverage(session: nox.Session) -> None:
     tests(session)
 
 
+@nox.session(default=False, python="3.15")
+def startup(session: nox.Session) -> None:
+    """
+    Check which modules the CLI imports at startup (needs lazy imports).
+    """
+    test_grp = nox.project.dependency_groups(PYPROJECT, "test")
+    session.install("-e.", *test_grp)
+    session.run("pytest", "tests/test_startup.py", *session.posargs)
+
+
+@nox.session(default=False)
+def benchmark(session: nox.Session) -> None:
+    """
+    Time the comparison stages on generated repositories. Pass sizes with
+    ``-- --files 1000 1000000``.
+    """
+    session.install("-e.")
+    session.run("python", "scripts/benchmark.py", *session.posargs)
+
+
 @nox.session(venv_backend="uv", default=False, python="3.9")
 def minimums(session: nox.Session) -> None:
     """
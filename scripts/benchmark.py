@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Time the stages of check-sdist's comparison on generated repositories, without
+building anything. For each size, this writes a git index and a matching SDist
+tarball with a realistic layout, then measures listing git files, reading the
+SDist, the backends' exclude filters, and the comparison itself with each
+configured backend's pattern mix. Each stage reports its best wall time and
+its peak Python memory (from tracemalloc, in a separate run).
+
+Run with check-sdist installed, such as with ``nox -s benchmark -- --files
+1000 1000000``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import io
+import random
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from check_sdist import git, patterns
+from check_sdist.backends import Backend, resolve_backend
+from check_sdist.backends._base import glob_filter, pathspec_filter
+from check_sdist.patterns import compile_patterns, ignore_patterns
+from check_sdist.sdist import archive_files
+
+#: git's hash of an empty file; the index entries don't need real objects
+EMPTY_BLOB = "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+
+#: Excludes in each backend's own configuration, matching generate_files()
+EXCLUDES = ["docs/**/*.rst", "tests/**/data", "*.ipynb", ".github"]
+
+#: The [tool] tables for each backend (by entry point name), using its excludes
+BACKEND_CONFIG: dict[str, dict[str, Any]] = {
+    "none": {},
+    "setuptools.build_meta": {
+        "setuptools_scm": {"version_file": "src/pkg/_version.py"}
+    },
+    "flit_core.buildapi": {"flit": {"sdist": {"exclude": EXCLUDES}}},
+    "hatchling.build": {
+        "hatch": {
+            "build": {
+                "targets": {"sdist": {"exclude": EXCLUDES}},
+                "hooks": {"vcs": {"version-file": "src/pkg/_version.py"}},
+            }
+        }
+    },
+    "scikit_build_core.build": {
+        "scikit-build": {
+            "sdist": {"exclude": EXCLUDES},
+            "generate": [{"path": "src/pkg/_version.py"}],
+        }
+    },
+    "pdm.backend": {
+        "pdm": {
+            "build": {"excludes": EXCLUDES},
+            "version": {"write_to": "src/pkg/_version.py"},
+        }
+    },
+    "poetry.core.masonry.api": {"poetry": {"exclude": EXCLUDES}},
+    "maturin": {"maturin": {"exclude": EXCLUDES}},
+    "uv_build": {"uv": {"build-backend": {"source-exclude": EXCLUDES}}},
+}
+
+#: How deep packages nest, and how likely a new directory or a data file is
+MAX_DEPTH = 6
+NEW_DIR = 0.05
+DATA_FILE = 0.2
+
+#: check-sdist's own configuration, shared by all backends
+CHECK_SDIST = {
+    "git-only": ["docs", "tests/**/data", "*.ipynb", ".github", "/noxfile.py"],
+    "sdist-only": ["src/pkg/_version.py"],
+}
+
+
+def generate_files(count: int, *, seed: int = 0) -> list[str]:
+    """
+    Return *count* file paths laid out like a large project: a package several
+    levels deep, tests with data directories, docs, and a few top-level files.
+    """
+    rng = random.Random(seed)
+    files = [
+        ".github/workflows/ci.yml",
+        ".gitignore",
+        "README.md",
+        "noxfile.py",
+        "pyproject.toml",
+    ]
+    dirs = {"src/pkg": 0, "tests": 0, "docs": 0}
+    while len(files) < count:
+        parent = rng.choice(list(dirs))
+        depth = parent.count("/")
+        if depth < MAX_DEPTH and rng.random() < NEW_DIR:
+            dirs[f"{parent}/{'sub' if depth else 'mod'}{len(dirs)}"] = 0
+            continue
+        if parent.startswith("tests") and rng.random() < DATA_FILE:
+            dirs.setdefault(f"{parent}/data", 0)
+            parent = f"{parent}/data"
+            ext = rng.choice([".json", ".txt", ".bin"])
+        elif parent.startswith("docs"):
+            ext = rng.choice([".md", ".rst", ".rst", ".ipynb", ".png"])
+        else:
+            ext = rng.choice([".py", ".py", ".py", ".pyi", ".json", ".c"])
+        dirs[parent] += 1
+        files.append(f"{parent}/f{dirs[parent]}{ext}")
+    return files
+
+
+def write_repo(path: Path, files: list[str]) -> None:
+    """Create a git repository whose index lists *files*, without writing them."""
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    entries = "".join(f"100644 {EMPTY_BLOB}\t{f}\n" for f in files)
+    subprocess.run(
+        ["git", "update-index", "--add", "--index-info"],
+        cwd=path,
+        input=entries.encode(),
+        check=True,
+    )
+
+
+def write_sdist(path: Path, files: list[str]) -> None:
+    """Write an SDist holding *files* (all empty) in a ``pkg-1.0`` directory."""
+    with tarfile.open(path, "w:gz", compresslevel=1) as tar:
+        for name in ["PKG-INFO", *files]:
+            info = tarfile.TarInfo(f"pkg-1.0/{name}")
+            tar.addfile(info, io.BytesIO())
+
+
+def compare_stage(
+    pyproject: dict[str, Any],
+    backend: Backend,
+    sdist: frozenset[str],
+    git_listed: frozenset[str],
+    source_dir: Path,
+) -> Callable[[], object]:
+    """The matching logic of compare(), once the file lists are known."""
+
+    def stage() -> object:
+        sdist_patterns, git_patterns = ignore_patterns(pyproject, backend)
+        sdist_matcher = compile_patterns(sdist_patterns)
+        git_matcher = compile_patterns(git_patterns)
+        sdist_only = sdist_matcher.filter(sdist - git_listed)
+        git_only = git_matcher.filter(git_listed - sdist)
+        return sdist_only, backend.git_only_excludes(pyproject, git_only, source_dir)
+
+    return stage
+
+
+def clear_caches() -> None:
+    git._INDEX_CACHE.clear()  # noqa: SLF001
+    patterns._compile.cache_clear()  # noqa: SLF001
+
+
+def measure(stage: Callable[[], object], *, repeat: int) -> tuple[float, int]:
+    """Return the best wall time in seconds, and the peak memory in bytes."""
+    best = float("inf")
+    for _ in range(repeat):
+        clear_caches()
+        gc.collect()
+        start = time.perf_counter()
+        stage()
+        best = min(best, time.perf_counter() - start)
+
+    clear_caches()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def benchmark(count: int, work_dir: Path, *, repeat: int) -> None:
+    files = generate_files(count)
+    source_dir = work_dir / f"repo-{count}"
+    sdist_path = work_dir / f"pkg-{count}.tar.gz"
+
+    start = time.perf_counter()
+    write_repo(source_dir, files)
+    # The SDist drops what the backends exclude and adds a generated file
+    kept = pathspec_filter(EXCLUDES, frozenset(files))
+    write_sdist(sdist_path, [*sorted(kept), "src/pkg/_version.py"])
+    print(f"\n{count:,} files (generated in {time.perf_counter() - start:.1f}s)")
+
+    git_listed = git.git_files(source_dir)
+    sdist = archive_files(sdist_path) - {"PKG-INFO"}
+    stages: dict[str, Callable[[], object]] = {
+        "git_files": lambda: git.git_files(source_dir),
+        "archive_files": lambda: archive_files(sdist_path),
+        "glob_filter": lambda: glob_filter(EXCLUDES, git_listed, source_dir),
+        "pathspec_filter": lambda: pathspec_filter(EXCLUDES, git_listed),
+    }
+    # Aliases and third-party plugins have no configuration here
+    for name, config in BACKEND_CONFIG.items():
+        pyproject = {"tool": {"check-sdist": CHECK_SDIST, **config}}
+        stages[f"compare [{name}]"] = compare_stage(
+            pyproject, resolve_backend(name, {}), sdist, git_listed, source_dir
+        )
+
+    width = max(map(len, stages))
+    print(f"{'stage':<{width}}  {'time':>10}  {'peak memory':>12}")
+    for name, stage in stages.items():
+        seconds, peak = measure(stage, repeat=repeat)
+        print(f"{name:<{width}}  {seconds * 1000:>8.1f}ms  {peak / 2**20:>9.1f}MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--files",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000],
+        help="Repository sizes to generate (default: 1000 10000 100000)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per stage; the best time is reported (default: 3)",
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        help="Where to generate repositories, kept afterwards (default: temporary)",
+    )
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        work_dir = args.work_dir or Path(
+            stack.enter_context(tempfile.TemporaryDirectory())
+        )
+        work_dir.mkdir(parents=True, exist_ok=True)
+        for count in args.files:
+            benchmark(count, work_dir, repeat=args.repeat)
+
+    with contextlib.suppress(ImportError):
+        # pylint: disable-next=import-outside-toplevel
+        import resource  # noqa: PLC0415
+
+        # Kilobytes on Linux, bytes on macOS
+        scale = 2**20 if sys.platform == "darwin" else 2**10
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"\nProcess high-water mark: {maxrss / scale:.0f}MiB")
+
+
+if __name__ == "__main__":
+    main()
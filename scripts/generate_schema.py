@@ -26,6 +26,11 @@ properties:
     type: array
     items:
       type: string
+  wheel-only:
+    description: Files that are only in the wheel, checked with --wheel. Gitignore style lines.
+    type: array
+    items:
+      type: string
   default-ignore:
     description: Ignore some common files
     default: true
@@ -40,6 +45,10 @@ properties:
     enum:
       - git
       - all
+  respect-gitignore:
+    description: In "all" mode, skip files ignored by .gitignore files.
+    default: false
+    type: boolean
   build-backend:
     description: What to expect as build-backend, in order to look for exclude lists. Any backend registered via the "check_sdist.backends" entry-point group is also accepted.
     default: auto
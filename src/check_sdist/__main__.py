@@ -3,36 +3,77 @@ from __future__ import annotations
 __lazy_modules__ = [
     "argparse",
     "check_sdist._compat",
+    "check_sdist._storage",
     "check_sdist.backends",
+    "check_sdist.batch",
     "check_sdist.git",
+    "check_sdist.incremental",
     "check_sdist.inject",
-    "check_sdist.resources",
+    "check_sdist.patterns",
+    "check_sdist.report",
     "check_sdist.sdist",
+    "check_sdist.shadow",
+    "check_sdist.store",
+    "check_sdist.timings",
+    "check_sdist.walk",
+    "check_sdist.watch",
+    "concurrent.futures",
     "contextlib",
+    "itertools",
     "pathlib",
-    "pathspec",
+    "shutil",
+    "sys",
+    "tempfile",
     "typing",
 ]
 
 import argparse
+import concurrent.futures
 import contextlib
+import itertools
+import shutil
+import sys
+import tempfile
 from pathlib import Path
-from typing import Literal
-
-import pathspec
+from typing import Any, Literal
 
 from check_sdist import __version__
 from check_sdist._compat import tomllib
-from check_sdist.backends import resolve_backend
-from check_sdist.git import git_files
+from check_sdist._storage import cache_dir
+from check_sdist.backends import SdistLister, SdistPredictor, resolve_backend
+from check_sdist.batch import compare_many, read_manifest
+from check_sdist.git import git_blobs, git_files
+from check_sdist.incremental import record_check, reuse_listing, staged_unaffected
 from check_sdist.inject import inject_junk_files
-from check_sdist.resources import resources
-from check_sdist.sdist import get_uv, sdist_files
+from check_sdist.patterns import (
+    compile_patterns,
+    ignore_patterns,
+    wheel_ignore_patterns,
+)
+from check_sdist.report import file_record, write_report
+from check_sdist.sdist import (
+    archive_blobs,
+    archive_files,
+    find_sdist,
+    get_uv,
+    sdist_files,
+    wheel_files,
+    wheel_only_files,
+)
+from check_sdist.shadow import shadow_tree
+from check_sdist.store import DirectoryStore, last_check_key, sdist_key
+from check_sdist.timings import Timings
+from check_sdist.walk import walk_files
+from check_sdist.watch import watch
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from check_sdist.backends import Backend
+    from check_sdist.patterns import Matcher
+    from check_sdist.store import Store
+
 
 def select_installer(
     installer: Literal["pip", "uv", "uv|pip"],
@@ -52,67 +93,356 @@ def select_installer(
     return "pip"
 
 
-def compare(
+def load_pyproject(source_dir: Path) -> dict[str, Any]:
+    """Read ``pyproject.toml`` from the source directory, empty if missing."""
+    pyproject_toml = source_dir.joinpath("pyproject.toml")
+    pyproject: dict[str, Any] = {}
+    with contextlib.suppress(FileNotFoundError), pyproject_toml.open("rb") as f:
+        pyproject = tomllib.load(f)
+    return pyproject
+
+
+def predict_sdist(
+    source_dir: Path, *, pyproject: dict[str, Any], backend: Backend
+) -> frozenset[str] | None:
+    """
+    Predict the files in the SDist from the files git tracks, if the backend
+    can (see :class:`check_sdist.backends.SdistPredictor`), otherwise None.
+    """
+    if not isinstance(backend, SdistPredictor):
+        return None
+    config = pyproject.get("tool", {}).get("check-sdist", {})
+    recurse_submodules = config.get("recurse-submodules", True)
+    files = git_files(source_dir, recurse_submodules=recurse_submodules)
+    return backend.predict_sdist_files(pyproject, files, source_dir)
+
+
+def _stored_sdist(
     source_dir: Path,
+    store: Store,
+    key: str | None,
+    last_key: str,
     *,
+    pyproject: dict[str, Any],
+    backend: Backend,
+) -> frozenset[str] | None:
+    """Look up the SDist's files for the current state, or reuse the last check's."""
+    listed = store.get(key) if key else None
+    if listed is None:
+        listed = reuse_listing(
+            store.get_record(last_key), source_dir, pyproject=pyproject, backend=backend
+        )
+    return listed
+
+
+def _look_up(
+    source_dir: Path,
+    store: Store,
+    *,
+    pyproject: dict[str, Any],
+    backend: Backend,
     isolated: bool,
-    verbose: bool = False,
-    installer: Literal["uv", "pip", "uv|pip"] = "uv|pip",
-) -> int:
+    installer: Literal["uv", "pip"],
+    reuse_env: bool,
+    shadow: bool,
+    refresh: bool,
+) -> tuple[str | None, str | None, frozenset[str] | None]:
     """
-    Compare the files in the SDist with the files tracked by git.
+    Return the store keys for this SDist and the last check (None if they
+    can't be known), and the stored listing, unless *refresh*.
+    """
+    key = sdist_key(
+        source_dir,
+        pyproject=pyproject,
+        backend=backend,
+        isolated=isolated,
+        installer=installer,
+        reuse_env=reuse_env,
+        shadow=shadow,
+    )
+    last_key = last_check_key(
+        source_dir,
+        pyproject=pyproject,
+        backend=backend,
+        isolated=isolated,
+        installer=installer,
+        reuse_env=reuse_env,
+        shadow=shadow,
+    )
+    if refresh or last_key is None:
+        return key, last_key, None
+    stored = _stored_sdist(
+        source_dir, store, key, last_key, pyproject=pyproject, backend=backend
+    )
+    return key, last_key, stored
 
-    Takes the source directory and a flag indicating whether the SDist should
-    be built in an isolated environment.
 
-    Return 0 if they match, 1 if the SDist has files that are not tracked by
-    git, 2 if the SDist is missing files that are tracked by git, and 3 if both
-    conditions are true.
+def _store(
+    source_dir: Path,
+    store: Store,
+    key: str | None,
+    last_key: str,
+    listed: frozenset[str],
+) -> None:
+    """Keep a built SDist's files, and a record of this check, in the store."""
+    if key:
+        store.put(key, listed)
+    record = record_check(source_dir, listed)
+    if record:
+        store.put_record(last_key, record)
+
+
+def list_sdist(
+    source_dir: Path,
+    *,
+    pyproject: dict[str, Any],
+    backend: Backend,
+    isolated: bool,
+    installer: Literal["uv", "pip"],
+    reuse_env: bool = False,
+    store: Store | None = None,
+    refresh_cache: bool = False,
+    build_dir: Path | None = None,
+    timings: Timings | None = None,
+    shadow: bool = False,
+    inject_junk: bool = False,
+    keep_dir: Path | None = None,
+    predict: bool = False,
+    build: bool = False,
+) -> frozenset[str]:
+    """
+    Return the files in the SDist, including ``PKG-INFO``: predicted if
+    ``predict`` and the backend can, from the ``store`` if it has them or if
+    nothing changed since the last check could change them, from the backend
+    if it can list them, or by building it. With ``build``, it's always built,
+    and with ``keep_dir`` too, and the archive is moved there. The other
+    options are described in compare().
     """
 
-    resolved_installer = select_installer(installer)
+    timings = timings or Timings()
+    build = build or keep_dir is not None
+    if predict and not build:
+        with timings.phase("predict SDist"):
+            predicted = predict_sdist(source_dir, pyproject=pyproject, backend=backend)
+        if predicted is not None:
+            return predicted
 
-    pyproject = {}
-    config = {}
-    pyproject_toml = source_dir.joinpath("pyproject.toml")
-    with contextlib.suppress(FileNotFoundError), pyproject_toml.open("rb") as f:
-        pyproject = tomllib.load(f)
-        config = pyproject.get("tool", {}).get("check-sdist", {})
+    key = last_key = None
+    if store is not None:
+        with timings.phase("look up stored SDist"):
+            key, last_key, stored = _look_up(
+                source_dir,
+                store,
+                pyproject=pyproject,
+                backend=backend,
+                isolated=isolated,
+                installer=installer,
+                reuse_env=reuse_env,
+                shadow=shadow,
+                refresh=refresh_cache or build,
+            )
+        if stored is not None:
+            return stored
 
-    sdist_only_patterns = set(config.get("sdist-only", []))
-    git_only_patterns = set(config.get("git-only", []))
-    default_ignore = config.get("default-ignore", True)
-    recurse_submodules = config.get("recurse-submodules", True)
-    mode = config.get("mode", "git")
-    backend = resolve_backend(config.get("build-backend", "auto"), pyproject)
+    with contextlib.ExitStack() as stack:
+        build_source = source_dir
+        if shadow:
+            with timings.phase("copy to shadow tree"):
+                build_source = stack.enter_context(
+                    shadow_tree(source_dir, build_dir=build_dir)
+                )
+        if inject_junk:
+            stack.enter_context(inject_junk_files(build_source))
 
-    sdist = sdist_files(source_dir, isolated=isolated, installer=resolved_installer) - {
-        "PKG-INFO"
-    }
-    if mode == "git":
+        # Ask the backend for a listing if it can, otherwise build the SDist
+        listed = None
+        if not build and isinstance(backend, SdistLister):
+            with timings.phase("list SDist from backend"):
+                listed = backend.list_sdist_files(pyproject, build_source)
+        if listed is None:
+            listed = sdist_files(
+                build_source,
+                isolated=isolated,
+                installer=installer,
+                reuse_env=reuse_env,
+                build_dir=build_dir,
+                timings=timings,
+                keep_dir=keep_dir,
+            )
+            if store and last_key:
+                with timings.phase("store SDist"):
+                    _store(source_dir, store, key, last_key, listed)
+    return listed
+
+
+def _prepare(
+    source_dir: Path,
+    *,
+    pyproject: dict[str, Any],
+    backend: Backend,
+    list_git: bool,
+    recurse_submodules: bool,
+    timings: Timings,
+) -> tuple[Matcher, Matcher, Matcher, frozenset[str] | None]:
+    """
+    The parts of :func:`compare` that don't need the SDist, run in the
+    background while it's built: the SDist only, git only, and wheel only
+    matchers, and the files tracked by git if ``list_git``.
+    """
+    with timings.phase("compile patterns", background=True):
+        sdist_only_patterns, git_only_patterns = ignore_patterns(pyproject, backend)
+        sdist_matcher = compile_patterns(sdist_only_patterns)
+        git_matcher = compile_patterns(git_only_patterns)
+        wheel_matcher = compile_patterns(wheel_ignore_patterns(pyproject))
+    matchers = sdist_matcher, git_matcher, wheel_matcher
+    if not list_git:
+        return *matchers, None
+    with timings.phase("list git files", background=True):
         git = git_files(source_dir, recurse_submodules=recurse_submodules)
-    elif mode == "all":
-        git = frozenset(
-            str(p.relative_to(source_dir)) for p in source_dir.rglob("*") if p.is_file()
-        )
-    else:
-        msg = "Only 'all' and 'git' supported for 'mode'"
-        raise ValueError(msg)
+    return *matchers, git
+
 
-    if default_ignore:
-        with resources.joinpath("default-ignore.txt").open("r", encoding="utf-8") as f:
-            git_only_patterns.update(f.read().splitlines())
-        sdist_only_patterns.add("*.dist-info")
-        sdist_only_patterns.update(backend.sdist_only_ignores(pyproject))
+def _walk(
+    source_dir: Path, sdist: frozenset[str], git_matcher: Matcher, *, gitignore: bool
+) -> frozenset[str]:
+    """List all the files for the "all" mode, skipping ignored directories."""
+    # Skipping an ignored directory is only safe if nothing in it is in the
+    # SDist, otherwise those files would become SDist only
+    sdist_dirs = {p[:i] for p in sdist for i, c in enumerate(p) if c == "/"}
+    return walk_files(
+        source_dir,
+        prune=lambda d: d not in sdist_dirs and git_matcher.match_dir(d),
+        gitignore=gitignore,
+    )
+
+
+def _staged_unaffected(
+    source_dir: Path,
+    *,
+    pyproject: dict[str, Any],
+    backend: Backend,
+    output_format: Literal["text", "json", "ndjson"],
+    timings: Timings,
+) -> bool:
+    """
+    Check if the staged changes can't affect the result, and report that if
+    so.
+    """
+    with timings.phase("check staged changes"):
+        unaffected = staged_unaffected(source_dir, pyproject=pyproject, backend=backend)
+    if unaffected:
+        if output_format != "text":
+            summary = {"source_dir": str(source_dir), "result": 0, "staged": True}
+            write_report((), summary, output_format=output_format)
+        else:
+            print("Staged changes don't affect the SDist")
+    return unaffected
+
+
+def _check_prediction(
+    source_dir: Path,
+    sdist: frozenset[str],
+    *,
+    pyproject: dict[str, Any],
+    backend: Backend,
+    sdist_matcher: Matcher,
+    timings: Timings,
+) -> tuple[frozenset[str], frozenset[str]]:
+    """
+    Return the files in the SDist that weren't predicted (except generated
+    ones the SDist only patterns ignore) and the predicted files that aren't
+    in it.
+    """
+    with timings.phase("predict SDist"):
+        predicted = predict_sdist(source_dir, pyproject=pyproject, backend=backend)
+    if predicted is None:
+        print(f"Can't predict the SDist of {source_dir}", file=sys.stderr)
+        return frozenset(), frozenset()
+    return sdist_matcher.filter(sdist - predicted), predicted - sdist
+
+
+#: The length of a SHA-256 object ID in hex, for SHA-256 git repositories
+_SHA256_HEX = 64
+
+
+def _modified(
+    archive: Path, source_dir: Path, *, recurse_submodules: bool, timings: Timings
+) -> frozenset[str]:
+    """
+    Return the files in both the SDist *archive* and git's index whose
+    contents or executable bits differ, comparing git blob IDs.
+    """
+    with timings.phase("list git blobs"):
+        blobs = git_blobs(source_dir, recurse_submodules=recurse_submodules)
+    sha256 = any(len(object_id) == _SHA256_HEX for _, object_id in blobs.values())
+    with timings.phase("hash SDist"):
+        archived = archive_blobs(archive, algorithm="sha256" if sha256 else "sha1")
+    return frozenset(
+        p for p in archived.keys() & blobs.keys() if archived[p] != blobs[p]
+    )
 
-    sdist_spec = pathspec.GitIgnoreSpec.from_lines(sdist_only_patterns)
-    git_spec = pathspec.GitIgnoreSpec.from_lines(git_only_patterns)
 
-    sdist_only = frozenset(p for p in sdist - git if not sdist_spec.match_file(p))
-    git_only = frozenset(p for p in git - sdist if not git_spec.match_file(p))
+def _use_archive(
+    archive: Path | None,
+    source_dir: Path,
+    *,
+    wheel: bool,
+    check_content: bool,
+    keep_sdist: Path | None,
+    isolated: bool,
+    installer: Literal["uv", "pip"],
+    reuse_env: bool,
+    build_dir: Path | None,
+    recurse_submodules: bool,
+    timings: Timings,
+) -> tuple[frozenset[str] | None, frozenset[str]]:
+    """
+    Return the files in a wheel built from the SDist *archive* if ``wheel``,
+    and the files whose content differs from git if ``check_content``, then
+    move the archive to ``keep_sdist`` if given.
+    """
+    if archive is None:
+        return None, frozenset()
+    modified = (
+        _modified(
+            archive,
+            source_dir,
+            recurse_submodules=recurse_submodules,
+            timings=timings,
+        )
+        if check_content
+        else frozenset[str]()
+    )
+    wheel_listed = (
+        wheel_files(
+            archive,
+            isolated=isolated,
+            installer=installer,
+            reuse_env=reuse_env,
+            build_dir=build_dir,
+            timings=timings,
+        )
+        if wheel
+        else None
+    )
+    if keep_sdist is not None:
+        keep_sdist.mkdir(parents=True, exist_ok=True)
+        shutil.move(archive, keep_sdist / archive.name)
+    return wheel_listed, modified
 
-    git_only = backend.git_only_excludes(pyproject, git_only, source_dir)
 
+def _print_text(
+    sdist: frozenset[str],
+    sdist_only: frozenset[str],
+    git_only: frozenset[str],
+    wheel_only: frozenset[str],
+    *,
+    verbose: bool,
+    unpredicted: frozenset[str] = frozenset(),
+    predicted_only: frozenset[str] = frozenset(),
+    modified: frozenset[str] = frozenset(),
+) -> None:
+    """Print the human readable report for compare()."""
     if verbose:
         print("SDist contents:")
         print(*(f"  {x}" for x in sorted(sdist)), sep="\n")
@@ -127,10 +457,310 @@ def compare(
         print("Git only:")
         print(*(f"  {x}" for x in sorted(git_only)), sep="\n")
         print()
-        return bool(sdist_only) + 2 * bool(git_only)
+    else:
+        print("SDist matches git")
+
+    if wheel_only:
+        print("Wheel only (not in the SDist or git):")
+        print(*(f"  {x}" for x in sorted(wheel_only)), sep="\n")
+        print()
+
+    if unpredicted or predicted_only:
+        print("Prediction does not match the SDist")
+        print()
+        print("Not predicted:")
+        print(*(f"  {x}" for x in sorted(unpredicted)), sep="\n")
+        print()
+        print("Predicted only:")
+        print(*(f"  {x}" for x in sorted(predicted_only)), sep="\n")
+        print()
+
+    if modified:
+        print("Modified (contents or mode differ from git):")
+        print(*(f"  {x}" for x in sorted(modified)), sep="\n")
+        print()
+
+
+def compare(
+    source_dir: Path,
+    *,
+    isolated: bool,
+    verbose: bool = False,
+    installer: Literal["uv", "pip", "uv|pip"] = "uv|pip",
+    reuse_env: bool = False,
+    store: Store | None = None,
+    refresh_cache: bool = False,
+    build_dir: Path | None = None,
+    timings: Timings | None = None,
+    output_format: Literal["text", "json", "ndjson"] = "text",
+    listed: frozenset[str] | None = None,
+    staged: bool = False,
+    shadow: bool = False,
+    inject_junk: bool = False,
+    wheel: bool = False,
+    predict: bool = False,
+    verify_prediction: bool = False,
+    prebuilt: Path | None = None,
+    keep_sdist: Path | None = None,
+    check_content: bool = False,
+) -> int:
+    """
+    Compare the files in the SDist with the files tracked by git.
+
+    Takes the source directory and a flag indicating whether the SDist should
+    be built in an isolated environment. ``reuse_env`` keeps isolated build
+    environments in a cache between runs. If a ``store`` is given, SDist file
+    lists are kept there and reused while nothing they depend on changes;
+    ``refresh_cache`` replaces the stored result. ``build_dir`` selects where
+    the temporary SDist is written. The time spent in each phase is added to
+    ``timings`` if given. ``output_format`` selects a human readable report,
+    or a streamed ``json`` or ``ndjson`` one with a record per file (see
+    :mod:`check_sdist.report`). If the SDist's files are already known, pass
+    them as ``listed`` to skip getting them. With ``staged``, return 0 early
+    if the changes staged for commit can't affect the result (see
+    :func:`check_sdist.incremental.staged_unaffected`). With ``shadow``, the
+    SDist is built in a copy of the source directory (see
+    :func:`check_sdist.shadow.shadow_tree`), and ``inject_junk`` adds junk
+    files to the tree being built. With ``wheel``, a wheel is built from the
+    SDist too (so the SDist is always built), and its files that aren't in the
+    SDist or git are reported. With ``predict``, the SDist's files are
+    predicted from the files git tracks if the backend can (see
+    :func:`predict_sdist`), instead of building it; ``verify_prediction``
+    always builds it and reports differences from the prediction. With
+    ``prebuilt``, the files are read from that SDist archive instead of
+    building one. With ``keep_sdist``, the SDist is always built, and its
+    archive is moved to that directory for later use. With ``check_content``,
+    files in both the SDist and git are compared by git blob ID (contents and
+    executable bit) too, so the SDist is always read.
+
+    Return 0 if they match, 1 if the SDist has files that are not tracked by
+    git, 2 if the SDist is missing files that are tracked by git, and 3 if both
+    conditions are true. 4 is added if the wheel has files from neither, and 8
+    if the prediction doesn't match, and 16 if files were modified.
+    """
+
+    timings = timings or Timings()
+    resolved_installer = select_installer(installer)
+
+    with timings.phase("load pyproject"):
+        pyproject = load_pyproject(source_dir)
+    config = pyproject.get("tool", {}).get("check-sdist", {})
 
-    print("SDist matches git")
-    return 0
+    recurse_submodules = config.get("recurse-submodules", True)
+    mode = config.get("mode", "git")
+    respect_gitignore = config.get("respect-gitignore", False)
+    with timings.phase("resolve backend"):
+        backend = resolve_backend(config.get("build-backend", "auto"), pyproject)
+
+    if staged and _staged_unaffected(
+        source_dir,
+        pyproject=pyproject,
+        backend=backend,
+        output_format=output_format,
+        timings=timings,
+    ):
+        return 0
+
+    if mode not in {"all", "git"}:
+        msg = "Only 'all' and 'git' supported for 'mode'"
+        raise ValueError(msg)
+
+    # Nothing but the "all" mode's walk depends on the SDist, so the rest is
+    # done while it builds
+    with contextlib.ExitStack() as stack:
+        executor = stack.enter_context(
+            concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        )
+        prepared = executor.submit(
+            _prepare,
+            source_dir,
+            pyproject=pyproject,
+            backend=backend,
+            list_git=mode == "git",
+            recurse_submodules=recurse_submodules,
+            timings=timings,
+        )
+        # The wheel is built from the SDist's archive, kept until then
+        keep_dir = (
+            Path(stack.enter_context(tempfile.TemporaryDirectory(dir=build_dir)))
+            if prebuilt is None and (wheel or check_content or keep_sdist is not None)
+            else None
+        )
+        if prebuilt is not None:
+            with timings.phase("read SDist"):
+                listed = archive_files(prebuilt)
+        elif listed is None or keep_dir is not None or verify_prediction:
+            listed = list_sdist(
+                source_dir,
+                pyproject=pyproject,
+                backend=backend,
+                isolated=isolated,
+                installer=resolved_installer,
+                reuse_env=reuse_env,
+                store=store,
+                refresh_cache=refresh_cache,
+                build_dir=build_dir,
+                timings=timings,
+                shadow=shadow,
+                inject_junk=inject_junk,
+                keep_dir=keep_dir,
+                predict=predict and not verify_prediction,
+                build=verify_prediction,
+            )
+        wheel_listed, modified_extra = _use_archive(
+            prebuilt or (keep_dir and next(keep_dir.glob("*.tar.gz"))),
+            source_dir,
+            wheel=wheel,
+            check_content=check_content,
+            keep_sdist=None if prebuilt else keep_sdist,
+            isolated=isolated,
+            installer=resolved_installer,
+            reuse_env=reuse_env,
+            build_dir=build_dir,
+            recurse_submodules=recurse_submodules,
+            timings=timings,
+        )
+        sdist_matcher, git_matcher, wheel_matcher, git = prepared.result()
+    sdist = listed - {"PKG-INFO"}
+
+    if git is None:
+        with timings.phase("walk files"):
+            git = _walk(source_dir, sdist, git_matcher, gitignore=respect_gitignore)
+
+    with timings.phase("compare files"):
+        sdist_extra = sdist - git
+        git_extra = git - sdist
+    with timings.phase("match patterns"):
+        sdist_only = sdist_matcher.filter(sdist_extra)
+        git_only = git_matcher.filter(git_extra)
+        # Files the backend generates or rewrites are SDist-only ignores
+        modified = sdist_matcher.filter(modified_extra)
+
+    with timings.phase("backend rules"):
+        git_only = backend.git_only_excludes(pyproject, git_only, source_dir)
+
+    wheel_extra = wheel_only = frozenset[str]()
+    if wheel_listed is not None:
+        with timings.phase("compare wheel"):
+            wheel_extra = wheel_only_files(wheel_listed, sdist | git)
+            wheel_only = wheel_matcher.filter(wheel_extra)
+
+    unpredicted = predicted_only = frozenset[str]()
+    if verify_prediction:
+        unpredicted, predicted_only = _check_prediction(
+            source_dir,
+            sdist,
+            pyproject=pyproject,
+            backend=backend,
+            sdist_matcher=sdist_matcher,
+            timings=timings,
+        )
+
+    result = bool(sdist_only) + 2 * bool(git_only) + 4 * bool(wheel_only)
+    result += 8 * bool(unpredicted or predicted_only) + 16 * bool(modified)
+    if output_format != "text":
+        backend_rule = f"{type(backend).__module__}.{type(backend).__qualname__}"
+        records = itertools.chain(
+            (file_record(p, "sdist") for p in sdist if verbose),
+            (file_record(p, "sdist-only") for p in sdist_only),
+            (file_record(p, "git-only") for p in git_only),
+            (
+                file_record(p, "ignored-sdist-only", sdist_matcher.which(p))
+                for p in sdist_extra - sdist_only
+            ),
+            (
+                file_record(p, "ignored-git-only", git_matcher.which(p) or backend_rule)
+                for p in git_extra - git_only
+            ),
+            (file_record(p, "wheel-only") for p in wheel_only),
+            (
+                file_record(p, "ignored-wheel-only", wheel_matcher.which(p))
+                for p in wheel_extra - wheel_only
+            ),
+            (file_record(p, "unpredicted") for p in unpredicted),
+            (file_record(p, "predicted-only") for p in predicted_only),
+            (file_record(p, "modified") for p in modified),
+            (
+                file_record(p, "ignored-modified", sdist_matcher.which(p))
+                for p in modified_extra - modified
+            ),
+        )
+        summary = {
+            "source_dir": str(source_dir),
+            "result": result,
+            "sdist": len(sdist),
+            "git": len(git),
+            "sdist-only": len(sdist_only),
+            "git-only": len(git_only),
+            **(
+                {"wheel": len(wheel_listed), "wheel-only": len(wheel_only)}
+                if wheel_listed is not None
+                else {}
+            ),
+            **(
+                {
+                    "unpredicted": len(unpredicted),
+                    "predicted-only": len(predicted_only),
+                }
+                if verify_prediction
+                else {}
+            ),
+            **({"modified": len(modified)} if check_content else {}),
+        }
+        write_report(records, summary, output_format=output_format)
+        return result
+
+    _print_text(
+        sdist,
+        sdist_only,
+        git_only,
+        wheel_only,
+        verbose=verbose,
+        unpredicted=unpredicted,
+        predicted_only=predicted_only,
+        modified=modified,
+    )
+    return result
+
+
+def _check_watch(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    source_dirs: list[Path],
+) -> None:
+    """Reject options that can't be combined with ``--watch``."""
+    if len(source_dirs) > 1:
+        parser.error("--watch checks one project")
+    if args.staged:
+        parser.error("--watch and --staged can't be combined")
+    if args.wheel or args.check_content:
+        parser.error("--watch can't be combined with --wheel or --check-content")
+    if args.sdist or args.keep_sdist:
+        parser.error("--watch can't be combined with --sdist or --keep-sdist")
+
+
+def _check_args(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    source_dirs: list[Path],
+) -> Path | None:
+    """Reject option combinations that can't work, and find the ``--sdist``."""
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.output_format == "json" and len(source_dirs) > 1:
+        parser.error("--format json checks one project, use ndjson for several")
+    if args.watch:
+        _check_watch(parser, args, source_dirs)
+    if args.sdist and args.keep_sdist:
+        parser.error("--sdist and --keep-sdist can't be combined")
+    if args.sdist and len(source_dirs) > 1:
+        parser.error("--sdist checks one project")
+    if not args.sdist:
+        return None
+    try:
+        return find_sdist(args.sdist)
+    except (FileNotFoundError, ValueError) as err:
+        parser.error(str(err))
 
 
 def main(sys_args: Sequence[str] | None = None, /) -> None:
@@ -146,8 +776,20 @@ def main(sys_args: Sequence[str] | None = None, /) -> None:
     parser.add_argument(
         "--source-dir",
         type=Path,
-        default=Path.cwd(),
-        help="The source directory to check (default: current directory)",
+        action="append",
+        help="The source directory to check, can be repeated (default: current directory)",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help="A file listing source directories to check, one per line",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="How many source directories to check at once (default: 1)",
     )
     parser.add_argument(
         "--no-isolation",
@@ -171,20 +813,139 @@ def main(sys_args: Sequence[str] | None = None, /) -> None:
         default="uv|pip",
         help="Tool to use when installing packages for making the SDist",
     )
+    parser.add_argument(
+        "--reuse-env",
+        action="store_true",
+        help="Reuse cached isolated build environments between runs",
+    )
+    parser.add_argument(
+        "--build-dir",
+        type=Path,
+        help="Where to write the temporary SDist, such as a RAM-backed /dev/shm (default: system temp dir)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Where to keep SDist file lists between runs, can be shared (default: user cache)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not use or store cached SDist file lists",
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Rebuild the SDist and replace its cached file list",
+    )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=["text", "json", "ndjson"],
+        default="text",
+        help="Print a human readable report, or a record per file as JSON or newline delimited JSON",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Check again whenever files change, until interrupted",
+    )
+    parser.add_argument(
+        "--shadow",
+        action="store_true",
+        help="Build in a temporary copy of the source directory, so nothing (including --inject-junk) is written to it",
+    )
+    parser.add_argument(
+        "--wheel",
+        action="store_true",
+        help="Also build a wheel from the SDist, and report files in it that are not in the SDist or git",
+    )
+    parser.add_argument(
+        "--sdist",
+        type=Path,
+        help="Check this SDist, or the only one in this directory (such as dist/), instead of building one",
+    )
+    parser.add_argument(
+        "--keep-sdist",
+        type=Path,
+        metavar="DIR",
+        help="Always build the SDist, and keep it in this directory",
+    )
+    parser.add_argument(
+        "--check-content",
+        action="store_true",
+        help="Also report files whose contents or executable bit in the SDist differ from git's index",
+    )
+    parser.add_argument(
+        "--predict",
+        action="store_true",
+        help="Predict the SDist from the build configuration and the files git tracks instead of building it, if the backend can",
+    )
+    parser.add_argument(
+        "--verify-prediction",
+        action="store_true",
+        help="Build the SDist and report differences from the prediction",
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Skip the check if the changes staged for commit can't affect it, for pre-commit hooks",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print the wall and CPU time spent in each phase",
+    )
     args = parser.parse_args(sys_args)
 
+    source_dirs = [
+        *(args.source_dir or []),
+        *(read_manifest(args.manifest) if args.manifest else []),
+    ] or [Path.cwd()]
+    prebuilt = _check_args(parser, args, source_dirs)
+
+    # Injected junk might be ignored by git, so it can't use cached results
+    store = (
+        None
+        if args.no_cache or args.inject_junk
+        else DirectoryStore(args.cache_dir or cache_dir() / "sdist")
+    )
+    timings = Timings() if args.timings else None
+    options = {
+        "isolated": not args.no_isolation,
+        "verbose": args.verbose,
+        "installer": args.installer,
+        "reuse_env": args.reuse_env,
+        "store": store,
+        "refresh_cache": args.refresh_cache,
+        "build_dir": args.build_dir,
+        "timings": timings,
+        "output_format": args.output_format,
+        "staged": args.staged,
+        "shadow": args.shadow,
+        "inject_junk": args.inject_junk and args.shadow,
+        "wheel": args.wheel,
+        "predict": args.predict,
+        "verify_prediction": args.verify_prediction,
+        "prebuilt": prebuilt,
+        "keep_sdist": args.keep_sdist,
+        "check_content": args.check_content,
+    }
+
     with contextlib.ExitStack() as stack:
-        if args.inject_junk:
-            stack.enter_context(inject_junk_files(args.source_dir))
-
-        raise SystemExit(
-            compare(
-                args.source_dir,
-                isolated=not args.no_isolation,
-                verbose=args.verbose,
-                installer=args.installer,
-            )
-        )
+        if args.inject_junk and not args.shadow:
+            for source_dir in source_dirs:
+                stack.enter_context(inject_junk_files(source_dir))
+
+        if len(source_dirs) == 1:
+            if args.watch:
+                result = watch(source_dirs[0], options)
+            else:
+                result = compare(source_dirs[0], **options)
+            if timings is not None:
+                print(timings.report(), file=sys.stderr)
+            raise SystemExit(result)
+        raise SystemExit(compare_many(source_dirs, options, jobs=args.jobs))
 
 
 if __name__ == "__main__":
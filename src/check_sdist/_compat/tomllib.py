@@ -5,8 +5,8 @@ __lazy_modules__ = ["tomllib"]
 import sys
 
 if sys.version_info < (3, 11):
-    from tomli import load, loads
+    from tomli import TOMLDecodeError, load, loads
 else:
-    from tomllib import load, loads
+    from tomllib import TOMLDecodeError, load, loads
 
-__all__ = ["load", "loads"]
+__all__ = ["TOMLDecodeError", "load", "loads"]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+__lazy_modules__ = ["os", "pathlib", "sys"]
+
+import contextlib
+import os
+import sys
+from pathlib import Path
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+__all__ = ["cache_dir", "file_lock"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def cache_dir() -> Path:
+    """
+    Return the user cache directory for check-sdist (not created). Can be
+    overridden with ``CHECK_SDIST_CACHE_DIR``.
+    """
+    if env := os.environ.get("CHECK_SDIST_CACHE_DIR"):
+        return Path(env)
+    if sys.platform == "win32":
+        local = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData/Local"
+        return Path(local) / "check-sdist" / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "check-sdist"
+    xdg = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg) / "check-sdist"
+
+
+@contextlib.contextmanager
+def file_lock(
+    path: Path, *, shared: bool = False, blocking: bool = True
+) -> Generator[bool, None, None]:
+    """
+    Hold an advisory lock on *path* (created if needed) across processes.
+    Yields False if ``blocking=False`` and the lock is held elsewhere. Windows
+    has no shared locks, so ``shared=True`` takes an exclusive lock there.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt  # pylint: disable=import-outside-toplevel # noqa: PLC0415
+
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(
+                        f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1
+                    )
+                    break
+                except OSError:
+                    # LK_LOCK only retries for 10 seconds before giving up
+                    if not blocking:
+                        yield False
+                        return
+            try:
+                yield True
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl  # pylint: disable=import-outside-toplevel # noqa: PLC0415
+
+            flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            try:
+                fcntl.flock(f.fileno(), flags if blocking else flags | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -2,24 +2,50 @@ from __future__ import annotations
 
 __lazy_modules__ = [
     f"{__spec__.parent}._base",
+    "check_sdist._storage",
     "functools",
+    "hashlib",
     "importlib.metadata",
+    "json",
+    "pathlib",
     "sys",
+    "tempfile",
     "typing",
 ]
 
 import functools
+import hashlib
 import importlib.metadata
+import json
 import sys
+import tempfile
+from pathlib import Path
 from typing import Any
 
-from ._base import Backend, glob_filter, pathspec_filter
+from check_sdist._storage import cache_dir
+
+from ._base import (
+    Backend,
+    GitIndexReader,
+    SdistLister,
+    SdistPredictor,
+    glob_filter,
+    installed_backend_matches,
+    pathspec_filter,
+    reads_git_index,
+)
 
 __all__ = [
     "Backend",
+    "GitIndexReader",
+    "SdistLister",
+    "SdistPredictor",
+    "entry_points",
     "glob_filter",
+    "installed_backend_matches",
     "load_backends",
     "pathspec_filter",
+    "reads_git_index",
     "resolve_backend",
 ]
 
@@ -31,14 +57,117 @@ def __dir__() -> list[str]:
     return __all__
 
 
-@functools.cache
-def load_backends() -> dict[str, Backend]:
-    """Map entry-point name (a build-backend string) to a Backend instance."""
+def _scan_entry_points() -> dict[str, str]:
     if sys.version_info >= (3, 10):
         eps = importlib.metadata.entry_points(group=GROUP)
     else:  # 3.9 has no group= kwarg; entry_points() returns a dict by group
         eps = importlib.metadata.entry_points().get(GROUP, [])  # pylint: disable=no-member
-    return {ep.name: ep.load()() for ep in eps}
+    return {ep.name: ep.value for ep in eps}
+
+
+def _mtime(entry: str) -> int | None:
+    try:
+        return Path(entry or ".").stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _site_state() -> str:
+    """
+    Hash the import path and when each entry last changed. Installing or
+    removing a distribution changes the mtime of the directory it's in.
+    """
+    state = [(entry, _mtime(entry)) for entry in sys.path]
+    return hashlib.sha256(json.dumps(state).encode()).hexdigest()
+
+
+def _index_dir() -> Path:
+    return cache_dir() / "entry-points"
+
+
+def _environment() -> str:
+    return hashlib.sha256(sys.prefix.encode()).hexdigest()[:16]
+
+
+def _read_index(index: Path, state: str) -> dict[str, str] | None:
+    try:
+        with index.open(encoding="utf-8") as f:
+            record = json.load(f)
+        return dict(record["index"]) if record["state"] == state else None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_index(index: Path, state: str, names: dict[str, str]) -> None:
+    try:
+        index.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=index.parent, suffix=".tmp", delete=False
+        ) as f:
+            json.dump({"state": state, "index": names}, f)
+        Path(f.name).replace(index)
+    except OSError:
+        # A read-only cache only makes the next run slower
+        pass
+
+
+@functools.cache
+def entry_points() -> dict[str, str]:
+    """
+    Map entry-point name (a build-backend string) to its ``module:attr``
+    value, without importing anything. Scanning every installed distribution
+    is slow, so the result is kept in the user cache (one file per
+    environment) until the import path changes.
+    """
+    index = _index_dir() / f"{_environment()}.json"
+    state = _site_state()
+    eps = _read_index(index, state)
+    if eps is None:
+        eps = _scan_entry_points()
+        _write_index(index, state, eps)
+    return eps
+
+
+@functools.cache
+def _build_backends() -> dict[str, str]:
+    """
+    Map each string in a backend's ``build_backends`` to its entry-point name.
+    Finding them imports every backend, so the result is indexed next to the
+    entry points, and only done again when the import path changes.
+    """
+    index = _index_dir() / f"{_environment()}-build-backends.json"
+    state = _site_state()
+    names = _read_index(index, state)
+    if names is None:
+        names = {}
+        for name, backend in load_backends().items():
+            for build_backend in backend.build_backends:
+                names.setdefault(build_backend, name)
+        _write_index(index, state, names)
+    return names
+
+
+@functools.cache
+def _load(value: str) -> Backend:
+    """Import and instantiate one backend; aliases share the instance."""
+    ep = importlib.metadata.EntryPoint(name=value, value=value, group=GROUP)
+    backend: Backend = ep.load()()
+    return backend
+
+
+def _lookup(name: str) -> Backend | None:
+    """The backend whose entry point is *name*, importing only that one."""
+    value = entry_points().get(name)
+    return None if value is None else _load(value)
+
+
+@functools.cache
+def load_backends() -> dict[str, Backend]:
+    """
+    Map entry-point name (a build-backend string) to a Backend instance. This
+    imports every backend, including plugins; prefer :func:`resolve_backend`.
+    """
+    return {name: _load(value) for name, value in entry_points().items()}
 
 
 def resolve_backend(selector: str, pyproject: dict[str, Any]) -> Backend:
@@ -49,22 +178,25 @@ def resolve_backend(selector: str, pyproject: dict[str, Any]) -> Backend:
     back to ``"none"`` if unrecognized. Any other value selects a registered
     backend by name (or declared alias), raising ValueError if unknown.
     """
-    backends = load_backends()
-
+    name = selector
     if selector == "auto":
-        build_backend = pyproject.get("build-system", {}).get(
+        name = pyproject.get("build-system", {}).get(
             "build-backend", DEFAULT_BUILD_BACKEND
         )
-        for backend in backends.values():
-            if build_backend in backend.build_backends:
-                return backend
-        return backends["none"]
-
-    if selector in backends:
-        return backends[selector]
-    for backend in backends.values():
-        if selector in backend.build_backends:
-            return backend
+
+    # Entry-point names and declared aliases (more entry points to the same
+    # backend) are matched without importing the other backends.
+    backend = _lookup(name)
+    if backend is not None:
+        return backend
+    # Plugins may only list a build-backend in their build_backends, and the
+    # index of those means unknown build-backends don't import every plugin
+    entry_point = _build_backends().get(name)
+    if entry_point is not None:
+        return _load(entry_points()[entry_point])
+
+    if selector == "auto":
+        return _load(entry_points()["none"])
 
     msg = f"Unknown backend: {selector} - request addition in check_sdist.backends or make a plugin"
     raise ValueError(msg)
@@ -1,17 +1,36 @@
 from __future__ import annotations
 
-__lazy_modules__ = ["pathlib", "pathspec", "typing"]
-
-from pathlib import Path
+# typing isn't lazy, the protocols below need it when they are defined
+__lazy_modules__ = [
+    "check_sdist.patterns",
+    "importlib.metadata",
+    "packaging.requirements",
+    "packaging.utils",
+]
+
+import importlib.metadata
 from typing import Any, ClassVar, Protocol, runtime_checkable
 
-import pathspec
+from packaging.requirements import Requirement
+from packaging.utils import canonicalize_name
+
+from check_sdist.patterns import FileIndex, compile_patterns
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
     from collections.abc import Iterator
+    from pathlib import Path
 
-__all__ = ["Backend", "glob_filter", "pathspec_filter"]
+__all__ = [
+    "Backend",
+    "GitIndexReader",
+    "SdistLister",
+    "SdistPredictor",
+    "glob_filter",
+    "installed_backend_matches",
+    "pathspec_filter",
+    "reads_git_index",
+]
 
 
 def __dir__() -> list[str]:
@@ -38,23 +57,94 @@ class Backend(Protocol):
         """Drop files the backend intentionally keeps out of the SDist."""
 
     def sdist_only_ignores(self, pyproject: dict[str, Any]) -> Iterator[str]:
-        """Yield patterns expected in the SDist but absent from git."""
+        """Yield patterns expected in the SDist but absent from (or different
+        from) git, such as generated or rewritten files."""
+
+
+@runtime_checkable
+class SdistLister(Protocol):
+    """An optional Backend capability: list the SDist without building it.
+
+    Backends that can ask the real build backend which files it would package
+    (without writing and compressing an archive) provide this method. Return
+    ``None`` when the listing isn't available for this project, and a real
+    build is used instead.
+    """
+
+    def list_sdist_files(
+        self, pyproject: dict[str, Any], source_dir: Path
+    ) -> frozenset[str] | None:
+        """Return the files in the SDist, relative to the SDist root."""
+
+
+@runtime_checkable
+class SdistPredictor(Protocol):
+    """An optional Backend capability: predict the SDist without the backend.
+
+    Backends whose file selection is declarative can evaluate it in process,
+    against the files git tracks, without importing or running the real
+    build backend. Return ``None`` when the project has configuration the
+    prediction can't follow (custom commands, build hooks, ...).
+    """
+
+    def predict_sdist_files(
+        self, pyproject: dict[str, Any], files: frozenset[str], source_dir: Path
+    ) -> frozenset[str] | None:
+        """Return the files in the SDist, except generated ones like PKG-INFO."""
+
+
+@runtime_checkable
+class GitIndexReader(Protocol):
+    """An optional Backend capability: say if git's index changes the SDist.
+
+    Some backends ask git which files are tracked (setuptools with
+    setuptools-scm, ...), so ``git add`` can change the SDist without any
+    file changing. Backends that only look at the files on disk (and
+    ``.gitignore``) set this to False. Backends without it are assumed to read
+    the index.
+    """
+
+    reads_git_index: ClassVar[bool]
 
 
 def glob_filter(
-    patterns: list[str], files: frozenset[str], source_dir: Path
+    patterns: list[str],
+    files: frozenset[str],
+    source_dir: Path,  # pylint: disable=unused-argument # noqa: ARG001
 ) -> frozenset[str]:
-    """Filter out files based on glob patterns, relative to source_dir."""
-    new_files = set(files)
-    for pattern in patterns:
-        results = {
-            p.relative_to(source_dir).as_posix() for p in Path(source_dir).glob(pattern)
-        }
-        new_files -= results
-    return frozenset(new_files)
+    """Filter out files based on glob patterns, relative to source_dir.
+
+    The patterns are matched against ``files`` in memory, so nothing is read
+    from ``source_dir``. A pattern matching a directory drops everything in it.
+    """
+    index = FileIndex(files)
+    return files.difference(*(index.glob(p) for p in patterns))
 
 
 def pathspec_filter(patterns: list[str], files: frozenset[str]) -> frozenset[str]:
     """Filter out files based on gitignore-style patterns."""
-    spec = pathspec.GitIgnoreSpec.from_lines(patterns)
-    return frozenset(p for p in files if not spec.match_file(p))
+    return compile_patterns(patterns).filter(files)
+
+
+def installed_backend_matches(pyproject: dict[str, Any], distribution: str) -> bool:
+    """Check if the installed *distribution* satisfies ``build-system.requires``.
+
+    Used before asking a backend importable in this environment about the
+    SDist; the build would otherwise use a different backend version. A
+    backend that isn't listed in the requirements never matches.
+    """
+    name = canonicalize_name(distribution)
+    requires = pyproject.get("build-system", {}).get("requires", [])
+    reqs = [r for r in map(Requirement, requires) if canonicalize_name(r.name) == name]
+    if not reqs:
+        return False
+    try:
+        version = importlib.metadata.version(distribution)
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    return all(r.specifier.contains(version, prereleases=True) for r in reqs)
+
+
+def reads_git_index(backend: Backend) -> bool:
+    """Check if staging files can change *backend*'s SDist, see GitIndexReader."""
+    return not isinstance(backend, GitIndexReader) or backend.reads_git_index
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
-__lazy_modules__ = [f"{__spec__.parent}._base", "pathlib", "typing"]
+__lazy_modules__ = [
+    f"{__spec__.parent}._base",
+    "check_sdist.patterns",
+    "pathlib",
+    "posixpath",
+    "typing",
+]
 
+import posixpath
+from pathlib import PurePath
 from typing import Any, ClassVar
 
-from ._base import glob_filter
+from check_sdist.patterns import FileIndex
+
+from ._base import glob_filter, installed_backend_matches
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
@@ -18,10 +28,58 @@ def __dir__() -> list[str]:
     return __all__
 
 
+#: The default project.license-files
+_LICENSE_FILES = ("COPYING*", "LICEN[CS]E*", "NOTICE*", "AUTHORS*")
+
+
+def _below(paths: frozenset[str], files: frozenset[str]) -> set[str]:
+    """The *files* that are in *paths*, or in a directory in them."""
+    return {p for p in files if p in paths or any(d in paths for d in _parents(p))}
+
+
+def _parents(path: str) -> list[str]:
+    return [path[:i] for i, c in enumerate(path) if c == "/"]
+
+
+def _module_files(name: str, files: frozenset[str]) -> set[str] | None:
+    """The files of module *name*, or None if it can't be found unambiguously."""
+    path = name.replace(".", "/")
+    found = [
+        {p for p in files if p.startswith(f"{d}/")} or {f"{d}.py"} & files
+        for d in (path, f"src/{path}")
+    ]
+    if sum(bool(f) for f in found) != 1:
+        return None
+    return {
+        p
+        for p in found[0] | found[1]
+        if "__pycache__" not in p.split("/") and not p.endswith(".pyc")
+    }
+
+
+def _referenced_files(project: dict[str, Any], files: frozenset[str]) -> set[str]:
+    """The readme and license files flit includes from ``[project]``."""
+    referenced = set()
+    readme = project.get("readme")
+    if isinstance(readme, dict):
+        readme = readme.get("file")
+    if readme:
+        referenced.add(posixpath.normpath(readme))
+    license_table = project.get("license")
+    if isinstance(license_table, dict) and "file" in license_table:
+        referenced.add(posixpath.normpath(license_table["file"]))
+    index = FileIndex(files)
+    for pattern in project.get("license-files", _LICENSE_FILES):
+        referenced |= index.match(pattern) & files
+    return referenced
+
+
 class FlitBackend:
     """SDist knowledge for the flit-core build backend."""
 
     build_backends: ClassVar[tuple[str, ...]] = ("flit_core.buildapi",)
+    # flit_core packages the module and the configured includes
+    reads_git_index: ClassVar[bool] = False
 
     def git_only_excludes(
         self, pyproject: dict[str, Any], files: frozenset[str], source_dir: Path
@@ -38,3 +96,67 @@ class FlitBackend:
         self, pyproject: dict[str, Any]
     ) -> Iterator[str]:
         yield from ()
+
+    def list_sdist_files(
+        self, pyproject: dict[str, Any], source_dir: Path
+    ) -> frozenset[str] | None:
+        if not installed_backend_matches(pyproject, "flit-core"):
+            return None
+
+        # pylint: disable-next=import-outside-toplevel
+        from flit_core.sdist import SdistBuilder  # noqa: PLC0415
+
+        builder = SdistBuilder.from_ini_path(source_dir / "pyproject.toml")
+        files = builder.apply_includes_excludes(builder.select_files())
+        return frozenset(PurePath(f).as_posix() for f in files)
+
+    def predict_sdist_files(
+        self, pyproject: dict[str, Any], files: frozenset[str], source_dir: Path
+    ) -> frozenset[str] | None:
+        # Follows flit_core's SdistBuilder: the module, external data,
+        # pyproject.toml and the files it references, then the sdist include
+        # and exclude patterns.
+        project = pyproject.get("project")
+        if project is None:
+            return None
+        flit = pyproject.get("tool", {}).get("flit", {})
+        name = project["name"]
+        if name.endswith("-stubs"):
+            name = name[:-6].replace("-", "_") + "-stubs"
+        module_name = flit.get("module", {}).get("name", name.replace("-", "_"))
+        module = _module_files(module_name, files)
+        if module is None:
+            return None
+
+        path = module_name.replace(".", "/")
+        crucial = {"pyproject.toml", *_referenced_files(project, files)}
+        crucial |= module & {
+            f"{d}{e}" for d in (path, f"src/{path}") for e in ("/__init__.py", ".py")
+        }
+        selected = crucial | module
+        data_dir = flit.get("external-data", {}).get("directory")
+        if data_dir is not None:
+            selected |= {
+                p
+                for p in _below(frozenset({posixpath.normpath(data_dir)}), files)
+                if "__pycache__" not in p.split("/")
+            }
+
+        sdist = flit.get("sdist")
+        if sdist is not None:
+            index = FileIndex(files)
+            exclude = ["**/__pycache__", "**.pyc", *sdist.get("exclude", [])]
+            excluded = frozenset().union(
+                *(index.glob(posixpath.normpath(p), hidden=False) for p in exclude)
+            )
+            if excluded & crucial:
+                # flit refuses to exclude crucial files
+                return None
+            included = frozenset().union(
+                *(
+                    index.glob(posixpath.normpath(p), hidden=False)
+                    for p in sdist.get("include", [])
+                )
+            )
+            selected = (selected | included) - excluded
+        return frozenset(selected & files)
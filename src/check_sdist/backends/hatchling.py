@@ -1,10 +1,20 @@
 from __future__ import annotations
 
-__lazy_modules__ = [f"{__spec__.parent}._base", "pathlib", "typing"]
+__lazy_modules__ = [
+    f"{__spec__.parent}._base",
+    "check_sdist.patterns",
+    "pathlib",
+    "posixpath",
+    "typing",
+]
 
+import posixpath
+from pathlib import PurePath, PurePosixPath
 from typing import Any, ClassVar
 
-from ._base import pathspec_filter
+from check_sdist.patterns import FileIndex, compile_patterns
+
+from ._base import installed_backend_matches, pathspec_filter
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
@@ -18,10 +28,207 @@ def __dir__() -> list[str]:
     return __all__
 
 
+#: Directories and files hatchling never packages from the project
+_EXCLUDED_DIRECTORIES = frozenset(
+    {
+        "__pycache__",
+        ".venv",
+        ".git",
+        ".hg",
+        ".hatch",
+        ".tox",
+        ".nox",
+        ".ruff_cache",
+        ".pytest_cache",
+        ".mypy_cache",
+        ".pixi",
+    }
+)
+_EXCLUDED_FILES = frozenset({".DS_Store", ".git"})
+
+#: Files the sdist target always force-includes if they exist
+_FORCED = ("pyproject.toml", "hatch_build.py")
+
+#: The default project.license-files
+_LICENSE_FILES = ("LICEN[CS]E*", "COPYING*", "NOTICE*", "AUTHORS*")
+
+
+def _normalize(path: str) -> str:
+    return posixpath.normpath(path).strip("/")
+
+
+def _parents(path: str) -> list[str]:
+    """The directories *path* is in, outermost first."""
+    return [path[:i] for i, c in enumerate(path) if c == "/"]
+
+
+def _gitignore(source_dir: Path) -> Path | None:
+    """The ``.gitignore`` hatchling reads: the nearest one in the repository."""
+    for directory in (source_dir, *source_dir.parents):
+        if directory.joinpath(".gitignore").is_file():
+            return directory / ".gitignore"
+        if directory.joinpath(".git").exists():
+            return None
+    return None
+
+
+def _sources(
+    setting: list[str] | dict[str, str], packages: list[str]
+) -> dict[str, str]:
+    """The directory prefixes hatchling replaces, from ``sources`` and ``packages``."""
+    if isinstance(setting, list):
+        sources = {f"{_normalize(s)}/": "" for s in setting}
+    else:
+        sources = {
+            f"{_normalize(s)}/" if s else s: ""
+            if _normalize(p) in {"", "."}
+            else f"{_normalize(p)}/"
+            for s, p in setting.items()
+        }
+    for package in packages:
+        parent = posixpath.dirname(package)
+        if parent and f"{package}/" not in sources:
+            sources[f"{parent}/"] = ""
+    return dict(sorted(sources.items()))
+
+
+class _Selection:
+    """The sdist target's file selection, from hatchling's configuration."""
+
+    def __init__(self, pyproject: dict[str, Any], source_dir: Path) -> None:
+        build = pyproject.get("tool", {}).get("hatch", {}).get("build", {})
+        # Settings for the target replace the ones for all targets
+        settings = {**build, **build.get("targets", {}).get("sdist", {})}
+
+        self.packages = sorted(_normalize(p) for p in settings.get("packages", []))
+        self.only_include = [
+            _normalize(p) for p in settings.get("only-include", [])
+        ] or self.packages
+        self.sources = _sources(settings.get("sources", []), self.packages)
+        self.force_include: dict[str, str] = settings.get("force-include", {})
+        self.support_legacy: bool = settings.get("support-legacy", False)
+
+        include = [*settings.get("include", []), *(f"/{p}/" for p in self.packages)]
+        self.include = compile_patterns(include) if include else None
+        exclude = ["*.py[cdo]", "/dist"]
+        self.gitignore = _gitignore(source_dir.resolve())
+        if self.gitignore is not None and not settings.get("ignore-vcs", False):
+            exclude += self.gitignore.read_text(encoding="utf-8").splitlines()
+        self.exclude = compile_patterns([*exclude, *settings.get("exclude", [])])
+        self.only_packages: bool = settings.get("only-packages", False)
+        self.skip_excluded_dirs: bool = settings.get("skip-excluded-dirs", False)
+
+        # The readme and license files are always included
+        project = pyproject.get("project", {})
+        readme = project.get("readme")
+        if isinstance(readme, dict):
+            readme = readme.get("file")
+        self.metadata_files = {_normalize(readme)} if readme else set()
+        license_files = project.get("license-files", _LICENSE_FILES)
+        if isinstance(license_files, dict):
+            license_files = license_files.get("globs", license_files.get("paths", []))
+        self.license_files: list[str] = list(license_files)
+
+    def distribution_path(self, path: str) -> str:
+        for source, replacement in self.sources.items():
+            if not source:
+                return replacement + path
+            if path.startswith(source):
+                return path.replace(source, replacement, 1)
+        return path
+
+    def included(self, path: str, *, explicit: bool, is_package: bool) -> bool:
+        return (
+            not (self.only_packages and not is_package)
+            and not self.exclude.match_file(path)
+            and (explicit or self.include is None or self.include.match_file(path))
+        )
+
+    def walked(self, path: str, reserved: set[str], *, explicit: bool) -> bool:
+        """
+        Check if walking the project finds *path*, or, if *explicit*, walking
+        a directory *path* is relative to.
+        """
+        parents = _parents(path)
+        if path.rpartition("/")[2] in _EXCLUDED_FILES or any(
+            d.rpartition("/")[2] in _EXCLUDED_DIRECTORIES for d in parents
+        ):
+            return False
+        if not explicit and any(
+            d in reserved
+            or (self.skip_excluded_dirs and self.exclude.match_file(f"{d}/"))
+            for d in parents
+        ):
+            return False
+        return self.distribution_path(path) not in reserved
+
+    def forced(self, files: frozenset[str], source_dir: Path) -> dict[str, str] | None:
+        """
+        The files and directories to force-include, mapped to their targets,
+        or None if some aren't tracked or are outside the project.
+        """
+        forced = {}
+        for source, target in self.force_include.items():
+            path = _normalize(source)
+            if PurePosixPath(source).is_absolute() or path.startswith(("..", "~")):
+                return None
+            if path not in files and not any(p.startswith(f"{path}/") for p in files):
+                return None
+            forced[path] = _normalize(target)
+        forced.update({name: name for name in _FORCED if name in files})
+        index = FileIndex(files)
+        license_files = {
+            p
+            for pattern in self.license_files
+            for p in index.match(pattern.replace("**", "*"), hidden=False)
+            if p in files
+        }
+        forced.update({p: p for p in self.metadata_files | license_files if p in files})
+        if self.gitignore == source_dir.resolve() / ".gitignore":
+            forced[".gitignore"] = ".gitignore"
+        return forced
+
+    def selected(self, files: frozenset[str], reserved: set[str]) -> Iterator[str]:
+        """The project files selected, before force-include."""
+        package_dirs = {
+            p.rpartition("/")[0] for p in files if p.rpartition("/")[2] == "__init__.py"
+        }
+        if not self.only_include:
+            yield from (
+                path
+                for path in files
+                if self.walked(path, reserved, explicit=False)
+                and self.included(
+                    path,
+                    explicit=False,
+                    is_package=path.rpartition("/")[0] in package_dirs,
+                )
+            )
+            return
+        for root in self.only_include:
+            if root in files:
+                if self.distribution_path(root) not in reserved:
+                    yield root
+                continue
+            yield from (
+                path
+                for path in files
+                if path.startswith(f"{root}/")
+                and self.walked(path[len(root) + 1 :], reserved, explicit=True)
+                and self.included(
+                    path,
+                    explicit=True,
+                    is_package=path.rpartition("/")[0] in package_dirs,
+                )
+            )
+
+
 class HatchlingBackend:
     """SDist knowledge for the hatchling build backend."""
 
     build_backends: ClassVar[tuple[str, ...]] = ("hatchling.build",)
+    # hatchling reads .gitignore, but never asks git what's tracked
+    reads_git_index: ClassVar[bool] = False
 
     def git_only_excludes(  # pylint: disable=unused-argument
         self, pyproject: dict[str, Any], files: frozenset[str], source_dir: Path
@@ -49,3 +256,72 @@ class HatchlingBackend:
         )
         if version_file is not None:
             yield version_file
+
+    def list_sdist_files(
+        self, pyproject: dict[str, Any], source_dir: Path
+    ) -> frozenset[str] | None:
+        # Build hooks can add files that only a real build sees, and hatch.toml
+        # can configure them too.
+        build = pyproject.get("tool", {}).get("hatch", {}).get("build", {})
+        if (
+            build.get("hooks")
+            or build.get("targets", {}).get("sdist", {}).get("hooks")
+            or source_dir.joinpath("hatch.toml").exists()
+        ):
+            return None
+        if not installed_backend_matches(pyproject, "hatchling"):
+            return None
+
+        # pylint: disable-next=import-outside-toplevel
+        from hatchling.builders.sdist import SdistBuilder  # noqa: PLC0415
+
+        builder = SdistBuilder(str(source_dir))
+        files = {
+            PurePath(f.distribution_path).as_posix()
+            for f in builder.recurse_included_files()
+        }
+        if builder.config.support_legacy:
+            files.add("setup.py")
+        return frozenset(files)
+
+    def predict_sdist_files(
+        self, pyproject: dict[str, Any], files: frozenset[str], source_dir: Path
+    ) -> frozenset[str] | None:
+        # Follows hatchling's SdistBuilder. Build hooks can add files, except
+        # hatch-vcs, whose version file is generated and ignored anyway.
+        # Artifacts are usually untracked, and hatch.toml could hold more
+        # configuration.
+        build = pyproject.get("tool", {}).get("hatch", {}).get("build", {})
+        target = build.get("targets", {}).get("sdist", {})
+        hooks = {*build.get("hooks", {}), *target.get("hooks", {})}
+        if (
+            hooks - {"vcs"}
+            or {**build, **target}.get("artifacts")
+            or source_dir.joinpath("hatch.toml").exists()
+        ):
+            return None
+        selection = _Selection(pyproject, source_dir)
+        forced = selection.forced(files, source_dir)
+        if forced is None:
+            return None
+        reserved = {selection.distribution_path(s) for s in forced}
+
+        result = set(selection.selected(files, reserved))
+        for source, dest in forced.items():
+            if source in files:
+                result.add(dest)
+                continue
+            result.update(
+                moved
+                for p in files
+                if p.startswith(f"{source}/")
+                and selection.walked(
+                    moved := f"{dest}/{p[len(source) + 1 :]}", reserved, explicit=True
+                )
+            )
+        # A .gitignore further up is included too
+        if selection.gitignore is not None:
+            result.add(".gitignore")
+        if selection.support_legacy:
+            result.add("setup.py")
+        return frozenset(selection.distribution_path(p) for p in result)
@@ -1,9 +1,26 @@
 from __future__ import annotations
 
-__lazy_modules__ = [f"{__spec__.parent}._base", "pathlib", "typing"]
+__lazy_modules__ = [
+    f"{__spec__.parent}._base",
+    "check_sdist.patterns",
+    "fnmatch",
+    "packaging.requirements",
+    "packaging.utils",
+    "pathlib",
+    "posixpath",
+    "typing",
+]
 
+import fnmatch
+import posixpath
+from pathlib import PurePosixPath
 from typing import Any, ClassVar
 
+from packaging.requirements import Requirement
+from packaging.utils import canonicalize_name
+
+from check_sdist.patterns import FileIndex
+
 from ._base import glob_filter
 
 TYPE_CHECKING = False
@@ -18,6 +35,86 @@ def __dir__() -> list[str]:
     return __all__
 
 
+#: License files included when the project doesn't list any
+_LICENSE_FILES = ("LICEN[CS]E*", "COPYING*", "NOTICE*")
+
+
+def _package_dir(build: dict[str, Any], files: frozenset[str]) -> str:
+    """The directory pdm-backend looks for packages in."""
+    if "package-dir" in build:
+        return str(build["package-dir"])
+    includes = build.get("includes", [])
+    excludes = build.get("excludes", [])
+    has_src = any(p.startswith("src/") for p in files)
+    if (has_src and not includes) or (
+        any(PurePosixPath(p).is_relative_to("src") for p in includes)
+        and "src" not in excludes
+        and "src/" not in excludes
+    ):
+        return "src"
+    return ""
+
+
+def _top_packages(package_dir: str, files: frozenset[str]) -> set[str]:
+    """The packages directly in *package_dir*."""
+    prefix = f"{package_dir}/" if package_dir not in {"", "."} else ""
+    return {
+        posixpath.dirname(p)
+        for p in files
+        if p.startswith(prefix)
+        and p.count("/") == prefix.count("/") + 1
+        and p.endswith(("/__init__.py", "-stubs/__init__.pyi"))
+        and posixpath.basename(posixpath.dirname(p))
+        not in {"__pycache__", "__pypackages__"}
+    }
+
+
+def _weight(pattern: str) -> tuple[int, int]:
+    """How specific a pattern is: its parts, then how few wildcards it has."""
+    parts = PurePosixPath(pattern).parts
+    wildcards = sum(
+        2 if part == "**" else 1 for part in parts if any(c in part for c in "*?[")
+    )
+    return len(parts), -wildcards
+
+
+def _expand(patterns: set[str], files: frozenset[str]) -> dict[str, str]:
+    """The paths the patterns match, mapped to the pattern."""
+    index = FileIndex(files)
+    return {
+        posixpath.normpath(path): pattern
+        for pattern in patterns
+        for path in index.match(pattern, hidden=False)
+    }
+
+
+def _excluded(path: str, excludes: list[str]) -> bool:
+    return any(
+        PurePosixPath(path).is_relative_to(e) or fnmatch.fnmatch(path, e)
+        for e in excludes
+    )
+
+
+def _metadata_files(project: dict[str, Any], files: frozenset[str]) -> set[str]:
+    """The readme and license files pdm-backend adds from ``[project]``."""
+    found = set()
+    license_table = project.get("license")
+    if isinstance(license_table, dict) and "file" in license_table:
+        found.add(posixpath.normpath(license_table["file"]))
+    license_files = project.get("license-files")
+    if license_files is None and not found:
+        license_files = _LICENSE_FILES
+    index = FileIndex(files)
+    for pattern in license_files or ():
+        found |= index.match(pattern)
+    readme = project.get("readme")
+    if isinstance(readme, dict):
+        readme = readme.get("file")
+    if readme:
+        found.add(posixpath.normpath(readme))
+    return found & files
+
+
 class PdmBackend:
     """SDist knowledge for the pdm-backend build backend."""
 
@@ -35,6 +132,9 @@ class PdmBackend:
         return glob_filter(exclude, files, source_dir)
 
     def sdist_only_ignores(self, pyproject: dict[str, Any]) -> Iterator[str]:
+        # pdm-backend rewrites pyproject.toml with the resolved metadata
+        yield "/pyproject.toml"
+
         # [tool.pdm.version]
         # write_to = "_version.py"
         write_to = (
@@ -45,3 +145,55 @@ class PdmBackend:
         )
         if write_to is not None:
             yield write_to
+
+    def predict_sdist_files(
+        self, pyproject: dict[str, Any], files: frozenset[str], source_dir: Path
+    ) -> frozenset[str] | None:
+        # Follows pdm-backend's SdistBuilder. Other build requirements can be
+        # plugins with hooks, and pdm_build.py is a local hook; either could
+        # add files.
+        build = pyproject.get("tool", {}).get("pdm", {}).get("build", {})
+        requires = pyproject.get("build-system", {}).get("requires", [])
+        if (
+            any(
+                canonicalize_name(Requirement(r).name) != "pdm-backend"
+                for r in requires
+            )
+            or source_dir.joinpath(build.get("custom-hook", "pdm_build.py")).exists()
+        ):
+            return None
+
+        includes = set(build.get("includes", []))
+        if not includes:
+            package_dir = _package_dir(build, files)
+            includes = _top_packages(package_dir, files) or {
+                f"{package_dir or '.'}/*.py"
+            }
+        includes.update(build.get("source-includes") or ["tests"])
+        include_paths = _expand(includes, files)
+        exclude_paths = _expand({".pdm-build", *build.get("excludes", [])}, files)
+        # Where both match, the more specific pattern wins, or the exclude
+        for path, pattern in list(include_paths.items()):
+            if path in exclude_paths:
+                if _weight(pattern) <= _weight(exclude_paths[path]):
+                    del include_paths[path]
+                else:
+                    del exclude_paths[path]
+
+        result = {
+            "pyproject.toml",
+            *_metadata_files(pyproject.get("project", {}), files),
+        }
+        excludes = sorted(exclude_paths)
+        for path in include_paths:
+            if path in files:
+                result.add(path)
+                continue
+            result.update(
+                p
+                for p in files
+                if p.startswith(f"{path}/")
+                and not p.endswith(".pyc")
+                and not _excluded(p, excludes)
+            )
+        return frozenset(result)
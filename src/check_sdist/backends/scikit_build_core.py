@@ -22,6 +22,8 @@ class ScikitBuildCoreBackend:
     """SDist knowledge for the scikit-build-core build backend."""
 
     build_backends: ClassVar[tuple[str, ...]] = ("scikit_build_core.build",)
+    # scikit-build-core reads .gitignore, but never asks git what's tracked
+    reads_git_index: ClassVar[bool] = False
 
     def git_only_excludes(  # pylint: disable=unused-argument
         self, pyproject: dict[str, Any], files: frozenset[str], source_dir: Path
@@ -1,12 +1,28 @@
 from __future__ import annotations
 
-__lazy_modules__ = ["typing"]
+__lazy_modules__ = [
+    "ast",
+    "check_sdist.manifest",
+    "configparser",
+    "fnmatch",
+    "packaging.requirements",
+    "packaging.utils",
+    "typing",
+]
 
+import ast
+import configparser
+import fnmatch
 from typing import Any, ClassVar
 
+from packaging.requirements import Requirement
+from packaging.utils import canonicalize_name
+
+from check_sdist.manifest import Template, translate_pattern
+
 TYPE_CHECKING = False
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
     from pathlib import Path
 
 __all__ = ["SetuptoolsBackend"]
@@ -16,6 +32,421 @@ def __dir__() -> list[str]:
     return __all__
 
 
+#: setup() arguments that change which files are packaged; a prediction can't
+#: follow them when they're passed in setup.py
+_FILE_ARGUMENTS = frozenset(
+    {
+        "cmdclass",
+        "data_files",
+        "exclude_package_data",
+        "ext_modules",
+        "libraries",
+        "license_files",
+        "package_data",
+        "package_dir",
+        "packages",
+        "py_modules",
+        "scripts",
+    }
+)
+
+#: The first of these that exists is added
+_READMES = ("README", "README.rst", "README.txt", "README.md")
+
+_LICENSE_FILES = ("LICEN[CS]E*", "COPYING*", "NOTICE*", "AUTHORS*")
+
+#: Names flat-layout discovery skips, as packages (and their subpackages) or
+#: modules
+_FLAT_PACKAGES = (
+    *("ci", "bin", "doc", "docs", "documentation", "manpages", "news"),
+    *("changelog", "test", "tests", "unit_test", "unit_tests", "example"),
+    *("examples", "scripts", "tools", "util", "utils", "python", "build"),
+    *("dist", "venv", "env", "requirements", "tasks", "fabfile", "site_scons"),
+    *("benchmark", "benchmarks", "exercise", "exercises", "[._]*"),
+)
+_FLAT_MODULES = (
+    *("setup", "conftest", "test", "tests", "example", "examples", "build"),
+    *("toxfile", "noxfile", "pavement", "dodo", "tasks", "fabfile"),
+    *("[Ss][Cc]onstruct", "conanfile", "manage", "benchmark", "benchmarks"),
+    *("exercise", "exercises", "[._]*"),
+)
+_ALWAYS_EXCLUDE = ("ez_setup", "*__pycache__")
+
+
+def _glob(pattern: str, files: Iterable[str]) -> set[str]:
+    """The *files* :func:`glob.glob` would find for *pattern*."""
+    regex = translate_pattern(pattern, hidden=False)
+    return {p for p in files if regex.match(p)}
+
+
+def _join(directory: str, name: str) -> str:
+    return f"{directory}/{name}" if directory not in {"", "."} else name
+
+
+def _setup_py_arguments(path: Path) -> frozenset[str] | None:
+    """The keyword arguments passed to setup() calls, None if unknowable."""
+    try:
+        tree = ast.parse(path.read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return None
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+        if name != "setup":
+            continue
+        if any(kw.arg is None for kw in node.keywords):
+            return None
+        names.update(kw.arg for kw in node.keywords if kw.arg is not None)
+    return frozenset(names)
+
+
+def _cfg_list(value: str) -> list[str]:
+    """A setup.cfg list: one per line, or comma separated."""
+    items = value.splitlines() if "\n" in value else value.split(",")
+    return [item.strip() for item in items if item.strip()]
+
+
+def _cfg_dict(value: str) -> dict[str, str]:
+    """A setup.cfg mapping, with one ``key = value`` per line."""
+    pairs = (line.partition("=") for line in _cfg_list(value))
+    return {key.strip(): val.strip() for key, _, val in pairs}
+
+
+def _cfg_file(value: str) -> list[str]:
+    """The files of a ``file:`` directive."""
+    if not value.startswith("file:"):
+        return []
+    return _cfg_list(value.removeprefix("file:").replace(",", "\n"))
+
+
+def _cfg_options(cfg: configparser.ConfigParser) -> dict[str, Any]:
+    """The file selection settings in setup.cfg."""
+    options = cfg["options"] if cfg.has_section("options") else {}
+    metadata = cfg["metadata"] if cfg.has_section("metadata") else {}
+    settings: dict[str, Any] = {
+        "package_dir": _cfg_dict(options.get("package_dir", "")),
+        "py_modules": _cfg_list(options["py_modules"])
+        if "py_modules" in options
+        else None,
+        "scripts": _cfg_list(options.get("scripts", "")),
+        "cmdclass": bool(options.get("cmdclass")),
+        "referenced": [
+            *_cfg_file(metadata.get("long_description", "")),
+            *_cfg_file(metadata.get("version", "")),
+        ],
+    }
+
+    packages = options.get("packages")
+    if packages is not None and packages.strip() in {"find:", "find_namespace:"}:
+        find = (
+            cfg["options.packages.find"]
+            if cfg.has_section("options.packages.find")
+            else {}
+        )
+        settings["packages"] = {
+            "where": [find.get("where", ".").strip()],
+            "include": _cfg_list(find.get("include", "*")),
+            "exclude": _cfg_list(find.get("exclude", "")),
+            "namespaces": packages.strip() == "find_namespace:",
+        }
+    elif packages is not None:
+        settings["packages"] = _cfg_list(packages)
+
+    for section in ("package_data", "exclude_package_data"):
+        name = f"options.{section}"
+        table = cfg[name] if cfg.has_section(name) else {}
+        settings[section] = {
+            "" if k == "*" else k: _cfg_list(v) for k, v in table.items()
+        }
+    data_files = (
+        cfg["options.data_files"] if cfg.has_section("options.data_files") else {}
+    )
+    settings["data_files"] = [f for v in data_files.values() for f in _cfg_list(v)]
+
+    license_files = metadata.get("license_files", metadata.get("license_file"))
+    if license_files is not None:
+        settings["license_files"] = _cfg_list(license_files)
+    return settings
+
+
+def _dynamic_files(dynamic: dict[str, Any]) -> Iterator[str]:
+    """The files ``[tool.setuptools.dynamic]`` reads."""
+    for value in dynamic.values():
+        tables = (
+            value.values() if "file" not in value and "attr" not in value else [value]
+        )
+        for table in tables:
+            files = table.get("file", []) if isinstance(table, dict) else []
+            yield from [files] if isinstance(files, str) else files
+
+
+#: [tool.setuptools] keys that map directly to settings
+_PYPROJECT_KEYS = {
+    "package-dir": "package_dir",
+    "py-modules": "py_modules",
+    "script-files": "scripts",
+    "package-data": "package_data",
+    "exclude-package-data": "exclude_package_data",
+}
+
+
+def _pyproject_references(project: dict[str, Any], tool: dict[str, Any]) -> list[str]:
+    """The files pyproject.toml's metadata is read from."""
+    readme = project.get("readme")
+    license_table = project.get("license")
+    return [
+        *([readme] if isinstance(readme, str) else []),
+        *([readme["file"]] if isinstance(readme, dict) and "file" in readme else []),
+        *(
+            [license_table["file"]]
+            if isinstance(license_table, dict) and "file" in license_table
+            else []
+        ),
+        *_dynamic_files(tool.get("dynamic", {})),
+    ]
+
+
+def _pyproject_options(pyproject: dict[str, Any]) -> dict[str, Any]:
+    """The file selection settings in pyproject.toml."""
+    project = pyproject.get("project", {})
+    tool = pyproject.get("tool", {}).get("setuptools", {})
+    settings: dict[str, Any] = {
+        "cmdclass": bool(tool.get("cmdclass")),
+        "referenced": _pyproject_references(project, tool),
+    }
+    settings.update(
+        {new: tool[old] for old, new in _PYPROJECT_KEYS.items() if old in tool}
+    )
+    for section in ("package_data", "exclude_package_data"):
+        if section in settings:
+            settings[section] = {
+                "" if k == "*" else k: v for k, v in settings[section].items()
+            }
+
+    packages = tool.get("packages")
+    if isinstance(packages, dict):
+        find = packages.get("find", {})
+        settings["packages"] = {
+            "where": find.get("where", ["."]),
+            "include": find.get("include", ["*"]),
+            "exclude": find.get("exclude", []),
+            "namespaces": find.get("namespaces", True),
+        }
+    elif packages is not None:
+        settings["packages"] = packages
+
+    if "data-files" in tool:
+        settings["data_files"] = [f for v in tool["data-files"].values() for f in v]
+    if "ext-modules" in tool:
+        settings["ext_sources"] = [
+            f for ext in tool["ext-modules"] for f in ext.get("sources", [])
+        ]
+    license_files = project.get("license-files", tool.get("license-files"))
+    if license_files is not None:
+        settings["license_files"] = license_files
+    return settings
+
+
+def _options(
+    pyproject: dict[str, Any], cfg: configparser.ConfigParser
+) -> dict[str, Any]:
+    """
+    The file selection settings from setup.cfg and pyproject.toml, the latter
+    taking precedence.
+    """
+    settings: dict[str, Any] = {
+        "package_dir": {},
+        "packages": None,
+        "py_modules": None,
+        "package_data": {},
+        "exclude_package_data": {},
+        "data_files": [],
+        "scripts": [],
+        "ext_sources": [],
+        "license_files": None,
+    }
+    cfg_settings = _cfg_options(cfg)
+    py_settings = _pyproject_options(pyproject)
+    settings.update(cfg_settings)
+    settings.update(py_settings)
+    settings["cmdclass"] = cfg_settings["cmdclass"] or py_settings["cmdclass"]
+    settings["referenced"] = cfg_settings["referenced"] + py_settings["referenced"]
+    return settings
+
+
+def _find_packages(
+    where: str,
+    dirs: set[str],
+    files: frozenset[str],
+    *,
+    finder: str,
+    include: Iterable[str] = ("*",),
+    exclude: Iterable[str] = (),
+) -> dict[str, str]:
+    """
+    Find packages in *where* like setuptools' ``regular``, ``namespace``, or
+    ``flat`` finders, as a mapping of package name to directory.
+    """
+
+    def looks_like_package(directory: str, parts: list[str]) -> bool:
+        if "." in parts[-1]:
+            return False
+        if finder == "regular":
+            return _join(directory, "__init__.py") in files
+        if finder == "flat":
+            return (parts[0].isidentifier() or parts[0].endswith("-stubs")) and all(
+                p.isidentifier() for p in parts[1:]
+            )
+        return True
+
+    include, exclude = list(include), [*_ALWAYS_EXCLUDE, *exclude]
+    prefix = "" if where in {"", "."} else f"{where.rstrip('/')}/"
+    found = {}
+    for directory in sorted(d for d in dirs if d.startswith(prefix) and d != prefix):
+        parts = directory[len(prefix) :].split("/")
+        # Directories are only searched if their parent looks like a package
+        parents = (_join(where, "/".join(parts[: i + 1])) for i in range(len(parts)))
+        if not all(
+            looks_like_package(d, parts[: i + 1]) for i, d in enumerate(parents)
+        ):
+            continue
+        name = ".".join(parts)
+        if any(fnmatch.fnmatchcase(name, p) for p in include) and not any(
+            fnmatch.fnmatchcase(name, p) for p in exclude
+        ):
+            found[name] = directory
+    return found
+
+
+def _find_modules(
+    where: str, files: frozenset[str], exclude: Iterable[str] = ()
+) -> list[str]:
+    """The top level modules in *where*, not matching *exclude*."""
+    modules = (
+        p.rpartition("/")[2].removesuffix(".py")
+        for p in _glob(_join(where, "*.py"), files)
+    )
+    return sorted(
+        m
+        for m in modules
+        if m.isidentifier() and not any(fnmatch.fnmatchcase(m, p) for p in exclude)
+    )
+
+
+def _package_path(name: str, package_dir: dict[str, str]) -> str:
+    """The directory of package *name* (or ``""`` for the root), like build_py."""
+    parts = name.split(".") if name else []
+    tail: list[str] = []
+    while parts:
+        directory = package_dir.get(".".join(parts))
+        if directory is not None:
+            return "/".join([directory, *tail]).strip("/")
+        tail.insert(0, parts.pop())
+    root = package_dir.get("", "")
+    return "/".join([root, *tail] if root else tail).strip("/")
+
+
+def _discover(
+    settings: dict[str, Any], dirs: set[str], files: frozenset[str]
+) -> tuple[dict[str, str], list[str]] | None:
+    """
+    Automatic discovery: the packages (name to directory) and modules, for
+    projects that don't list them. None when setuptools would refuse to guess.
+    """
+    package_dir = dict(settings["package_dir"])
+    root = package_dir.pop("", None)
+    if package_dir:
+        packages = {}
+        for name, directory in package_dir.items():
+            packages[name] = directory
+            nested = _find_packages(directory, dirs, files, finder="namespace")
+            packages.update({f"{name}.{n}": d for n, d in nested.items()})
+        return packages, []
+
+    src = root or "src"
+    if src in dirs:
+        settings["package_dir"] = {**settings["package_dir"], "": src}
+        return (
+            _find_packages(src, dirs, files, finder="namespace"),
+            _find_modules(src, files),
+        )
+
+    exclude = [*_FLAT_PACKAGES, *(f"{p}.*" for p in _FLAT_PACKAGES)]
+    packages = _find_packages("", dirs, files, finder="flat", exclude=exclude)
+    top_level = {n for n in packages if "." not in n and not n.endswith("-stubs")}
+    if len(top_level) > 1:
+        return None
+    if packages:
+        return packages, []
+    modules = _find_modules("", files, _FLAT_MODULES)
+    if len(modules) > 1:
+        return None
+    return {}, modules
+
+
+def _python_files(settings: dict[str, Any], files: frozenset[str]) -> set[str] | None:
+    """The package modules, listed modules, and package data."""
+    dirs = {p[:i] for p in files for i, c in enumerate(p) if c == "/"}
+    packages_setting = settings["packages"]
+    modules = settings["py_modules"]
+    if packages_setting is None and modules is None:
+        discovered = _discover(settings, dirs, files)
+        if discovered is None:
+            return None
+        packages, modules = discovered
+    elif isinstance(packages_setting, dict):
+        packages = {}
+        finder = "namespace" if packages_setting["namespaces"] else "regular"
+        for where in packages_setting["where"]:
+            packages.update(
+                _find_packages(
+                    where,
+                    dirs,
+                    files,
+                    finder=finder,
+                    include=packages_setting["include"],
+                    exclude=packages_setting["exclude"],
+                )
+            )
+    else:
+        packages = {
+            name: _package_path(name, settings["package_dir"])
+            for name in packages_setting or []
+        }
+
+    found = set()
+    for name in modules or []:
+        package, _, module = name.rpartition(".")
+        found.add(
+            _join(_package_path(package, settings["package_dir"]), f"{module}.py")
+        )
+    package_data, exclude_data = (
+        settings["package_data"],
+        settings["exclude_package_data"],
+    )
+    for name, directory in packages.items():
+        found |= _glob(_join(directory, "*.py"), files)
+        data = set()
+        for pattern in [*package_data.get("", []), *package_data.get(name, [])]:
+            data |= _glob(_join(directory, pattern), files)
+        for pattern in [*exclude_data.get("", []), *exclude_data.get(name, [])]:
+            regex = translate_pattern(_join(directory, pattern))
+            data = {p for p in data if not regex.match(p)}
+        found |= data
+    return found
+
+
+def _uses_scm(pyproject: dict[str, Any]) -> bool:
+    """setuptools-scm adds every file git tracks when it's a build requirement."""
+    requires = pyproject.get("build-system", {}).get("requires", [])
+    return any(
+        canonicalize_name(Requirement(r).name) == "setuptools-scm" for r in requires
+    )
+
+
 class SetuptoolsBackend:
     """SDist knowledge for the setuptools build backend."""
 
@@ -27,8 +458,11 @@ class SetuptoolsBackend:
     def git_only_excludes(  # pylint: disable=unused-argument
         self, pyproject: dict[str, Any], files: frozenset[str], source_dir: Path
     ) -> frozenset[str]:
-        # No excludes today; the future home for reading MANIFEST.in / setup.cfg.
-        return files
+        # Files MANIFEST.in leaves out (exclude, prune, ...), in command order
+        template = Template.read(source_dir)
+        if template is None:
+            return files
+        return files - template.excluded(files)
 
     def sdist_only_ignores(self, pyproject: dict[str, Any]) -> Iterator[str]:
         yield "*.egg-info"
@@ -43,3 +477,53 @@ class SetuptoolsBackend:
         )
         if version_file is not None:
             yield version_file
+
+    def predict_sdist_files(
+        self, pyproject: dict[str, Any], files: frozenset[str], source_dir: Path
+    ) -> frozenset[str] | None:
+        # Follows setuptools' manifest_maker: the defaults, the files a
+        # setuptools-scm file finder adds, MANIFEST.in, then license files.
+        if "setup.py" in files:
+            arguments = _setup_py_arguments(source_dir / "setup.py")
+            if arguments is None or arguments & _FILE_ARGUMENTS:
+                return None
+        cfg = configparser.ConfigParser(interpolation=None)
+        if "setup.cfg" in files:
+            cfg.read(source_dir / "setup.cfg", encoding="utf-8")
+        settings = _options(pyproject, cfg)
+        if settings["cmdclass"]:
+            return None
+        python = _python_files(settings, files)
+        if python is None:
+            return None
+
+        included = {
+            *[r for r in _READMES if r in files][:1],
+            *("setup.py", "setup.cfg", "pyproject.toml", "MANIFEST.in"),
+            *_glob("test/test*.py", files),
+            *_glob("tests/test*.py", files),
+            *python,
+            *settings["scripts"],
+            *settings["ext_sources"],
+        }
+        for pattern in settings["data_files"]:
+            included |= _glob(pattern, files)
+        if _uses_scm(pyproject):
+            included |= files
+
+        template = Template.read(source_dir)
+        if template is not None:
+            included = template.apply(included, files)
+
+        license_files = settings["license_files"]
+        for pattern in _LICENSE_FILES if license_files is None else license_files:
+            included |= {p for p in _glob(pattern, files) if not p.endswith("~")}
+        included.update(settings["referenced"])
+
+        pruned = translate_pattern("build/**")
+        vcs = ("RCS", "CVS", ".svn")
+        return frozenset(
+            p
+            for p in included & files
+            if not pruned.match(p) and not any(d in vcs for d in p.split("/")[:-1])
+        )
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
-__lazy_modules__ = [f"{__spec__.parent}._base", "typing"]
+__lazy_modules__ = [
+    f"{__spec__.parent}._base",
+    "check_sdist.manifest",
+    "check_sdist.sdist",
+    "packaging.utils",
+    "subprocess",
+    "sys",
+    "typing",
+]
 
+import subprocess
+import sys
 from typing import Any, ClassVar
 
+from packaging.utils import canonicalize_name
+
+from check_sdist.manifest import translate_pattern
+from check_sdist.sdist import get_uv
+
 from ._base import pathspec_filter
 
 TYPE_CHECKING = False
@@ -18,26 +33,129 @@ def __dir__() -> list[str]:
     return __all__
 
 
+def _excludes(settings: dict[str, Any]) -> list[str]:
+    """The source-exclude patterns, as gitignore-style patterns."""
+    excludes = list(settings.get("source-exclude", []))
+    if settings.get("default-excludes", True):
+        excludes += ["__pycache__", "*.pyc", "*.pyo"]
+    # uv excludes are unanchored unless prefixed with "/"; valid uv globs
+    # can't contain gitignore's "!"/"#" specials, so the translation to
+    # gitignore patterns is exact.
+    return [p if p.startswith("/") else f"**/{p}" for p in excludes]
+
+
+def _modules(
+    project: dict[str, Any], settings: dict[str, Any], files: frozenset[str]
+) -> list[str] | None:
+    """The module directories, or None if one is missing its ``__init__``."""
+    names = settings.get("module-name")
+    if names is None:
+        names = canonicalize_name(project["name"]).replace("-", "_")
+    root = settings.get("module-root", "src").strip("/")
+    paths = []
+    for name in [names] if isinstance(names, str) else names:
+        path = "/".join(filter(None, [root, *name.split(".")]))
+        init = "__init__.pyi" if name.endswith("-stubs") else "__init__.py"
+        if not settings.get("namespace", False) and f"{path}/{init}" not in files:
+            return None
+        paths.append(path)
+    return paths
+
+
 class UvBackend:
     """SDist knowledge for the uv build backend."""
 
     build_backends: ClassVar[tuple[str, ...]] = ("uv_build",)
+    # uv_build only selects files by its include and exclude settings
+    reads_git_index: ClassVar[bool] = False
 
     def git_only_excludes(  # pylint: disable=unused-argument
         self, pyproject: dict[str, Any], files: frozenset[str], source_dir: Path
     ) -> frozenset[str]:
         settings = pyproject.get("tool", {}).get("uv", {}).get("build-backend", {})
-        excludes = list(settings.get("source-exclude", []))
-        if settings.get("default-excludes", True):
-            excludes += ["__pycache__", "*.pyc", "*.pyo"]
-        # uv excludes are unanchored unless prefixed with "/"; valid uv globs
-        # can't contain gitignore's "!"/"#" specials, so the translation to
-        # gitignore patterns is exact.
-        patterns = [p if p.startswith("/") else f"**/{p}" for p in excludes]
-        return pathspec_filter(patterns, files)
+        return pathspec_filter(_excludes(settings), files)
 
     def sdist_only_ignores(  # pylint: disable=unused-argument
         self, pyproject: dict[str, Any]
     ) -> Iterator[str]:
-        # uv keeps a copy of the unmodified pyproject.toml in the SDist.
+        # uv rewrites pyproject.toml, and keeps a copy of the unmodified one
+        yield "/pyproject.toml"
         yield "pyproject.toml.orig"
+
+    def predict_sdist_files(  # pylint: disable=unused-argument
+        self, pyproject: dict[str, Any], files: frozenset[str], source_dir: Path
+    ) -> frozenset[str] | None:
+        # Follows uv's source distribution file matching: everything included
+        # by a glob (pyproject.toml, the modules, the readme, license files,
+        # data directories, and source-include) that isn't excluded.
+        if "project" not in pyproject:
+            return None
+        settings = pyproject.get("tool", {}).get("uv", {}).get("build-backend", {})
+        project = pyproject["project"]
+        modules = _modules(project, settings, files)
+        if modules is None:
+            return None
+        readme = project.get("readme")
+        if isinstance(readme, dict):
+            readme = readme.get("file")
+        includes = [
+            "pyproject.toml",
+            *(f"{m}/**" for m in modules),
+            *([readme] if readme else []),
+            *project.get("license-files", []),
+            *(f"{d.strip('/')}/**" for d in settings.get("data", {}).values()),
+            *settings.get("source-include", []),
+        ]
+        regexes = [
+            translate_pattern(prefix)
+            for pattern in includes
+            for prefix in _prefixes(pattern.removeprefix("./"))
+        ]
+        # Globs like ``**/x`` reach into .git and untracked files too
+        if any(r.match(".git/HEAD") for r in regexes):
+            return None
+        included = frozenset(p for p in files if any(r.match(p) for r in regexes))
+        return pathspec_filter(_excludes(settings), included)
+
+    def list_sdist_files(  # pylint: disable=unused-argument
+        self, pyproject: dict[str, Any], source_dir: Path
+    ) -> frozenset[str] | None:
+        # uv can list the SDist contents directly, and refuses (non-zero exit)
+        # if the project's uv_build requirement doesn't match the uv in use.
+        uv = get_uv()
+        if uv is None:
+            return None
+        result = subprocess.run(
+            [uv, "build", "--list", "--sdist", "--python", sys.executable],
+            cwd=source_dir,
+            capture_output=True,
+            encoding="utf-8",
+            check=False,
+        )
+        if result.returncode != 0:
+            return None
+        return frozenset(
+            _parse_list_line(line)
+            for line in result.stdout.splitlines()
+            if line.endswith(")") and "/" in line
+        )
+
+
+def _prefixes(pattern: str) -> list[str]:
+    """
+    *pattern* and its leading parts. uv includes a file that matches a leading
+    part as if it were a directory that could hold a match, so ``*/a.py``
+    includes every top level file.
+    """
+    parts = pattern.split("/")
+    return ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def _parse_list_line(line: str) -> str:
+    """Parse a ``uv build --list`` line like "pkg-1.0/path (source)"."""
+    entry = line.split("/", maxsplit=1)[1]
+    # Usually the source matches the path, which might itself contain " ("
+    path = entry[: (len(entry) - 3) // 2]
+    if entry == f"{path} ({path})":
+        return path
+    return entry.rsplit(" (", maxsplit=1)[0]
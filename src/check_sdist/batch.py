@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+__lazy_modules__ = [
+    "concurrent.futures",
+    "contextlib",
+    "json",
+    "os",
+    "sys",
+    "tempfile",
+]
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+__all__ = ["compare_many", "read_manifest"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def read_manifest(path: Path) -> list[Path]:
+    """
+    Read source directories from a manifest file, one per line, relative to
+    the manifest. Blank lines and lines starting with ``#`` are skipped.
+    """
+    with path.open(encoding="utf-8") as f:
+        lines = [ln.strip() for ln in f]
+    return [path.parent / ln for ln in lines if ln and not ln.startswith("#")]
+
+
+def _compare_captured(source_dir: Path, options: dict[str, Any]) -> tuple[int, str]:
+    """Run compare(), capturing all output including the build's."""
+
+    # pylint: disable-next=import-outside-toplevel
+    from .__main__ import compare  # noqa: PLC0415
+
+    # Appending, so Python's writes and the subprocesses' writes interleave
+    with tempfile.TemporaryFile(
+        "a+", buffering=1, encoding="utf-8", errors="replace"
+    ) as out:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved = os.dup(1), os.dup(2)
+        os.dup2(out.fileno(), 1)
+        os.dup2(out.fileno(), 2)
+        try:
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+                result = compare(source_dir, **options)
+                if options.get("timings") is not None:
+                    print(options["timings"].report(), file=sys.stderr)
+        finally:
+            for fd, saved_fd in enumerate(saved, start=1):
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+        out.seek(0)
+        return result, out.read()
+
+
+def compare_many(
+    source_dirs: Sequence[Path], options: dict[str, Any], *, jobs: int
+) -> int:
+    """
+    Run compare() with keyword arguments *options* for several source
+    directories in up to *jobs* processes. The output of each project is
+    printed together, in the order given, including its timings if requested.
+    Text output has a header per project; JSON Lines output (``ndjson``) has
+    an ``error`` record for projects that could not be checked. Returns the
+    results combined with bitwise or; raises SystemExit if any project could
+    not be checked.
+    """
+
+    result = 0
+    failed = 0
+    text = options.get("output_format", "text") == "text"
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_compare_captured, d, options) for d in source_dirs]
+        for source_dir, future in zip(source_dirs, futures):
+            if text:
+                print(f"==> {source_dir} <==", flush=True)
+            try:
+                code, output = future.result()
+            except Exception as err:  # pylint: disable=broad-exception-caught # noqa: BLE001
+                if text:
+                    print(f"Failed to check: {err!r}")
+                else:
+                    error = {"type": "error", "source_dir": str(source_dir)}
+                    print(json.dumps({**error, "error": repr(err)}))
+                failed += 1
+            else:
+                print(output, end="")
+                result |= code
+            if text:
+                print(flush=True)
+
+    if failed:
+        msg = f"check-sdist: failed to check {failed} of {len(source_dirs)} projects"
+        raise SystemExit(msg)
+    return result
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+__lazy_modules__ = [
+    f"{__spec__.parent}._storage",
+    f"{__spec__.parent}.sdist",
+    f"{__spec__.parent}.timings",
+    "build",
+    "hashlib",
+    "importlib.metadata",
+    "json",
+    "os",
+    "shutil",
+    "sys",
+    "time",
+]
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Literal
+
+import build
+
+from ._storage import cache_dir, file_lock
+from .sdist import get_uv, run_build
+from .timings import Timings
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+__all__ = [
+    "BuildEnv",
+    "build_sdist",
+    "build_wheel",
+    "env_key",
+    "env_versions",
+    "evict",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+#: Environments older than this are rebuilt, so unpinned requirements update
+MAX_AGE = 7 * 24 * 60 * 60
+
+#: Least recently used environments are removed above this total size
+MAX_SIZE = 4 * 1024**3
+
+
+def env_key(requires: Iterable[str], installer: Literal["uv", "pip"]) -> str:
+    """Hash the build requirements, interpreter, and installer for an env."""
+    data = {
+        "requires": sorted(set(requires)),
+        "python": sys.executable,
+        "version": sys.version,
+        "installer": installer,
+    }
+    return hashlib.sha256(json.dumps(data).encode()).hexdigest()[:16]
+
+
+class BuildEnv:
+    """A cached virtual environment with build requirements installed."""
+
+    def __init__(self, path: Path, installer: Literal["uv", "pip"]) -> None:
+        self.path = path
+        self.installer = installer
+
+    @property
+    def python(self) -> Path:
+        if sys.platform == "win32":
+            return self.path / "Scripts" / "python.exe"
+        return self.path / "bin" / "python"
+
+    @property
+    def _info_file(self) -> Path:
+        return self.path / "check-sdist-env.json"
+
+    def _info(self) -> dict[str, float | list[str]]:
+        try:
+            with self._info_file.open(encoding="utf-8") as f:
+                return json.load(f)  # type: ignore[no-any-return]
+        except FileNotFoundError:
+            return {}
+
+    def ready(self) -> bool:
+        """The environment is complete and not too old."""
+        created = self._info().get("created")
+        return isinstance(created, float) and time.time() - created < MAX_AGE
+
+    def installed(self) -> frozenset[str]:
+        """The requirement strings installed so far."""
+        requires = self._info().get("requires", [])
+        assert isinstance(requires, list)
+        return frozenset(requires)
+
+    def versions(self) -> dict[str, str]:
+        """The distributions installed in the environment, with their versions."""
+        paths = [
+            *self.path.glob("lib/python*/site-packages"),
+            self.path / "Lib/site-packages",
+        ]
+        dists = importlib.metadata.distributions(path=[str(p) for p in paths])
+        return {dist.metadata["Name"]: dist.version for dist in dists}
+
+    def create(self, requires: Iterable[str]) -> None:
+        """Create a fresh environment with *requires* installed."""
+        if self.path.exists():
+            shutil.rmtree(self.path)
+        if self.installer == "uv":
+            uv = get_uv()
+            assert uv is not None, "uv must be found to reach this point!"
+            cmd = [uv, "venv", "--python", sys.executable, str(self.path)]
+        else:
+            cmd = [sys.executable, "-m", "venv", str(self.path)]
+        run_build(cmd)
+        self._run_install(set(requires))
+        # Only a complete environment gets an info file
+        self._write_info(time.time(), sorted(set(requires)))
+
+    def install(self, requires: Iterable[str]) -> None:
+        """Install *requires* into the environment if missing."""
+        new = set(requires) - self.installed()
+        if new:
+            self._run_install(new)
+            created = self._info()["created"]
+            assert isinstance(created, float)
+            self._write_info(created, sorted(self.installed() | new))
+
+    def _run_install(self, requires: set[str]) -> None:
+        if not requires:
+            return
+        if self.installer == "uv":
+            uv = get_uv()
+            assert uv is not None, "uv must be found to reach this point!"
+            cmd = [uv, "pip", "install", "--python", str(self.python)]
+        else:
+            cmd = [
+                str(self.python),
+                "-m",
+                "pip",
+                "install",
+                "--no-warn-script-location",
+            ]
+        run_build([*cmd, *sorted(requires)])
+
+    def touch(self) -> None:
+        """Mark the environment as recently used."""
+        os.utime(self.path)
+
+    def _write_info(self, created: float, requires: list[str]) -> None:
+        tmp = self._info_file.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"created": created, "requires": requires}), encoding="utf-8"
+        )
+        tmp.replace(self._info_file)
+
+
+def _dir_size(path: Path) -> int:
+    return sum(p.lstat().st_size for p in path.rglob("*"))
+
+
+def evict(root: Path, *, keep: str = "") -> None:
+    """Remove the least recently used environments above ``MAX_SIZE``."""
+    envs = sorted(
+        (p for p in root.iterdir() if p.is_dir() and p.name != keep),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    total = 0
+    for path in envs:
+        total += _dir_size(path)
+        if total <= MAX_SIZE:
+            continue
+        # Skip environments that are in use right now
+        with file_lock(root / f"{path.name}.lock", blocking=False) as locked:
+            if locked:
+                shutil.rmtree(path)
+
+
+def env_versions(
+    source_dir: Path, installer: Literal["uv", "pip"]
+) -> dict[str, str] | None:
+    """
+    The versions installed in the cached environment *source_dir* is built in,
+    or None if it isn't ready yet.
+    """
+    requires = build.ProjectBuilder(source_dir).build_system_requires
+    env = BuildEnv(cache_dir() / "envs" / env_key(requires, installer), installer)
+    return env.versions() if env.ready() else None
+
+
+def _build(
+    source_dir: Path,
+    outdir: Path,
+    distribution: Literal["sdist", "wheel"],
+    *,
+    installer: Literal["uv", "pip"],
+    timings: Timings | None = None,
+) -> Path:
+    timings = timings or Timings()
+    requires = build.ProjectBuilder(source_dir).build_system_requires
+    root = cache_dir() / "envs"
+    key = env_key(requires, installer)
+    env = BuildEnv(root / key, installer)
+    lock = root / f"{key}.lock"
+    phase = "build SDist" if distribution == "sdist" else "build wheel"
+
+    while True:
+        # Setting up the environment needs it to ourselves
+        with timings.phase("build environment"), file_lock(lock):
+            if not env.ready():
+                evict(root, keep=key)
+                env.create(requires)
+            builder = build.ProjectBuilder(
+                source_dir, python_executable=str(env.python), runner=run_build
+            )
+            env.install(builder.get_requires_for_build(distribution))
+            env.touch()
+
+        # Several builds can share it; retry if it was replaced in between
+        with timings.phase(phase), file_lock(lock, shared=True):
+            if env.ready():
+                return Path(builder.build(distribution, outdir))
+
+
+def build_sdist(
+    source_dir: Path,
+    outdir: Path,
+    *,
+    installer: Literal["uv", "pip"],
+    timings: Timings | None = None,
+) -> Path:
+    """Build an SDist in a cached isolated environment, returning its path."""
+    return _build(source_dir, outdir, "sdist", installer=installer, timings=timings)
+
+
+def build_wheel(
+    source_dir: Path,
+    outdir: Path,
+    *,
+    installer: Literal["uv", "pip"],
+    timings: Timings | None = None,
+) -> Path:
+    """Build a wheel in a cached isolated environment, returning its path."""
+    return _build(source_dir, outdir, "wheel", installer=installer, timings=timings)
@@ -1,27 +1,273 @@
 from __future__ import annotations
 
-__lazy_modules__ = ["subprocess"]
+__lazy_modules__ = ["contextlib", "mmap", "os", "struct", "subprocess"]
 
+import contextlib
+import mmap
+import os
+import struct
 import subprocess
 from pathlib import Path
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+__all__ = ["git_blobs", "git_files", "git_tree_state", "index_files"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+#: Parsed index entries (mode, path) by index file, with its stat signature
+_INDEX_CACHE: dict[Path, tuple[tuple[int, int, int], list[tuple[int, bytes]]]] = {}
+
+#: Environment variables that move the git directory or index
+_GIT_OVERRIDES = ("GIT_DIR", "GIT_WORK_TREE", "GIT_INDEX_FILE", "GIT_COMMON_DIR")
+
+_GITLINK = 0o160000
+_EXTENDED = 0x4000
+
+#: Index versions that have extended flags, and prefix compressed paths
+_EXTENDED_FLAGS_VERSION = 3
+_PREFIX_COMPRESSED_VERSION = 4
+
+
+def _find_git_dir(source_dir: Path) -> tuple[Path, Path] | None:
+    """Return the top of the work tree containing *source_dir* and its git dir."""
+    for top in (source_dir, *source_dir.parents):
+        dotgit = top / ".git"
+        if dotgit.is_dir():
+            return top, dotgit
+        if dotgit.is_file():
+            # Worktrees and submodules point to their git dir
+            content = dotgit.read_text(encoding="utf-8").strip()
+            if not content.startswith("gitdir: "):
+                return None
+            return top, top.joinpath(content.removeprefix("gitdir: ")).resolve()
+    return None
+
+
+def _default_object_format(git_dir: Path) -> bool:
+    """Check that the repository doesn't set an object format (like SHA-256)."""
+    common_dir = git_dir
+    with contextlib.suppress(FileNotFoundError):
+        common_dir = git_dir / git_dir.joinpath("commondir").read_text().strip()
+    try:
+        return b"objectformat" not in common_dir.joinpath("config").read_bytes().lower()
+    except FileNotFoundError:
+        return True
+
+
+def _parse_index(data: mmap.mmap) -> list[tuple[int, bytes]] | None:
+    """
+    Parse the mode and path of each entry of a version 2, 3, or 4 git index.
+    Returns None for features that only git itself should interpret (sparse
+    directory entries and split indexes).
+    """
+    signature, version, count = struct.unpack_from(">4sLL", data)
+    if signature != b"DIRC" or version not in {2, 3, 4}:
+        return None
+
+    entries = []
+    pos = 12
+    name = b""
+    for _ in range(count):
+        # ctime, mtime, dev, ino, mode, uid, gid, size, SHA-1, flags
+        (mode,) = struct.unpack_from(">L", data, pos + 24)
+        (flags,) = struct.unpack_from(">H", data, pos + 60)
+        start = pos + (
+            64 if version >= _EXTENDED_FLAGS_VERSION and flags & _EXTENDED else 62
+        )
+        if version == _PREFIX_COMPRESSED_VERSION:
+            # The name is prefix compressed against the previous one
+            byte = data[start]
+            strip = byte & 0x7F
+            start += 1
+            while byte & 0x80:
+                byte = data[start]
+                strip = ((strip + 1) << 7) | (byte & 0x7F)
+                start += 1
+            end = data.find(b"\0", start)
+            name = name[: len(name) - strip] + data[start:end]
+            pos = end + 1
+        else:
+            end = data.find(b"\0", start)
+            name = data[start:end]
+            pos += (end - pos + 8) & ~7
+        if name.endswith(b"/"):
+            return None
+        entries.append((mode, name))
+
+    # Extensions follow the entries, before the final checksum
+    while pos + 8 <= len(data) - 20:
+        extension, size = struct.unpack_from(">4sL", data, pos)
+        if extension in {b"link", b"sdir"}:
+            return None
+        pos += 8 + size
+
+    return entries
+
+
+def _index_entries(index: Path) -> list[tuple[int, bytes]] | None:
+    st = index.stat()
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+    cached = _INDEX_CACHE.get(index)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with (
+        index.open("rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        entries = _parse_index(data)
+    if entries is not None:
+        _INDEX_CACHE[index] = (signature, entries)
+    return entries
+
+
+def index_files(
+    source_dir: Path, *, recurse_submodules: bool = True
+) -> frozenset[str] | None:
+    """
+    Read the files tracked by git in the source directory straight from the
+    git index. Returns None if git itself is needed: submodules (when
+    recursing), sparse or split indexes, non-SHA-1 repositories, or an
+    environment that relocates the repository. Parsed indexes are cached until
+    the index file changes.
+    """
+
+    if any(var in os.environ for var in _GIT_OVERRIDES):
+        return None
+    source_dir = source_dir.resolve()
+    found = _find_git_dir(source_dir)
+    if found is None:
+        return None
+    top, git_dir = found
+    if not _default_object_format(git_dir):
+        return None
+
+    try:
+        entries = _index_entries(git_dir / "index")
+    except (OSError, ValueError, IndexError, struct.error):
+        return None
+    if entries is None:
+        return None
+
+    relative = source_dir.relative_to(top).as_posix()
+    prefix = b"" if relative == "." else os.fsencode(relative) + b"/"
+    files = set()
+    for mode, name in entries:
+        if not name.startswith(prefix):
+            continue
+        if recurse_submodules and mode == _GITLINK:
+            return None
+        files.add(os.fsdecode(name[len(prefix) :]))
+    return frozenset(files)
+
 
 def git_files(source_dir: Path, *, recurse_submodules: bool = True) -> frozenset[str]:
     """Return the files that are tracked by git in the source directory."""
 
-    cmd = ["git", "ls-files", "--cached"]
+    files = index_files(source_dir, recurse_submodules=recurse_submodules)
+    if files is not None:
+        return files
+
+    cmd = ["git", "ls-files", "--cached", "-z"]
+    if recurse_submodules:
+        cmd.append("--recurse-submodules")
+    output = subprocess.run(cmd, cwd=source_dir, capture_output=True, check=True)
+    return frozenset(os.fsdecode(p) for p in output.stdout.split(b"\0") if p)
+
+
+def git_blobs(
+    source_dir: Path, *, recurse_submodules: bool = True
+) -> dict[str, tuple[str, str]]:
+    """
+    Return the mode (like ``100644``) and blob ID of each file staged in the
+    source directory, as committed or added, without reading the work tree.
+    Submodule entries and unmerged paths are skipped.
+    """
+
+    cmd = ["git", "ls-files", "--stage", "-z"]
     if recurse_submodules:
         cmd.append("--recurse-submodules")
-    return frozenset(
+    output = subprocess.run(cmd, cwd=source_dir, capture_output=True, check=True)
+    blobs = {}
+    for entry in output.stdout.split(b"\0"):
+        # "<mode> <object> <stage>\t<path>"
+        info, _, path = entry.partition(b"\t")
+        mode, _, rest = info.partition(b" ")
+        object_id, _, stage = rest.partition(b" ")
+        if path and stage == b"0" and int(mode, 8) != _GITLINK:
+            blobs[os.fsdecode(path)] = (mode.decode(), object_id.decode())
+    return blobs
+
+
+def git_tree_state(
+    source_dir: Path,
+    *,
+    recurse_submodules: bool = True,
+    skip: Callable[[str], bool] | None = None,
+) -> bytes:
+    """
+    Return bytes that change whenever the files the build can see change: the
+    index (paths, modes, and blob IDs), plus the size and modification time of
+    files that are modified, untracked, or ignored (a build can package those
+    too, like in-place built extensions). An ignored directory counts as one
+    entry. Untracked and ignored paths (relative to the top level of the
+    repository) for which *skip* returns True are left out.
+    """
+
+    cmd = ["git", "ls-files", "--stage", "-z"]
+    if recurse_submodules:
+        cmd.append("--recurse-submodules")
+    index = subprocess.run(cmd, cwd=source_dir, capture_output=True, check=True).stdout
+    status = subprocess.run(
+        [
+            "git",
+            "status",
+            "--porcelain=v1",
+            "-z",
+            "--untracked-files=all",
+            "--ignored=matching",
+            ".",
+        ],
+        cwd=source_dir,
+        capture_output=True,
+        check=True,
+    ).stdout
+
+    toplevel = Path(
         subprocess.run(
-            cmd,
+            ["git", "rev-parse", "--show-toplevel"],
             cwd=source_dir,
-            text=True,
             capture_output=True,
+            text=True,
             check=True,
-        ).stdout.splitlines()
+        ).stdout.strip()
     )
 
+    # Entries are "XY path" (relative to the top level); renames and copies
+    # are followed by the old path, which is skipped
+    state = [index]
+    entries = iter(status.split(b"\0"))
+    for entry in entries:
+        if not entry:
+            continue
+        if b"R" in entry[:2] or b"C" in entry[:2]:
+            next(entries, None)
+        path = os.fsdecode(entry[3:])
+        if skip is not None and entry[:2] in {b"??", b"!!"} and skip(path):
+            continue
+        state.append(entry)
+        with contextlib.suppress(OSError):
+            st = toplevel.joinpath(path).stat()
+            state.append(b"%d:%d" % (st.st_size, st.st_mtime_ns))
+
+    return b"\0\0".join(state)
+
 
 if __name__ == "__main__":
     print(*sorted(git_files(Path.cwd())), sep="\n")
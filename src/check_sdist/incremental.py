@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+__lazy_modules__ = [
+    f"{__spec__.parent}.patterns",
+    f"{__spec__.parent}.watch",
+    "os",
+    "pathlib",
+    "subprocess",
+]
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Any
+
+from .patterns import compile_patterns, ignore_patterns
+from .watch import BUILD_CONFIG
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .backends import Backend
+
+__all__ = ["git_changes", "record_check", "reuse_listing", "staged_unaffected"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def _git(source_dir: Path, *args: str) -> bytes:
+    return subprocess.run(
+        ["git", *args], cwd=source_dir, capture_output=True, check=True
+    ).stdout
+
+
+def _tracked_files(source_dir: Path) -> dict[str, str]:
+    """
+    Describe the tracked files as they are in the working tree, without
+    writing to the repository: the mode and blob ID git's index has for each,
+    plus the size and modification time of the ones modified since. Files
+    deleted from the working tree are left out.
+    """
+    tracked = {}
+    for entry in _git(source_dir, "ls-files", "--stage", "-z").split(b"\0"):
+        # "<mode> <object> <stage>\t<path>"
+        info, _, path = entry.partition(b"\t")
+        if path:
+            tracked[os.fsdecode(path)] = info.decode()
+    modified = _git(source_dir, "ls-files", "--modified", "-z").split(b"\0")
+    for name in {os.fsdecode(p) for p in modified if p}:
+        try:
+            st = source_dir.joinpath(name).stat()
+        except OSError:
+            tracked.pop(name, None)
+            continue
+        tracked[name] += f" {st.st_size}:{st.st_mtime_ns}"
+    return tracked
+
+
+def _untracked_files(source_dir: Path) -> frozenset[str]:
+    """
+    The untracked files, including ignored ones (a backend can still package
+    those). A directory that is ignored as a whole is one ``dir/`` entry.
+    """
+    prefix = _git(source_dir, "rev-parse", "--show-prefix").decode().strip()
+    output = _git(
+        source_dir,
+        "status",
+        "--porcelain=v1",
+        "-z",
+        "--untracked-files=all",
+        "--ignored=matching",
+        ".",
+    )
+    # Entries are "XY path", relative to the top level
+    return frozenset(
+        os.fsdecode(entry[3:])[len(prefix) :]
+        for entry in output.split(b"\0")
+        if entry[:2] in {b"??", b"!!"}
+    )
+
+
+def _tracked_changes(
+    before: dict[str, str], after: dict[str, str]
+) -> list[tuple[str, str]]:
+    """Like git_changes(), between two snapshots from _tracked_files()."""
+    changes = [("D", p) for p in before.keys() - after.keys()]
+    changes += [("A", p) for p in after.keys() - before.keys()]
+    changes += [("M", p) for p in before.keys() & after.keys() if before[p] != after[p]]
+    return changes
+
+
+def git_changes(
+    source_dir: Path, since: str | None, *, cached: bool = False
+) -> list[tuple[str, str]]:
+    """
+    Return the status letter and path (relative to the source directory) of
+    each tracked file that differs between tree-ish *since* and the working
+    tree, or the index if *cached*. Without *since*, the index is compared to
+    ``HEAD``. Renames are a deletion and an addition.
+    """
+    output = _git(
+        source_dir,
+        "diff",
+        "--relative",
+        "--name-status",
+        "--no-renames",
+        "-z",
+        *(["--cached"] if cached else []),
+        *([since] if since else []),
+        "--",
+    )
+    fields = [os.fsdecode(f) for f in output.split(b"\0")]
+    return list(zip(fields[0::2], fields[1::2]))
+
+
+def _listed(path: str, listed: frozenset[str]) -> bool:
+    """Check if a file, or anything in a ``dir/``, is in the listing."""
+    if path.endswith("/"):
+        return any(f.startswith(path) for f in listed)
+    return path in listed
+
+
+def _has_submodules(source_dir: Path) -> bool:
+    toplevel = _git(source_dir, "rev-parse", "--show-toplevel").decode().strip()
+    return Path(toplevel, ".gitmodules").exists()
+
+
+def _ignored_additions(
+    added: set[str],
+    source_dir: Path,
+    *,
+    pyproject: dict[str, Any],
+    backend: Backend,
+) -> bool:
+    """True if the new tracked files are all ignored when missing from the SDist."""
+    _, git_patterns = ignore_patterns(pyproject, backend)
+    kept = compile_patterns(git_patterns).filter(added)
+    return not backend.git_only_excludes(pyproject, kept, source_dir)
+
+
+def record_check(source_dir: Path, listed: frozenset[str]) -> dict[str, Any] | None:
+    """
+    Describe the state of the source directory that an SDist listing came
+    from: the tracked files as they are in the working tree (not ``HEAD``, so
+    undoing an uncommitted change is noticed), and the untracked files.
+    Nothing is written to the repository. Returns None outside of git.
+    """
+    try:
+        tracked = _tracked_files(source_dir)
+        untracked = _untracked_files(source_dir)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {"files": sorted(listed), "tracked": tracked, "untracked": sorted(untracked)}
+
+
+def reuse_listing(
+    record: dict[str, Any] | None,
+    source_dir: Path,
+    *,
+    pyproject: dict[str, Any],
+    backend: Backend,
+) -> frozenset[str] | None:
+    """
+    Return the SDist listing from a previous check (see record_check()) if no
+    change since then can change the result, otherwise None. Only files being
+    added, removed, or renamed can; a change is harmless if it is:
+
+    * editing a file, unless it is build configuration (``pyproject.toml``,
+      ``MANIFEST.in``, ``.gitignore``, ...),
+    * removing a file that wasn't in the SDist,
+    * adding a tracked file that is ignored by ``git-only`` or the backend's
+      excludes (so it won't be reported whether or not it's in the SDist),
+    * adding an untracked or gitignored file that is ignored by
+      ``sdist-only``.
+
+    Files are compared by their size and modification time, so nothing is
+    written to the repository. A directory git ignores as a whole is checked
+    by name only. Only the default ``mode = "git"`` is supported, without
+    submodules.
+    """
+
+    config = pyproject.get("tool", {}).get("check-sdist", {})
+    if record is None or config.get("mode", "git") != "git":
+        return None
+    try:
+        tracked_before = dict(record["tracked"])
+        listed = frozenset(record["files"])
+        untracked_before = frozenset(record["untracked"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    try:
+        if _has_submodules(source_dir):
+            return None
+        tracked = _tracked_files(source_dir)
+        untracked = _untracked_files(source_dir)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    # Unmerged paths have entries in stages 1 to 3
+    if any(info.split(" ")[2] != "0" for info in tracked.values()):
+        return None
+    changes = _tracked_changes(tracked_before, tracked)
+    added = {p for status, p in changes if status == "A"}
+    removed = {p for status, p in changes if status == "D"}
+    new_untracked = untracked - untracked_before
+    removed |= untracked_before - untracked
+
+    touched = {p for _, p in changes} | new_untracked | removed
+    if any(p.rpartition("/")[2] in BUILD_CONFIG for p in touched):
+        return None
+    if any(_listed(p, listed) for p in removed):
+        return None
+
+    if not _ignored_additions(
+        added - listed, source_dir, pyproject=pyproject, backend=backend
+    ):
+        return None
+    sdist_matcher = compile_patterns(ignore_patterns(pyproject, backend)[0])
+    if not all(
+        sdist_matcher.match_dir(p[:-1])
+        if p.endswith("/")
+        else sdist_matcher.match_file(p)
+        for p in new_untracked
+    ):
+        return None
+    return listed
+
+
+def staged_unaffected(
+    source_dir: Path, *, pyproject: dict[str, Any], backend: Backend
+) -> bool:
+    """
+    Return True if the changes staged for commit can't make the SDist stop
+    matching git, assuming it matched at ``HEAD``, so a pre-commit check can
+    skip building it. That is the case if they only edit files (other than
+    build configuration, see reuse_listing()), delete files from the working
+    tree too, or add files ignored by ``git-only`` or the backend's excludes.
+    Other changes, such as adding a source file, need a full check.
+    """
+
+    config = pyproject.get("tool", {}).get("check-sdist", {})
+    if config.get("mode", "git") != "git":
+        return False
+    try:
+        if _has_submodules(source_dir):
+            return False
+        changes = git_changes(source_dir, None, cached=True)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+    if any(status not in {"A", "D", "M", "T"} for status, _ in changes):
+        return False
+    if any(p.rpartition("/")[2] in BUILD_CONFIG for _, p in changes):
+        return False
+    # Kept on disk (git rm --cached), the file could still be in the SDist
+    if any(status == "D" and source_dir.joinpath(p).exists() for status, p in changes):
+        return False
+
+    added = {p for status, p in changes if status == "A"}
+    return _ignored_additions(added, source_dir, pyproject=pyproject, backend=backend)
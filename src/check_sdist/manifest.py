@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+__lazy_modules__ = ["re"]
+
+import re
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+__all__ = ["Template", "translate_pattern"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+#: Number of arguments each command takes, at least (or exactly for graft/prune)
+_ARGUMENTS = {
+    "include": 1,
+    "exclude": 1,
+    "global-include": 1,
+    "global-exclude": 1,
+    "recursive-include": 2,
+    "recursive-exclude": 2,
+    "graft": 1,
+    "prune": 1,
+}
+
+_EXCLUDES = frozenset({"exclude", "global-exclude", "recursive-exclude", "prune"})
+
+
+def translate_pattern(pattern: str, *, hidden: bool = True) -> re.Pattern[str]:
+    """
+    Translate a MANIFEST.in glob to a regular expression matching whole paths,
+    like setuptools: ``*``, ``?``, and ``[...]`` don't match ``/``, and a
+    ``**`` component matches any number of directories. Without ``hidden``,
+    wildcards don't match names starting with ``.``, like :func:`glob.glob`
+    (setuptools' own glob, used for MANIFEST.in, matches them).
+    """
+    chunks = pattern.split("/")
+    regex = ""
+    for i, chunk in enumerate(chunks):
+        last = i == len(chunks) - 1
+        name = "[^/]+" if hidden else r"(?!\.)[^/]+"
+        if chunk == "**":
+            if not last:
+                regex += f"(?:{name}/)*"
+            else:
+                regex += ".*" if hidden else f"(?:{name}/)*{name}"
+            continue
+
+        if not hidden and chunk[:1] in {"*", "?", "["}:
+            regex += r"(?!\.)"
+        j = 0
+        while j < len(chunk):
+            char = chunk[j]
+            if char == "*":
+                regex += "[^/]*"
+            elif char == "?":
+                regex += "[^/]"
+            elif char == "[" and (end := _class_end(chunk, j)) is not None:
+                inner = chunk[j + 1 : end]
+                negate = inner.startswith("!")
+                inner = re.escape(inner[1:] if negate else inner)
+                regex += f"[{'^' if negate else ''}{inner}]"
+                j = end
+            else:
+                regex += re.escape(char)
+            j += 1
+        if not last:
+            regex += "/"
+    return re.compile(rf"{regex}\Z", flags=re.DOTALL)
+
+
+def _class_end(chunk: str, start: int) -> int | None:
+    """The index of the ``]`` closing the character class at *start*."""
+    end = start + 1
+    if end < len(chunk) and chunk[end] == "!":
+        end += 1
+    if end < len(chunk) and chunk[end] == "]":
+        end += 1
+    end = chunk.find("]", end)
+    return None if end == -1 else end
+
+
+def _logical_lines(text: str) -> Iterable[str]:
+    """
+    The lines of a MANIFEST.in, as setuptools reads them: ``#`` starts a
+    comment unless escaped, and a trailing backslash continues a line.
+    """
+    pending = ""
+    for raw in text.splitlines():
+        line = raw
+        pos = line.find("#")
+        if pos == 0 or (pos > 0 and line[pos - 1] != "\\"):
+            line = line[:pos]
+            if not line.strip():
+                continue
+        line = line.replace("\\#", "#")
+        if pending:
+            line = pending + line.lstrip()
+        if line.endswith("\\"):
+            pending = line[:-1]
+            continue
+        pending = ""
+        if line.strip():
+            yield line.strip()
+    if pending.strip():
+        yield pending.strip()
+
+
+def _match(names: Iterable[str], regex: re.Pattern[str]) -> set[str]:
+    return {name for name in names if regex.match(name)}
+
+
+class Template:
+    """
+    A MANIFEST.in file, evaluated against a known set of files (such as the
+    ones git tracks) instead of the file system. Lines setuptools would warn
+    about and skip (unknown commands, missing arguments) are skipped.
+    """
+
+    def __init__(self, text: str) -> None:
+        #: The valid commands, as (action, arguments)
+        self.commands: list[tuple[str, tuple[str, ...]]] = []
+        for line in _logical_lines(text):
+            action, *words = line.split()
+            count = _ARGUMENTS.get(action)
+            if count is None or len(words) < count:
+                continue
+            if action in {"graft", "prune"} and len(words) != count:
+                continue
+            self.commands.append((action, tuple(w.removeprefix("./") for w in words)))
+
+    @classmethod
+    def read(cls, source_dir: Path) -> Template | None:
+        """Read ``MANIFEST.in`` in *source_dir*, if there is one."""
+        try:
+            text = source_dir.joinpath("MANIFEST.in").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        return cls(text)
+
+    @staticmethod
+    def _patterns(action: str, args: tuple[str, ...]) -> list[str]:
+        """The full path patterns of a command, relative to the root."""
+        if action.startswith("recursive-"):
+            directory, *patterns = args
+            prefix = "" if directory in {"", "."} else f"{directory.rstrip('/')}/"
+            return [f"{prefix}**/{p}" for p in patterns]
+        if action.startswith("global-"):
+            return [f"**/{p}" for p in args]
+        if action == "prune":
+            return [f"{args[0].rstrip('/')}/**"]
+        return list(args)
+
+    def apply(self, included: Iterable[str], files: Iterable[str]) -> set[str]:
+        """
+        Run the commands on the *included* files, adding from *files*, and
+        return the result.
+        """
+        files = frozenset(files)
+        result = set(included)
+        dirs = {p[:i] for p in files for i, c in enumerate(p) if c == "/"}
+        for action, args in self.commands:
+            if action == "graft":
+                if args[0] in {"", "."}:
+                    result |= files
+                    continue
+                grafted = _match(dirs, translate_pattern(args[0]))
+                result |= {
+                    p
+                    for p in files
+                    if any(p[:i] in grafted for i, c in enumerate(p) if c == "/")
+                }
+                continue
+            for pattern in self._patterns(action, args):
+                if action in _EXCLUDES:
+                    result -= _match(result, translate_pattern(pattern))
+                else:
+                    result |= _match(files, translate_pattern(pattern))
+        return result
+
+    def excluded(self, files: Iterable[str]) -> frozenset[str]:
+        """
+        The *files* left out by the commands run in order, starting from all
+        of them: ones an exclude, global-exclude, recursive-exclude, or prune
+        matches, unless a later command includes them again.
+        """
+        files = frozenset(files)
+        return files - self.apply(files, files)
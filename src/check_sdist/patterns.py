@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+__lazy_modules__ = [
+    f"{__spec__.parent}.resources",
+    "fnmatch",
+    "functools",
+    "pathspec",
+    "re",
+]
+
+import fnmatch
+import functools
+import re
+
+import pathspec
+
+from .resources import resources
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Any
+
+    from .backends import Backend
+
+__all__ = [
+    "FileIndex",
+    "Matcher",
+    "compile_patterns",
+    "default_ignore",
+    "ignore_patterns",
+    "wheel_ignore_patterns",
+]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+# pathspec marks directory matches with named groups, which can't repeat
+_NAMED_GROUP = re.compile(r"\(\?P<\w+>")
+
+
+class Matcher:
+    """
+    Gitignore-style patterns, compiled once.
+
+    Without negated patterns, all the patterns are fused into one regular
+    expression, and a matching directory drops its whole subtree without
+    checking each file. Negated patterns depend on the order they apply in, so
+    those fall back to checking each file against the full spec.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.spec = pathspec.GitIgnoreSpec.from_lines(patterns)
+        active = [p for p in self.spec.patterns if p.include is not None and p.regex]
+        #: The source line of each active pattern, to report which one matched
+        self._lines = [str(p.pattern) for p in active]
+        self._fused: re.Pattern[str] | None = None
+        self._simple = all(p.include for p in active)
+        if self._simple and active:
+            # Each pattern is a named group, so a match knows its pattern
+            self._fused = re.compile(
+                "|".join(
+                    f"(?P<p{i}>{_NAMED_GROUP.sub('(?:', p.regex.pattern)})"
+                    for i, p in enumerate(active)
+                    if p.regex is not None
+                )
+            )
+
+    def match_file(self, path: str) -> bool:
+        """Check if a single path is matched."""
+        if not self._simple:
+            return self.spec.match_file(path)
+        return self._fused is not None and self._fused.search(path) is not None
+
+    def which(self, path: str) -> str | None:
+        """Return the pattern that matches a path, or None if not matched."""
+        if not self._simple:
+            if not self.spec.match_file(path):
+                return None
+            # The last pattern that ignores the path decides
+            return next(
+                (
+                    str(p.pattern)
+                    for p in reversed(self.spec.patterns)
+                    if p.include and p.match_file(path) is not None
+                ),
+                None,
+            )
+        match = self._fused.search(path) if self._fused is not None else None
+        if match is None or match.lastgroup is None:
+            return None
+        return self._lines[int(match.lastgroup[1:])]
+
+    def match_dir(self, path: str) -> bool:
+        """
+        Check if a directory, and so everything in it, is matched. Only known
+        without negated patterns; always False otherwise.
+        """
+        return self._fused is not None and self._fused.search(f"{path}/") is not None
+
+    def filter(self, files: Iterable[str]) -> frozenset[str]:
+        """Return the files that are not matched."""
+        if not self._simple:
+            return frozenset(p for p in files if not self.spec.match_file(p))
+        if self._fused is None:
+            return frozenset(files)
+
+        search = self._fused.search
+        ignored = {"": False}
+
+        def dir_ignored(directory: str) -> bool:
+            if directory not in ignored:
+                parent = directory.rpartition("/")[0]
+                ignored[directory] = (
+                    dir_ignored(parent) or search(f"{directory}/") is not None
+                )
+            return ignored[directory]
+
+        return frozenset(
+            p
+            for p in files
+            if not dir_ignored(p.rpartition("/")[0]) and search(p) is None
+        )
+
+
+@functools.lru_cache(maxsize=64)
+def _compile(patterns: tuple[str, ...]) -> Matcher:
+    return Matcher(patterns)
+
+
+def compile_patterns(patterns: Iterable[str]) -> Matcher:
+    """
+    Compile gitignore-style patterns, reusing the result for the same patterns
+    in the same order.
+    """
+    return _compile(tuple(patterns))
+
+
+@functools.cache
+def default_ignore() -> tuple[str, ...]:
+    """The patterns in ``default-ignore.txt``, read once."""
+    with resources.joinpath("default-ignore.txt").open("r", encoding="utf-8") as f:
+        return tuple(f.read().splitlines())
+
+
+def ignore_patterns(
+    pyproject: dict[str, Any], backend: Backend
+) -> tuple[list[str], list[str]]:
+    """
+    Return the SDist-only and git-only ignore patterns for a project: the
+    defaults (unless ``default-ignore`` is off), then the configured ones, so
+    their negations can override the defaults.
+    """
+    config = pyproject.get("tool", {}).get("check-sdist", {})
+    sdist_only = list(config.get("sdist-only", []))
+    git_only = list(config.get("git-only", []))
+    if config.get("default-ignore", True):
+        sdist_only[:0] = ["*.dist-info", *backend.sdist_only_ignores(pyproject)]
+        git_only[:0] = default_ignore()
+    return sdist_only, git_only
+
+
+#: Compiled extensions are built, so never come from the SDist
+WHEEL_ONLY_DEFAULTS = ("*.so", "*.pyd", "*.dylib", "*.dll")
+
+
+def wheel_ignore_patterns(pyproject: dict[str, Any]) -> list[str]:
+    """
+    Return the wheel-only ignore patterns for a project: compiled extensions
+    (unless ``default-ignore`` is off), then the configured ones.
+    """
+    config = pyproject.get("tool", {}).get("check-sdist", {})
+    wheel_only = list(config.get("wheel-only", []))
+    if config.get("default-ignore", True):
+        wheel_only[:0] = WHEEL_ONLY_DEFAULTS
+    return wheel_only
+
+
+class FileIndex:
+    """
+    A directory index over relative POSIX file paths, for evaluating
+    pathlib-style globs against a known set of files instead of walking the
+    filesystem. A glob that matches a directory selects every file in it.
+    """
+
+    def __init__(self, files: Iterable[str]) -> None:
+        self.files = frozenset(files)
+        #: Full paths of the files and directories directly in each directory
+        self.children: dict[str, set[str]] = {"": set()}
+        for path in self.files:
+            child = path
+            while child:
+                parent = child.rpartition("/")[0]
+                known = parent in self.children
+                self.children.setdefault(parent, set()).add(child)
+                if known:
+                    break
+                child = parent
+
+    def _subdirs(self, dirs: Iterable[str], *, hidden: bool = True) -> set[str]:
+        """
+        The directories given and every directory below them, skipping ones
+        starting with ``.`` without *hidden*.
+        """
+        found = set()
+        todo = list(dirs)
+        while todo:
+            directory = todo.pop()
+            if directory not in found:
+                found.add(directory)
+                todo.extend(
+                    c
+                    for c in self.children[directory]
+                    if c in self.children and (hidden or not _is_hidden(c))
+                )
+        return found
+
+    def match(self, pattern: str, *, hidden: bool = True) -> frozenset[str]:
+        """
+        Return the files and directories matched by *pattern*, like
+        :func:`glob.glob` with ``recursive=True``: ``**`` matches any number of
+        directories (and everything in them if it comes last), and a trailing
+        ``/`` only matches directories. Without *hidden*, wildcards and ``**``
+        don't match names starting with ``.``.
+        """
+        parts = [p for p in pattern.split("/") if p not in {"", "."}]
+        if not parts:
+            return frozenset()
+
+        current = {""}
+        for i, part in enumerate(parts):
+            last = i == len(parts) - 1 and not pattern.endswith("/")
+            if part == "**":
+                current = self._subdirs(current, hidden=hidden)
+                if last:
+                    current |= {
+                        child
+                        for directory in current
+                        for child in self.children[directory]
+                        if hidden or not _is_hidden(child)
+                    }
+                continue
+
+            if any(c in part for c in "*?["):
+                match = re.compile(fnmatch.translate(part)).match
+                visible = hidden or part.startswith(".")
+                matched = {
+                    child
+                    for directory in current
+                    for child in self.children[directory]
+                    if match(child.rpartition("/")[2])
+                    and (visible or not _is_hidden(child))
+                }
+            else:
+                matched = {
+                    child
+                    for directory in current
+                    if (child := f"{directory}/{part}" if directory else part)
+                    in self.children[directory]
+                }
+            current = {c for c in matched if last or c in self.children}
+        current.discard("")
+        return frozenset(current)
+
+    def glob(self, pattern: str, *, hidden: bool = True) -> frozenset[str]:
+        """
+        Return the files matched by *pattern*, relative to the index root, with
+        every file in a matched directory. See :meth:`match` for *hidden*.
+        """
+        current = self.match(pattern, hidden=hidden)
+        found = {p for p in current if p in self.files}
+        for directory in self._subdirs(p for p in current if p in self.children):
+            found.update(c for c in self.children[directory] if c in self.files)
+        return frozenset(found)
+
+
+def _is_hidden(path: str) -> bool:
+    return path.rpartition("/")[2].startswith(".")
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+__lazy_modules__ = ["json", "sys"]
+
+import json
+import sys
+from typing import Any, Literal, TextIO
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+__all__ = ["file_record", "write_report"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def file_record(path: str, category: str, rule: str | None = None) -> dict[str, Any]:
+    """
+    A report record for one file. *category* is ``sdist`` (SDist contents,
+    only when verbose), ``sdist-only``, ``git-only``, ``wheel-only``, one of
+    those prefixed with ``ignored-``, ``unpredicted`` or ``predicted-only``
+    when checking a prediction, or ``modified`` (or ``ignored-modified``) when
+    checking contents; *rule* is the pattern or backend that ignored it.
+    """
+    return {"type": "file", "path": path, "category": category, "rule": rule}
+
+
+def write_report(
+    records: Iterable[dict[str, Any]],
+    summary: dict[str, Any],
+    *,
+    output_format: Literal["json", "ndjson"],
+    file: TextIO | None = None,
+) -> None:
+    """
+    Write file records as they are produced, then a summary record. ``ndjson``
+    writes one record per line; ``json`` writes one object with a ``files``
+    list and the ``summary``.
+    """
+    out = file or sys.stdout
+    summary = {"type": "summary", **summary}
+    if output_format == "ndjson":
+        for record in records:
+            out.write(json.dumps(record))
+            out.write("\n")
+        out.write(json.dumps(summary))
+        out.write("\n")
+    else:
+        out.write('{"files": [')
+        for i, record in enumerate(records):
+            out.write(",\n  " if i else "\n  ")
+            out.write(json.dumps(record))
+        out.write(f'\n], "summary": {json.dumps(summary)}}}\n')
+    out.flush()
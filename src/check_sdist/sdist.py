@@ -1,16 +1,49 @@
 from __future__ import annotations
 
-__lazy_modules__ = ["shutil", "subprocess", "sys", "tarfile", "tempfile"]
+__lazy_modules__ = [
+    f"{__spec__.parent}.timings",
+    "concurrent.futures",
+    "functools",
+    "hashlib",
+    "os",
+    "shutil",
+    "subprocess",
+    "sys",
+    "tarfile",
+    "tempfile",
+    "zipfile",
+]
 
+import concurrent.futures
+import functools
+import hashlib
+import os
 import shutil
 import subprocess
 import sys
 import tarfile
 import tempfile
+import zipfile
 from pathlib import Path
 from typing import Literal
 
-__all__ = ["get_uv", "sdist_files"]
+from .timings import Timings
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+__all__ = [
+    "archive_blobs",
+    "archive_files",
+    "find_sdist",
+    "get_uv",
+    "run_build",
+    "sdist_files",
+    "wheel_archive_files",
+    "wheel_files",
+    "wheel_only_files",
+]
 
 
 def get_uv() -> str | None:
@@ -26,51 +59,276 @@ def get_uv() -> str | None:
         return shutil.which("uv")
 
 
+def run_build(
+    cmd: Sequence[str],
+    cwd: str | Path | None = None,
+    extra_environ: Mapping[str, str] | None = None,
+) -> None:
+    """
+    Run a build command with its output on stderr, so it doesn't mix with the
+    report on stdout (such as ``--format json``). Also usable as the runner of
+    a ``build.ProjectBuilder``.
+    """
+    try:
+        stderr = sys.stderr.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Replaced by an object without a file descriptor
+        stderr = 2
+    env = {**os.environ, **extra_environ} if extra_environ else None
+    subprocess.run(cmd, cwd=cwd, env=env, stdout=stderr, check=True)
+
+
+def _build_command(
+    outdir: str,
+    *,
+    isolated: bool,
+    installer: Literal["uv", "pip"],
+    distribution: Literal["sdist", "wheel"] = "sdist",
+) -> list[str]:
+    if installer == "pip":
+        return [
+            sys.executable,
+            "-m",
+            "build",
+            f"--{distribution}",
+            "--outdir",
+            outdir,
+            f"--installer={installer}" if isolated else "--no-isolation",
+        ]
+
+    uv = get_uv()
+    assert uv is not None, "uv must be found to reach this point!"
+    return [
+        uv,
+        "build",
+        f"--{distribution}",
+        "--python",
+        sys.executable,
+        "--out-dir",
+        outdir,
+        *([] if isolated else ["--no-build-isolation"]),
+    ]
+
+
 def sdist_files(
-    source_dir: Path, *, isolated: bool, installer: Literal["uv", "pip"]
+    source_dir: Path,
+    *,
+    isolated: bool,
+    installer: Literal["uv", "pip"],
+    reuse_env: bool = False,
+    build_dir: Path | None = None,
+    timings: Timings | None = None,
+    keep_dir: Path | None = None,
 ) -> frozenset[str]:
-    """Return the files that would be (are) placed in the SDist."""
-
-    with tempfile.TemporaryDirectory() as outdir:
-        if installer == "pip":
-            cmd = [
-                sys.executable,
-                "-m",
-                "build",
-                "--sdist",
-                "--outdir",
-                outdir,
-                f"--installer={installer}" if isolated else "--no-isolation",
-            ]
+    """
+    Return the files that would be (are) placed in the SDist. With
+    ``reuse_env``, isolated builds use a cached build environment. The SDist
+    is written to a temporary directory inside ``build_dir`` if given (such as
+    a RAM-backed ``/dev/shm``), and moved to ``keep_dir`` afterwards if given.
+    The build and reading the archive are recorded in ``timings`` if given.
+    """
+
+    timings = timings or Timings()
+    with tempfile.TemporaryDirectory(dir=build_dir) as outdir:
+        if isolated and reuse_env:
+            # pylint: disable-next=import-outside-toplevel
+            from .buildenv import build_sdist  # noqa: PLC0415
+
+            build_sdist(source_dir, Path(outdir), installer=installer, timings=timings)
         else:
-            uv = get_uv()
-            assert uv is not None, "uv must be found to reach this point!"
-            cmd = [
-                uv,
-                "build",
-                "--sdist",
-                "--python",
-                sys.executable,
-                "--out-dir",
-                outdir,
-                *([] if isolated else ["--no-build-isolation"]),
-            ]
-
-        subprocess.run(cmd, check=True, cwd=source_dir)
-
-        (outpath,) = Path(outdir).glob("*.tar.gz")
-
-        with tarfile.open(outpath) as tar:
-            members = tar.getmembers()
-            prefixes = {m.name.split("/", maxsplit=1)[0] for m in members}
-            if len(prefixes) != 1:
-                msg = f"malformed SDist, contains multiple packages {prefixes}"
+            cmd = _build_command(outdir, isolated=isolated, installer=installer)
+            with timings.phase("build SDist"):
+                run_build(cmd, source_dir)
+
+        with timings.phase("read SDist"):
+            (outpath,) = Path(outdir).glob("*.tar.gz")
+            files = archive_files(outpath)
+        if keep_dir is not None:
+            shutil.move(outpath, keep_dir / outpath.name)
+        return files
+
+
+def archive_files(path: Path) -> frozenset[str]:
+    """
+    Return the files in an SDist archive, relative to its top directory. The
+    archive is read as a stream in a single pass.
+    """
+
+    prefix = None
+    files = set()
+    with tarfile.open(path, "r|*") as tar:
+        for member in tar:
+            top, _, name = member.name.partition("/")
+            if prefix is None:
+                prefix = top
+            elif top != prefix:
+                msg = f"malformed SDist, contains multiple packages {prefix!r} and {top!r}"
                 raise AssertionError(msg)
-            return frozenset(
-                t.name.split("/", maxsplit=1)[1]
-                for t in members
-                if t.isfile() or t.issym()
+            if member.isfile() or member.issym():
+                files.add(name)
+    return frozenset(files)
+
+
+#: Files are read in chunks of this size; smaller ones are hashed in a thread
+CHUNK_SIZE = 1024**2
+
+
+def _blob_id(algorithm: str, size: int, chunks: Iterable[bytes]) -> str:
+    """The git blob ID of *size* bytes of content, given in *chunks*."""
+    blob = hashlib.new(algorithm, b"blob %d\0" % size)
+    for chunk in chunks:
+        blob.update(chunk)
+    return blob.hexdigest()
+
+
+def archive_blobs(path: Path, *, algorithm: str = "sha1") -> dict[str, tuple[str, str]]:
+    """
+    Return the git mode and blob ID of each file in an SDist archive, relative
+    to its top directory, as :func:`check_sdist.git.git_blobs` does for git.
+    The archive is read as a stream in a single pass. Files are hashed in a
+    thread pool while it's decompressed (both release the GIL), except large
+    ones, which are hashed chunk by chunk as they're read.
+    """
+
+    hashed: dict[str, tuple[str, str | concurrent.futures.Future[str]]] = {}
+    blob_id: str | concurrent.futures.Future[str]
+    with (
+        concurrent.futures.ThreadPoolExecutor() as pool,
+        tarfile.open(path, "r|*") as tar,
+    ):
+        for member in tar:
+            name = member.name.partition("/")[2]
+            if member.issym():
+                target = os.fsencode(member.linkname)
+                blob_id = pool.submit(_blob_id, algorithm, len(target), [target])
+                hashed[name] = ("120000", blob_id)
+                continue
+            if not member.isfile():
+                continue
+            mode = "100755" if member.mode & 0o100 else "100644"
+            f = tar.extractfile(member)
+            assert f is not None, "regular files can always be extracted"
+            if member.size <= CHUNK_SIZE:
+                blob_id = pool.submit(_blob_id, algorithm, member.size, [f.read()])
+            else:
+                chunks = iter(functools.partial(f.read, CHUNK_SIZE), b"")
+                blob_id = _blob_id(algorithm, member.size, chunks)
+            hashed[name] = (mode, blob_id)
+
+    return {
+        name: (mode, blob_id if isinstance(blob_id, str) else blob_id.result())
+        for name, (mode, blob_id) in hashed.items()
+    }
+
+
+def find_sdist(path: Path) -> Path:
+    """
+    Return the SDist archive *path*, or the only one in the directory *path*
+    (such as ``dist/``). Raises FileNotFoundError if there is none, and
+    ValueError if a directory has several.
+    """
+
+    if not path.is_dir():
+        if not path.is_file():
+            msg = f"SDist not found: {path}"
+            raise FileNotFoundError(msg)
+        return path
+    found = sorted(path.glob("*.tar.gz"))
+    if not found:
+        msg = f"No SDist (*.tar.gz) found in {path}"
+        raise FileNotFoundError(msg)
+    if len(found) > 1:
+        names = ", ".join(p.name for p in found)
+        msg = f"Several SDists found in {path}, pass one: {names}"
+        raise ValueError(msg)
+    return found[0]
+
+
+def _unpack(sdist: Path, dest: Path) -> Path:
+    """Extract an SDist into *dest*, returning its top directory."""
+    with tarfile.open(sdist) as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(dest, filter="data")
+        else:
+            tar.extractall(dest)
+    (top,) = dest.iterdir()
+    return top
+
+
+def wheel_files(
+    sdist: Path,
+    *,
+    isolated: bool,
+    installer: Literal["uv", "pip"],
+    reuse_env: bool = False,
+    build_dir: Path | None = None,
+    timings: Timings | None = None,
+) -> frozenset[str]:
+    """
+    Return the files in a wheel built from the *sdist* archive, the way build
+    frontends do by default, without its ``.dist-info`` directory. The options
+    are the same as for sdist_files().
+    """
+
+    timings = timings or Timings()
+    with tempfile.TemporaryDirectory(dir=build_dir) as tmp:
+        with timings.phase("unpack SDist"):
+            source_dir = _unpack(sdist, Path(tmp) / "src")
+        outdir = Path(tmp) / "dist"
+        outdir.mkdir()
+        if isolated and reuse_env:
+            # pylint: disable-next=import-outside-toplevel
+            from .buildenv import build_wheel  # noqa: PLC0415
+
+            build_wheel(source_dir, outdir, installer=installer, timings=timings)
+        else:
+            cmd = _build_command(
+                str(outdir),
+                isolated=isolated,
+                installer=installer,
+                distribution="wheel",
             )
+            with timings.phase("build wheel"):
+                run_build(cmd, source_dir)
+
+        with timings.phase("read wheel"):
+            (outpath,) = outdir.glob("*.whl")
+            return wheel_archive_files(outpath)
+
+
+def wheel_archive_files(path: Path) -> frozenset[str]:
+    """
+    Return the files in a wheel, except its generated ``.dist-info``
+    directory. Only the zip's central directory is read.
+    """
+
+    with zipfile.ZipFile(path) as whl:
+        names = whl.namelist()
+    return frozenset(
+        name
+        for name in names
+        if not name.endswith("/") and not name.partition("/")[0].endswith(".dist-info")
+    )
+
+
+def wheel_only_files(wheel: Iterable[str], sources: Iterable[str]) -> frozenset[str]:
+    """
+    Return the files in the *wheel* that don't come from any of the *sources*
+    (the SDist's and git's files). Wheels drop the directories a package is
+    found in, like ``src/``, so a wheel file comes from a source file if it's
+    a trailing part of its path. Files in ``<name>.data/<scheme>/`` are
+    compared without that prefix.
+    """
+
+    sources = frozenset(sources)
+    tails = {p[i + 1 :] for p in sources for i, c in enumerate(p) if c == "/"}
+    tails.update(sources)
+
+    def installed(name: str) -> str:
+        top, _, rest = name.partition("/")
+        return rest.partition("/")[2] if top.endswith(".data") else name
+
+    return frozenset(name for name in wheel if installed(name) not in tails)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+__lazy_modules__ = ["os", "pathlib", "shutil", "subprocess", "sys", "tempfile"]
+
+import contextlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+__all__ = ["shadow_tree"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+#: ioctl(2) request that makes a file share another's blocks, copy-on-write
+#: (Linux, on btrfs, XFS, bcachefs, ...)
+_FICLONE = 0x40049409
+
+
+def _git(cwd: Path, *args: str) -> bytes:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, check=True
+    ).stdout
+
+
+def _copy_file(src: Path, dst: Path, *, reflink: bool) -> bool:
+    """
+    Copy *src* to *dst*, sharing its blocks if *reflink*. Returns False if the
+    file system can't, so the remaining files can go straight to copying.
+    """
+    if reflink:
+        # pylint: disable-next=import-outside-toplevel
+        import fcntl  # noqa: PLC0415
+
+        with src.open("rb") as fin, dst.open("wb") as fout:
+            try:
+                fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+            except OSError:
+                reflink = False
+        if reflink:
+            shutil.copystat(src, dst)
+            return True
+    shutil.copy2(src, dst)
+    return False
+
+
+@contextlib.contextmanager
+def shadow_tree(
+    source_dir: Path, *, build_dir: Path | None = None
+) -> Generator[Path, None, None]:
+    """
+    Yield a throwaway copy of *source_dir* to build in, so the build's output
+    (``*.egg-info``, generated files, ...) and injected junk never touch the
+    real checkout, and several checks can run against it at once. The copy has
+    the files git tracks and the untracked files it doesn't ignore. Files are
+    cloned copy-on-write where the file system supports it (so put
+    ``build_dir`` on the same file system), and copied otherwise; hard links
+    aren't used, since a build rewriting a file would change the original.
+    Its ``.git`` is a clone sharing the original's objects, with a copy of the
+    index, so staged changes and tags are seen by VCS-aware backends.
+    """
+    info = _git(
+        source_dir,
+        "rev-parse",
+        "--show-toplevel",
+        "--git-path",
+        "index",
+        "--show-prefix",
+    )
+    toplevel, index, prefix = os.fsdecode(info).split("\n")[:3]
+    listing = _git(
+        source_dir, "ls-files", "--cached", "--others", "--exclude-standard", "-z"
+    )
+    files = sorted({os.fsdecode(f) for f in listing.split(b"\0") if f})
+
+    with tempfile.TemporaryDirectory(prefix="check-sdist-", dir=build_dir) as tmp:
+        root = Path(tmp) / "src"
+        _git(
+            Path(tmp),
+            "clone",
+            "--quiet",
+            "--shared",
+            "--no-checkout",
+            toplevel,
+            str(root),
+        )
+        with contextlib.suppress(FileNotFoundError):
+            shutil.copyfile(source_dir / index, root / ".git" / "index")
+
+        shadow = root / prefix
+        for parent in sorted({str(Path(f).parent) for f in files}):
+            shadow.joinpath(parent).mkdir(parents=True, exist_ok=True)
+        reflink = sys.platform == "linux"
+        for name in files:
+            src, dst = source_dir / name, shadow / name
+            if src.is_symlink():
+                dst.symlink_to(src.readlink())
+            elif src.is_dir():
+                # A submodule, its contents are copied without its .git
+                shutil.copytree(
+                    src, dst, symlinks=True, ignore=shutil.ignore_patterns(".git")
+                )
+            elif src.exists():
+                reflink = _copy_file(src, dst, reflink=reflink)
+        yield shadow
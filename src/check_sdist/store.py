@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+__lazy_modules__ = [
+    f"{__spec__.parent}.git",
+    f"{__spec__.parent}.patterns",
+    f"{__spec__.parent}.sdist",
+    "contextlib",
+    "functools",
+    "hashlib",
+    "importlib.metadata",
+    "json",
+    "os",
+    "packaging.requirements",
+    "pathlib",
+    "subprocess",
+    "tempfile",
+    "time",
+]
+
+import contextlib
+import functools
+import hashlib
+import importlib.metadata
+import json
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Literal, Protocol
+
+from packaging.requirements import Requirement
+
+from . import __version__
+from .git import git_tree_state
+from .patterns import compile_patterns, default_ignore
+from .sdist import get_uv
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .backends import Backend
+
+__all__ = ["DirectoryStore", "Store", "last_check_key", "sdist_key"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+#: Results older than this are dropped, to pick up new isolated backends
+MAX_AGE = 7 * 24 * 60 * 60
+
+#: What build uses when ``pyproject.toml`` has no ``[build-system]`` table
+DEFAULT_REQUIRES = ["setuptools >= 40.8.0"]
+
+#: The oldest results are removed above this total size
+MAX_SIZE = 256 * 1024**2
+
+
+class Store(Protocol):
+    """Somewhere to keep SDist file lists between runs, by key."""
+
+    def get(self, key: str) -> frozenset[str] | None:
+        """Return the stored file list, or None if missing or expired."""
+
+    def put(self, key: str, files: frozenset[str]) -> None:
+        """Store a file list."""
+
+    def get_record(self, key: str) -> dict[str, Any] | None:
+        """Return a stored JSON object, or None if missing or expired."""
+
+    def put_record(self, key: str, record: dict[str, Any]) -> None:
+        """Store a JSON object."""
+
+
+class DirectoryStore:
+    """
+    Keep SDist file lists as JSON files in a directory. Writes are atomic
+    renames, so several machines can share one directory (such as over NFS).
+    """
+
+    def __init__(
+        self, path: Path, *, max_age: float = MAX_AGE, max_size: int = MAX_SIZE
+    ) -> None:
+        self.path = path
+        self.max_age = max_age
+        self.max_size = max_size
+
+    def _entry(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> frozenset[str] | None:
+        record = self.get_record(key)
+        try:
+            return None if record is None else frozenset(record["files"])
+        except (KeyError, TypeError):
+            return None
+
+    def put(self, key: str, files: frozenset[str]) -> None:
+        self.put_record(key, {"files": sorted(files)})
+
+    def get_record(self, key: str) -> dict[str, Any] | None:
+        entry = self._entry(key)
+        try:
+            if time.time() - entry.stat().st_mtime > self.max_age:
+                return None
+            with entry.open(encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            # Missing, or being evicted by another process
+            return None
+        return record if isinstance(record, dict) else None
+
+    def put_record(self, key: str, record: dict[str, Any]) -> None:
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=entry.parent, suffix=".tmp", delete=False
+        ) as f:
+            json.dump(record, f)
+        Path(f.name).replace(entry)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove expired results, then the oldest ones above ``max_size``."""
+        now = time.time()
+        entries = []
+        for entry in self.path.glob("*/*.json"):
+            with contextlib.suppress(FileNotFoundError):
+                st = entry.stat()
+                if now - st.st_mtime > self.max_age:
+                    entry.unlink()
+                else:
+                    entries.append((st.st_mtime, st.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                entry.unlink()
+            total -= size
+
+
+def _installed_version(requirement: str) -> str | None:
+    try:
+        return importlib.metadata.version(Requirement(requirement).name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+@functools.cache
+def _frontend_version(installer: Literal["uv", "pip"]) -> str:
+    if installer == "uv":
+        uv = get_uv()
+        assert uv is not None, "uv must be found to reach this point!"
+        return subprocess.run(
+            [uv, "--version"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    return f"build {importlib.metadata.version('build')}"
+
+
+def _backend_versions(
+    source_dir: Path,
+    pyproject: dict[str, Any],
+    *,
+    isolated: bool,
+    reuse_env: bool,
+    installer: Literal["uv", "pip"],
+) -> Mapping[str, str | None] | None:
+    """
+    The versions of the build requirements the SDist would be built with, or
+    None if they can't be known before building it.
+    """
+    if not isolated:
+        build_system = pyproject.get("build-system", {})
+        requires = build_system.get("requires", DEFAULT_REQUIRES)
+        return {r: _installed_version(r) for r in requires}
+    if reuse_env:
+        # pylint: disable-next=import-outside-toplevel
+        from .buildenv import env_versions  # noqa: PLC0415
+
+        return env_versions(source_dir, installer)
+    # A fresh environment gets whatever was released last
+    return None
+
+
+def _settings(
+    source_dir: Path,
+    pyproject: dict[str, Any],
+    backend: Backend,
+    *,
+    isolated: bool,
+    reuse_env: bool,
+    installer: Literal["uv", "pip"],
+    shadow: bool,
+) -> bytes | None:
+    """
+    Everything besides the source files that the SDist contents depend on, or
+    None if the backend's version isn't known.
+    """
+    versions = _backend_versions(
+        source_dir,
+        pyproject,
+        isolated=isolated,
+        reuse_env=reuse_env,
+        installer=installer,
+    )
+    if versions is None:
+        return None
+    data = {
+        "check-sdist": __version__,
+        "config": pyproject.get("tool", {}).get("check-sdist", {}),
+        "backend": f"{type(backend).__module__}.{type(backend).__qualname__}",
+        "frontend": _frontend_version(installer),
+        "isolated": isolated,
+        "requires": versions,
+        "shadow": shadow,
+    }
+    return json.dumps(data, sort_keys=True, default=str).encode()
+
+
+def sdist_key(
+    source_dir: Path,
+    *,
+    pyproject: dict[str, Any],
+    backend: Backend,
+    isolated: bool,
+    installer: Literal["uv", "pip"],
+    reuse_env: bool = False,
+    shadow: bool = False,
+) -> str | None:
+    """
+    Hash everything the SDist contents depend on, or return None if the source
+    directory isn't in a git repository or the backend's version can't be
+    known ahead of time. That's the case for isolated builds, unless
+    ``reuse_env`` and the cached build environment is ready.
+    """
+    info = _settings(
+        source_dir,
+        pyproject,
+        backend,
+        isolated=isolated,
+        reuse_env=reuse_env,
+        installer=installer,
+        shadow=shadow,
+    )
+    if info is None:
+        return None
+    config = pyproject.get("tool", {}).get("check-sdist", {})
+    # Junk like .coverage changes all the time, so it isn't part of the key
+    try:
+        state = git_tree_state(
+            source_dir,
+            recurse_submodules=config.get("recurse-submodules", True),
+            skip=compile_patterns(default_ignore()).match_file,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return hashlib.sha256(info + b"\0" + state).hexdigest()
+
+
+def last_check_key(
+    source_dir: Path,
+    *,
+    pyproject: dict[str, Any],
+    backend: Backend,
+    isolated: bool,
+    installer: Literal["uv", "pip"],
+    reuse_env: bool = False,
+    shadow: bool = False,
+) -> str | None:
+    """
+    Hash the settings the SDist contents depend on and the location of the
+    source directory, but not its files, to find the last check of it. None if
+    the backend's version can't be known, as for :func:`sdist_key`.
+    """
+    info = _settings(
+        source_dir,
+        pyproject,
+        backend,
+        isolated=isolated,
+        reuse_env=reuse_env,
+        installer=installer,
+        shadow=shadow,
+    )
+    if info is None:
+        return None
+    location = os.fsencode(source_dir.resolve())
+    return hashlib.sha256(b"last-check\0" + info + b"\0" + location).hexdigest()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+__lazy_modules__ = ["os", "time"]
+
+import contextlib
+import os
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = ["Timings"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def _cpu_time() -> float:
+    # Includes finished subprocesses, like the build (not on Windows)
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class Timings:
+    """
+    Wall and CPU time spent in each phase of a check, in seconds. Entering a
+    phase again adds to its time. Phases should not be nested, except for
+    background phases, which run in another thread alongside the others.
+    """
+
+    def __init__(self) -> None:
+        #: Phase name to (wall, CPU) time, in the order first entered
+        self.phases: dict[str, tuple[float, float]] = {}
+        #: Phases that ran in a background thread
+        self.background: set[str] = set()
+
+    @contextlib.contextmanager
+    def phase(self, name: str, *, background: bool = False) -> Iterator[None]:
+        """
+        Time the body of the with statement as part of phase *name*. A
+        ``background`` phase only counts its own thread's CPU time (the
+        process's would include the phases it overlaps), and is left out of
+        the total.
+        """
+        cpu_time = time.thread_time if background else _cpu_time
+        wall, cpu = time.perf_counter(), cpu_time()
+        try:
+            yield
+        finally:
+            prev_wall, prev_cpu = self.phases.get(name, (0.0, 0.0))
+            self.phases[name] = (
+                prev_wall + time.perf_counter() - wall,
+                prev_cpu + cpu_time() - cpu,
+            )
+            if background:
+                self.background.add(name)
+
+    def report(self) -> str:
+        """Format the phases and their total as a table."""
+        rows = [
+            (f"{name} (background)" if name in self.background else name, times)
+            for name, times in self.phases.items()
+        ]
+        foreground = [t for n, t in self.phases.items() if n not in self.background]
+        rows.append(
+            (
+                "total",
+                (sum(w for w, _ in foreground), sum(c for _, c in foreground)),
+            )
+        )
+        width = max(len(name) for name, _ in rows)
+        lines = [f"{'Timings:':<{width + 2}}     wall       CPU"]
+        lines += [
+            f"  {name:<{width}} {wall:8.3f}s {cpu:8.3f}s" for name, (wall, cpu) in rows
+        ]
+        return "\n".join(lines)
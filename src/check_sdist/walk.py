@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+__lazy_modules__ = [f"{__spec__.parent}.patterns", "contextlib", "os"]
+
+import contextlib
+import os
+
+from .patterns import compile_patterns
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+__all__ = ["gitignore_patterns", "walk_files"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+def gitignore_patterns(lines: list[str], prefix: str) -> Iterator[str]:
+    """
+    Rewrite the lines of the ``.gitignore`` file in the directory *prefix*
+    (empty for the top) to be relative to the top directory.
+    """
+    for line in lines:
+        pattern = line.rstrip()
+        if not pattern or pattern.startswith("#"):
+            continue
+        negate = "!" if pattern.startswith("!") else ""
+        pattern = pattern.removeprefix("!")
+        if not prefix:
+            yield negate + pattern
+        elif "/" in pattern.rstrip("/"):
+            yield f"{negate}{prefix}/{pattern.lstrip('/')}"
+        else:
+            yield f"{negate}{prefix}/**/{pattern}"
+
+
+def walk_files(
+    source_dir: Path,
+    *,
+    prune: Callable[[str], bool] | None = None,
+    gitignore: bool = False,
+) -> frozenset[str]:
+    """
+    Return every file below *source_dir*, as POSIX paths relative to it.
+
+    Directories for which *prune* returns True are not entered. With
+    *gitignore*, ``.gitignore`` files are read as they are found and apply to
+    their directory and below, like git does; the ``.git`` directory is
+    skipped too. Symlinks to directories are not followed.
+    """
+
+    files: set[str] = set()
+    # Each entry is a directory to visit and the ignore patterns that apply
+    todo: list[tuple[str, tuple[str, ...]]] = [("", ())]
+    while todo:
+        rel, patterns = todo.pop()
+        path = source_dir / rel
+        if gitignore:
+            with contextlib.suppress(FileNotFoundError, NotADirectoryError):
+                lines = path.joinpath(".gitignore").read_text("utf-8").splitlines()
+                patterns += tuple(gitignore_patterns(lines, rel))
+        ignored = compile_patterns(patterns) if patterns else None
+
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = f"{rel}/{entry.name}" if rel else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if gitignore and entry.name == ".git":
+                        continue
+                    if ignored and ignored.match_file(f"{name}/"):
+                        continue
+                    if prune and prune(name):
+                        continue
+                    todo.append((name, patterns))
+                elif entry.is_file() and not (ignored and ignored.match_file(name)):
+                    files.add(name)
+
+    return frozenset(files)
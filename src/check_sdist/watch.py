@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+__lazy_modules__ = [
+    f"{__spec__.parent}._compat",
+    f"{__spec__.parent}.backends",
+    f"{__spec__.parent}.patterns",
+    "os",
+    "pathlib",
+    "subprocess",
+    "sys",
+    "time",
+]
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Literal
+
+from ._compat import tomllib
+from .backends import reads_git_index, resolve_backend
+from .patterns import compile_patterns, ignore_patterns
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterable, Iterator
+
+    from .backends import Backend
+
+__all__ = ["classify", "poll_changes", "watch", "watch_changes"]
+
+
+def __dir__() -> list[str]:
+    return __all__
+
+
+#: Files whose contents can change what goes in the SDist, including build
+#: scripts and the configuration of backends' non-Python parts
+BUILD_CONFIG = frozenset(
+    {
+        ".gitattributes",
+        ".gitignore",
+        "Cargo.toml",
+        "MANIFEST.in",
+        "build.py",
+        "hatch.toml",
+        "hatch_build.py",
+        "meson.build",
+        "meson.options",
+        "pdm_build.py",
+        "pyproject.toml",
+        "setup.cfg",
+        "setup.py",
+    }
+)
+
+#: Files in .git that change which files are tracked
+GIT_STATE = frozenset({".git/HEAD", ".git/index"})
+
+#: A change is ("added" | "modified" | "deleted", POSIX path relative to the
+#: source directory)
+Change = tuple[str, str]
+
+
+def classify(
+    changes: Iterable[Change],
+    *,
+    ignored: Callable[[str], bool] | None = None,
+    listed: Collection[str] | None = None,
+    reads_git_index: bool = True,
+) -> Literal["rebuild", "relist"] | None:
+    """
+    Decide what a set of changes needs: ``"rebuild"`` if the SDist contents can
+    change (files added or removed, or build configuration edited),
+    ``"relist"`` if only the files git tracks can change, or None if neither.
+    Adding a file for which *ignored* returns True (such as one matched by
+    ``sdist-only``) or removing one that isn't in the *listed* SDist can't
+    change the result. A change to git's index only needs a relist if the
+    backend doesn't read it (*reads_git_index* is False).
+    """
+    action: Literal["rebuild", "relist"] | None = None
+    for kind, path in changes:
+        if path == ".git" or path.startswith(".git/"):
+            if path in GIT_STATE:
+                if reads_git_index:
+                    return "rebuild"
+                action = "relist"
+        elif _affects_sdist(kind, path, ignored=ignored, listed=listed):
+            return "rebuild"
+    return action
+
+
+def _affects_sdist(
+    kind: str,
+    path: str,
+    *,
+    ignored: Callable[[str], bool] | None,
+    listed: Collection[str] | None,
+) -> bool:
+    if path.rpartition("/")[2] in BUILD_CONFIG:
+        return True
+    if kind == "added":
+        return not (ignored and ignored(path))
+    return kind == "deleted" and (listed is None or path in listed)
+
+
+def _git_state(source_dir: Path) -> dict[str, Path]:
+    """
+    Find the files in ``GIT_STATE``, which aren't in *source_dir* if it's
+    below the top of the repository or in a worktree.
+    """
+    names = sorted(GIT_STATE)
+    args = [arg for name in names for arg in ("--git-path", name[len(".git/") :])]
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", *args],
+            cwd=source_dir,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {name: source_dir.joinpath(name).resolve() for name in names}
+    paths = output.splitlines()
+    return {name: source_dir.joinpath(p).resolve() for name, p in zip(names, paths)}
+
+
+def _snapshot(
+    source_dir: Path,
+    *,
+    git_state: dict[str, Path],
+    prune: Callable[[str], bool] | None = None,
+) -> dict[str, tuple[int, int]]:
+    """
+    Map every file below *source_dir*, and the *git_state* files, to its
+    modification time and size. Directories for which *prune* returns True are
+    not entered.
+    """
+    found = {}
+    for name, path in git_state.items():
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        found[name] = (st.st_mtime_ns, st.st_size)
+
+    todo = [""]
+    while todo:
+        rel = todo.pop()
+        with os.scandir(source_dir / rel) as entries:
+            for entry in entries:
+                name = f"{rel}/{entry.name}" if rel else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name != ".git" and not (prune and prune(name)):
+                            todo.append(name)
+                    else:
+                        st = entry.stat()
+                        found[name] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    # Removed while looking
+                    continue
+    return found
+
+
+def poll_changes(
+    source_dir: Path,
+    *,
+    interval: float,
+    prune: Callable[[str], bool] | None = None,
+) -> Iterator[set[Change]]:
+    """
+    Yield the changes below *source_dir* by scanning every *interval* seconds,
+    skipping directories for which *prune* returns True. Git's index and
+    ``HEAD`` are reported as ``.git/index`` and ``.git/HEAD``, wherever they
+    are.
+    """
+    git_state = _git_state(source_dir)
+    before = _snapshot(source_dir, git_state=git_state, prune=prune)
+    while True:
+        time.sleep(interval)
+        after = _snapshot(source_dir, git_state=git_state, prune=prune)
+        changes = {("added", p) for p in after.keys() - before.keys()}
+        changes |= {("deleted", p) for p in before.keys() - after.keys()}
+        changes |= {
+            ("modified", p)
+            for p in after.keys() & before.keys()
+            if after[p] != before[p]
+        }
+        before = after
+        if changes:
+            yield changes
+
+
+def watch_changes(
+    source_dir: Path,
+    *,
+    interval: float,
+    prune: Callable[[str], bool] | None = None,
+) -> Iterator[set[Change]]:
+    """
+    Yield the changes below *source_dir* as they happen. Uses the operating
+    system's notifications (inotify, FSEvents, ...) through ``watchfiles`` if
+    it is installed, otherwise polls every *interval* seconds, skipping
+    directories for which *prune* returns True. A rename is an ``added`` and a
+    ``deleted`` change. Git's index and ``HEAD`` are reported as
+    ``.git/index`` and ``.git/HEAD``, wherever they are.
+    """
+    source_dir = source_dir.resolve()
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        import watchfiles  # noqa: PLC0415
+    except ModuleNotFoundError:
+        yield from poll_changes(source_dir, interval=interval, prune=prune)
+        return
+
+    names = {path: name for name, path in _git_state(source_dir).items()}
+    git_dirs = {p.parent for p in names if not p.is_relative_to(source_dir)}
+    # The default filter skips .git, which holds the index
+    for batch in watchfiles.watch(source_dir, *git_dirs, watch_filter=None):
+        changes = set()
+        for change, path in batch:
+            name = names.get(Path(path))
+            if name is None and Path(path).is_relative_to(source_dir):
+                name = Path(path).relative_to(source_dir).as_posix()
+            if name is not None:
+                changes.add((change.name, name))
+        if changes:
+            yield changes
+
+
+def _configure(source_dir: Path) -> tuple[dict[str, Any], Backend] | None:
+    """
+    Load the configuration and backend for watch(), or None if
+    ``pyproject.toml`` is invalid, after printing why.
+    """
+
+    # pylint: disable-next=import-outside-toplevel
+    from .__main__ import load_pyproject  # noqa: PLC0415
+
+    try:
+        pyproject = load_pyproject(source_dir)
+    except tomllib.TOMLDecodeError as err:
+        print(f"Invalid pyproject.toml: {err}", file=sys.stderr)
+        return None
+    config = pyproject.get("tool", {}).get("check-sdist", {})
+    return pyproject, resolve_backend(config.get("build-backend", "auto"), pyproject)
+
+
+def _relist(
+    source_dir: Path,
+    options: dict[str, Any],
+    *,
+    pyproject: dict[str, Any],
+    backend: Backend,
+    refresh: bool = False,
+) -> frozenset[str] | None:
+    """List the SDist for watch(), or return None if it failed, after printing why."""
+
+    # pylint: disable-next=import-outside-toplevel
+    from .__main__ import list_sdist, select_installer  # noqa: PLC0415
+
+    try:
+        return list_sdist(
+            source_dir,
+            pyproject=pyproject,
+            backend=backend,
+            isolated=options["isolated"],
+            installer=select_installer(options.get("installer", "uv|pip")),
+            reuse_env=options.get("reuse_env", False),
+            store=options.get("store"),
+            refresh_cache=refresh,
+            build_dir=options.get("build_dir"),
+            timings=options.get("timings"),
+            shadow=options.get("shadow", False),
+            inject_junk=options.get("inject_junk", False),
+            predict=options.get("predict", False)
+            and not options.get("verify_prediction", False),
+        )
+    except subprocess.CalledProcessError as err:
+        print(f"Failed to build the SDist: {err}", file=sys.stderr)
+        return None
+
+
+def _check(
+    source_dir: Path, options: dict[str, Any], listed: frozenset[str], result: int
+) -> int:
+    """Run compare() for watch(), keeping the last *result* if it failed."""
+
+    # pylint: disable-next=import-outside-toplevel
+    from .__main__ import compare  # noqa: PLC0415
+
+    try:
+        return compare(source_dir, **options, listed=listed)
+    except tomllib.TOMLDecodeError as err:
+        print(f"Invalid pyproject.toml: {err}", file=sys.stderr)
+        return result
+
+
+def watch(
+    source_dir: Path,
+    options: dict[str, Any],
+    *,
+    interval: float = 0.5,
+    changes: Iterable[set[Change]] | None = None,
+) -> int:
+    """
+    Run compare() with keyword arguments *options*, then again each time a
+    file changes, until interrupted. The SDist is only listed again when the
+    change can affect it (see classify()); if only git's index changed and the
+    backend doesn't read it, the previous listing is reused. Directories
+    matched by ``sdist-only`` are not watched. The backend, compiled patterns,
+    and parsed git index stay loaded between checks. An invalid
+    ``pyproject.toml`` is reported, and checked again once it changes. Returns
+    the result of the last check.
+    """
+
+    # Updated from the configuration each time the SDist is listed
+    sdist_matcher = compile_patterns([])
+    index_matters = True
+
+    def relist(*, refresh: bool = False) -> frozenset[str] | None:
+        nonlocal sdist_matcher, index_matters
+        configured = _configure(source_dir)
+        if configured is None:
+            return None
+        pyproject, backend = configured
+        sdist_matcher = compile_patterns(ignore_patterns(pyproject, backend)[0])
+        index_matters = reads_git_index(backend)
+        return _relist(
+            source_dir, options, pyproject=pyproject, backend=backend, refresh=refresh
+        )
+
+    def pruned(directory: str) -> bool:
+        return sdist_matcher.match_dir(directory)
+
+    print(f"Watching {source_dir} for changes, Ctrl-C to stop", file=sys.stderr)
+    result = 0
+    try:
+        listed = relist(refresh=options.get("refresh_cache", False))
+        if listed is not None:
+            result = _check(source_dir, options, listed, result)
+        for batch in changes or watch_changes(
+            source_dir, interval=interval, prune=pruned
+        ):
+            action = classify(
+                batch,
+                ignored=sdist_matcher.match_file,
+                listed=listed,
+                reads_git_index=index_matters,
+            )
+            if action is None:
+                continue
+            if action == "rebuild" or listed is None:
+                listed = relist()
+            if listed is not None:
+                print(file=sys.stderr)
+                result = _check(source_dir, options, listed, result)
+    except KeyboardInterrupt:
+        pass
+    return result
@@ -0,0 +1,280 @@
+"""
+Self-contained example projects for each supported build backend, along with
+the result check-sdist should report for them. They are built without
+isolation, so nothing is downloaded, as long as the backend is installed.
+Run this file to write every project to a directory, for manual checks or
+timing comparisons:
+
+    python tests/corpus.py /tmp/corpus
+"""
+
+from __future__ import annotations
+
+import inspect
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+
+class Project(NamedTuple):
+    #: Module providing the build backend, the project is skipped without it
+    #: (None for an in-tree backend)
+    backend: str | None
+    #: The contents of pyproject.toml after the [project] table
+    pyproject: str
+    #: What compare() should return
+    result: int
+    #: Files to add or replace, tracked by git
+    files: dict[str, str] = {}  # noqa: RUF012
+    #: Files to write but not track (listed in .gitignore)
+    untracked: dict[str, str] = {}  # noqa: RUF012
+
+
+COMMON = {
+    ".gitignore": "generated.txt\n",
+    "README.md": "# Example\n",
+    "docs/index.md": "# Documentation\n",
+    "src/example/__init__.py": '"""An example package."""\n\n__version__ = "0.1.0"\n',
+    "src/example/core.py": "def add(a: int, b: int) -> int:\n    return a + b\n",
+    "tests/test_core.py": "from example.core import add\n\n\ndef test_add():\n    assert add(1, 2) == 3\n",
+}
+
+PROJECT = """\
+[project]
+name = "example"
+version = "0.1.0"
+description = "An example package"
+readme = "README.md"
+requires-python = ">=3.9"
+"""
+
+#: A stand-in for maturin, which would need Rust, that packages everything git
+#: tracks except its copy of [tool.maturin] exclude
+STUB_MATURIN = """\
+import fnmatch
+import os
+import subprocess
+import tarfile
+
+NAME = "example-0.1.0"
+EXCLUDE = ["docs/drafts/*"]
+
+
+def build_sdist(sdist_directory, config_settings=None):
+    files = subprocess.run(
+        ["git", "ls-files", "-z"], capture_output=True, check=True, text=True
+    ).stdout.split("\\0")
+    path = os.path.join(sdist_directory, f"{NAME}.tar.gz")
+    with open("PKG-INFO", "w") as f:
+        f.write("Metadata-Version: 2.1\\nName: example\\nVersion: 0.1.0\\n")
+    try:
+        with tarfile.open(path, "w:gz") as tar:
+            tar.add("PKG-INFO", f"{NAME}/PKG-INFO")
+            for name in filter(None, files):
+                if not any(fnmatch.fnmatch(name, p) for p in EXCLUDE):
+                    tar.add(name, f"{NAME}/{name}")
+    finally:
+        os.remove("PKG-INFO")
+    return f"{NAME}.tar.gz"
+"""
+
+PROJECTS = {
+    "setuptools": Project(
+        "setuptools",
+        """
+        [build-system]
+        requires = ["setuptools>=61"]
+        build-backend = "setuptools.build_meta"
+        """,
+        0,
+        files={"MANIFEST.in": "graft docs\ngraft tests\ninclude .gitignore\n"},
+    ),
+    "setuptools-missing-docs": Project(
+        "setuptools",
+        """
+        [build-system]
+        requires = ["setuptools>=61"]
+        build-backend = "setuptools.build_meta"
+        """,
+        2,
+        files={"MANIFEST.in": "graft tests\ninclude .gitignore\n"},
+    ),
+    "flit": Project(
+        "flit_core",
+        """
+        [build-system]
+        requires = ["flit-core>=3.4"]
+        build-backend = "flit_core.buildapi"
+
+        [tool.flit.sdist]
+        include = ["docs", "tests", ".gitignore"]
+        """,
+        0,
+    ),
+    "flit-exclude": Project(
+        "flit_core",
+        """
+        [build-system]
+        requires = ["flit-core>=3.4"]
+        build-backend = "flit_core.buildapi"
+
+        [tool.flit.sdist]
+        include = ["docs", "tests", ".gitignore"]
+        exclude = ["docs/drafts"]
+        """,
+        0,
+        files={"docs/drafts/next.md": "# Coming soon\n"},
+    ),
+    "flit-exclude-unknown": Project(
+        "flit_core",
+        """
+        [build-system]
+        requires = ["flit-core>=3.4"]
+        build-backend = "flit_core.buildapi"
+
+        [tool.flit.sdist]
+        include = ["docs", "tests", ".gitignore"]
+        exclude = ["docs/drafts"]
+
+        [tool.check-sdist]
+        build-backend = "none"
+        """,
+        2,
+        files={"docs/drafts/next.md": "# Coming soon\n"},
+    ),
+    "hatchling": Project(
+        "hatchling",
+        """
+        [build-system]
+        requires = ["hatchling"]
+        build-backend = "hatchling.build"
+
+        [tool.hatch.build.targets.sdist]
+        exclude = ["/docs"]
+        """,
+        0,
+    ),
+    "hatchling-artifacts": Project(
+        "hatchling",
+        """
+        [build-system]
+        requires = ["hatchling"]
+        build-backend = "hatchling.build"
+
+        [tool.hatch.build.targets.sdist]
+        artifacts = ["generated.txt"]
+        """,
+        1,
+        untracked={"generated.txt": "generated\n"},
+    ),
+    "pdm": Project(
+        "pdm.backend",
+        """
+        [build-system]
+        requires = ["pdm-backend"]
+        build-backend = "pdm.backend"
+
+        [tool.pdm.build]
+        source-includes = ["docs", "tests", ".gitignore"]
+        excludes = ["docs/drafts"]
+        """,
+        0,
+        files={"docs/drafts/next.md": "# Coming soon\n"},
+    ),
+    "poetry": Project(
+        "poetry.core",
+        """
+        [build-system]
+        requires = ["poetry-core>=2"]
+        build-backend = "poetry.core.masonry.api"
+
+        [tool.poetry]
+        packages = [{ include = "example", from = "src" }]
+        include = [
+          { path = "docs", format = "sdist" },
+          { path = "tests", format = "sdist" },
+          { path = ".gitignore", format = "sdist" },
+        ]
+        exclude = ["docs/drafts"]
+        """,
+        0,
+        files={"docs/drafts/next.md": "# Coming soon\n"},
+    ),
+    "scikit-build-core": Project(
+        "scikit_build_core",
+        """
+        [build-system]
+        requires = ["scikit-build-core"]
+        build-backend = "scikit_build_core.build"
+
+        [tool.scikit-build]
+        sdist.exclude = ["docs/drafts"]
+        """,
+        0,
+        files={
+            "CMakeLists.txt": "cmake_minimum_required(VERSION 3.15...4.0)\nproject(example LANGUAGES NONE)\n",
+            "docs/drafts/next.md": "# Coming soon\n",
+        },
+    ),
+    "uv-build": Project(
+        "uv_build",
+        """
+        [build-system]
+        requires = ["uv_build"]
+        build-backend = "uv_build"
+
+        [tool.uv.build-backend]
+        source-include = ["docs/**", "tests/**", ".gitignore"]
+        source-exclude = ["docs/drafts"]
+        """,
+        0,
+        files={"docs/drafts/next.md": "# Coming soon\n"},
+    ),
+    "maturin-stub": Project(
+        None,
+        """
+        [build-system]
+        requires = []
+        build-backend = "stub_maturin"
+        backend-path = ["_build"]
+
+        [tool.maturin]
+        exclude = ["docs/drafts/*"]
+
+        [tool.check-sdist]
+        build-backend = "maturin"
+        git-only = ["_build"]
+        """,
+        0,
+        files={
+            "_build/stub_maturin.py": STUB_MATURIN,
+            "docs/drafts/next.md": "# Coming soon\n",
+        },
+    ),
+}
+
+
+def write_project(name: str, path: Path) -> Path:
+    """Write project *name* to *path* as a git repository with one commit."""
+    project = PROJECTS[name]
+    pyproject = f"{PROJECT}\n{inspect.cleandoc(project.pyproject)}\n"
+    files = {**COMMON, "pyproject.toml": pyproject, **project.files}
+    for filename, contents in {**files, **project.untracked}.items():
+        path.joinpath(filename).parent.mkdir(parents=True, exist_ok=True)
+        path.joinpath(filename).write_text(contents, encoding="utf-8")
+
+    def git(*args: str) -> None:
+        cmd = ["git", "-c", "user.name=a", "-c", "user.email=a@b", *args]
+        subprocess.run(cmd, cwd=path, check=True, capture_output=True)
+
+    git("init")
+    git("add", *files)
+    git("commit", "-m", "Initial commit")
+    return path
+
+
+if __name__ == "__main__":
+    out = Path(sys.argv[1])
+    for project_name in PROJECTS:
+        print(write_project(project_name, out / project_name))
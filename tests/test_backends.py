@@ -1,9 +1,24 @@
 from __future__ import annotations
 
+import inspect
+import os
+import subprocess
+import sys
+
 import pytest
 
+import check_sdist.backends as backends_mod
+import check_sdist.backends.uv as uv_mod
 from check_sdist._compat import tomllib
-from check_sdist.backends import load_backends, resolve_backend
+from check_sdist.backends import (
+    SdistLister,
+    SdistPredictor,
+    entry_points,
+    installed_backend_matches,
+    load_backends,
+    resolve_backend,
+)
+from check_sdist.backends.flit import FlitBackend
 from check_sdist.backends.hatchling import HatchlingBackend
 from check_sdist.backends.none import NoneBackend
 from check_sdist.backends.pdm import PdmBackend
@@ -64,6 +79,77 @@ def test_load_backends_contains_builtins() -> None:
     } <= names
 
 
+def test_entry_point_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CHECK_SDIST_CACHE_DIR", str(tmp_path))
+    scans = []
+
+    def scan() -> dict[str, str]:
+        scans.append(1)
+        return {"none": "check_sdist.backends.none:NoneBackend"}
+
+    monkeypatch.setattr(backends_mod, "_scan_entry_points", scan)
+    entry_points.cache_clear()
+    try:
+        assert entry_points() == {"none": "check_sdist.backends.none:NoneBackend"}
+        entry_points.cache_clear()
+        assert entry_points() == {"none": "check_sdist.backends.none:NoneBackend"}
+        assert scans == [1]
+        assert len(list(tmp_path.joinpath("entry-points").iterdir())) == 1
+
+        # Installing something changes the import path state
+        monkeypatch.setattr(sys, "path", [*sys.path, str(tmp_path)])
+        entry_points.cache_clear()
+        entry_points()
+        assert scans == [1, 1]
+    finally:
+        entry_points.cache_clear()
+
+
+def test_resolve_imports_only_the_match(tmp_path: Path) -> None:
+    code = """
+import sys
+from check_sdist.backends import resolve_backend
+backend = resolve_backend("auto", {})
+print(type(backend).__name__)
+print(*sorted(m for m in sys.modules if m.startswith("check_sdist.backends.")))
+"""
+    env = {**os.environ, "CHECK_SDIST_CACHE_DIR": str(tmp_path)}
+    for _ in range(2):  # scanning, then from the index
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        )
+        name, modules = result.stdout.splitlines()
+        assert name == "SetuptoolsBackend"
+        assert "check_sdist.backends.hatchling" not in modules.split()
+
+
+def test_resolve_unknown_imports_no_backend(tmp_path: Path) -> None:
+    code = """
+import sys
+from check_sdist.backends import resolve_backend
+backend = resolve_backend("auto", {"build-system": {"build-backend": "mesonpy"}})
+print(type(backend).__name__)
+print(*sorted(m for m in sys.modules if m.startswith("check_sdist.backends.")))
+"""
+    env = {**os.environ, "CHECK_SDIST_CACHE_DIR": str(tmp_path)}
+    # The first run indexes every backend's build_backends
+    for _ in range(2):
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        )
+    name, *modules = result.stdout.splitlines()
+    assert name == "NoneBackend"
+    assert modules == ["check_sdist.backends._base check_sdist.backends.none"]
+
+
 def test_resolve_auto_defaults_to_setuptools() -> None:
     assert isinstance(resolve_backend("auto", {}), SetuptoolsBackend)
 
@@ -207,3 +293,416 @@ def test_scikit_build_generate_paths() -> None:
     ignore = set(ScikitBuildCoreBackend().sdist_only_ignores(pyproject))
     assert "src/example/_version.py" in ignore
     assert "python/pkg/version.py" in ignore
+
+
+def test_installed_backend_matches() -> None:
+    assert installed_backend_matches(
+        {"build-system": {"requires": ["Packaging>=1"]}}, "packaging"
+    )
+    assert not installed_backend_matches(
+        {"build-system": {"requires": ["packaging<1"]}}, "packaging"
+    )
+    assert not installed_backend_matches({"build-system": {}}, "packaging")
+    assert not installed_backend_matches(
+        {"build-system": {"requires": ["not-a-real-dist-xyz"]}},
+        "not-a-real-dist-xyz",
+    )
+
+
+@pytest.mark.parametrize(
+    "build_backend", ["flit_core.buildapi", "hatchling.build", "uv_build"]
+)
+def test_listing_backends(build_backend: str) -> None:
+    pyproject = {"build-system": {"build-backend": build_backend}}
+    assert isinstance(resolve_backend("auto", pyproject), SdistLister)
+
+
+def test_uv_list_sdist_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    stdout = inspect.cleandoc(
+        """
+        Building example-0.1.0.tar.gz will include the following files:
+        example-0.1.0/PKG-INFO (generated)
+        example-0.1.0/pyproject.toml.orig (pyproject.toml)
+        example-0.1.0/src/my (pkg)/__init__.py (src/my (pkg)/__init__.py)
+        """
+    )
+
+    def fake_run(cmd: list[str], **kwargs: object) -> subprocess.CompletedProcess[str]:
+        assert cmd[1:4] == ["build", "--list", "--sdist"]
+        assert kwargs["cwd"] == tmp_path
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout)
+
+    monkeypatch.setattr(uv_mod, "get_uv", lambda: "/fake/uv")
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    files = UvBackend().list_sdist_files({}, tmp_path)
+    assert files == frozenset(
+        {"PKG-INFO", "pyproject.toml.orig", "src/my (pkg)/__init__.py"}
+    )
+
+
+def test_uv_list_sdist_files_unavailable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fake_run(cmd: list[str], **kwargs: object) -> subprocess.CompletedProcess[str]:
+        return subprocess.CompletedProcess(cmd, 2, stdout="")
+
+    monkeypatch.setattr(uv_mod, "get_uv", lambda: "/fake/uv")
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    assert UvBackend().list_sdist_files({}, tmp_path) is None
+
+    monkeypatch.setattr(uv_mod, "get_uv", lambda: None)
+    assert UvBackend().list_sdist_files({}, tmp_path) is None
+
+
+def test_hatchling_list_sdist_files(tmp_path: Path) -> None:
+    pytest.importorskip("hatchling")
+    pyproject_toml = """
+        [build-system]
+        requires = ["hatchling"]
+        build-backend = "hatchling.build"
+
+        [project]
+        name = "example"
+        version = "0.1.0"
+
+        [tool.hatch.build.targets.sdist]
+        exclude = ["skip.txt"]
+        """
+    tmp_path.joinpath("pyproject.toml").write_text(pyproject_toml)
+    tmp_path.joinpath("example.py").touch()
+    tmp_path.joinpath("skip.txt").touch()
+
+    pyproject = tomllib.loads(pyproject_toml)
+    files = HatchlingBackend().list_sdist_files(pyproject, tmp_path)
+    assert files == frozenset({"pyproject.toml", "example.py"})
+
+    # Build hooks may add files, so a real build is needed
+    pyproject["tool"]["hatch"]["build"]["hooks"] = {"custom": {}}
+    assert HatchlingBackend().list_sdist_files(pyproject, tmp_path) is None
+
+
+def _write_project(tmp_path: Path, files: dict[str, str]) -> frozenset[str]:
+    for name, text in files.items():
+        tmp_path.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(name).write_text(inspect.cleandoc(text))
+    return frozenset(files)
+
+
+def test_setuptools_predict_src_layout(tmp_path: Path) -> None:
+    pyproject_toml = """
+        [build-system]
+        requires = ["setuptools"]
+        build-backend = "setuptools.build_meta"
+
+        [project]
+        name = "example"
+        version = "0.1.0"
+        readme = "docs/intro.md"
+        """
+    files = _write_project(
+        tmp_path,
+        {
+            "pyproject.toml": pyproject_toml,
+            "MANIFEST.in": "graft docs\nglobal-exclude *.tmp",
+            "README.rst": "",
+            "LICENSE": "",
+            "LICENSE~": "",
+            "docs/intro.md": "",
+            "docs/notes.tmp": "",
+            "src/example/__init__.py": "",
+            "src/example/.hidden.py": "",
+            "tests/test_example.py": "",
+            "tests/conftest.py": "",
+            "noxfile.py": "",
+            ".gitignore": "",
+        },
+    )
+    pyproject = tomllib.loads(pyproject_toml)
+    assert isinstance(SetuptoolsBackend(), SdistPredictor)
+    assert SetuptoolsBackend().predict_sdist_files(
+        pyproject, files, tmp_path
+    ) == frozenset(
+        {
+            "pyproject.toml",
+            "MANIFEST.in",
+            "README.rst",
+            "LICENSE",
+            "docs/intro.md",
+            "src/example/__init__.py",
+            "tests/test_example.py",
+        }
+    )
+
+
+def test_setuptools_predict_setup_cfg(tmp_path: Path) -> None:
+    files = _write_project(
+        tmp_path,
+        {
+            "setup.py": "from setuptools import setup\nsetup()",
+            "setup.cfg": """
+                [metadata]
+                name = example
+                license_files = COPYING
+
+                [options]
+                packages = find:
+                scripts = bin/run
+
+                [options.packages.find]
+                exclude = tests*
+                """,
+            "COPYING": "",
+            "LICENSE": "",
+            "bin/run": "",
+            "example/__init__.py": "",
+            "example/data.json": "",
+            "other/__init__.py": "",
+            "tests/__init__.py": "",
+        },
+    )
+    assert SetuptoolsBackend().predict_sdist_files({}, files, tmp_path) == frozenset(
+        {
+            "setup.py",
+            "setup.cfg",
+            "COPYING",
+            "bin/run",
+            "example/__init__.py",
+            "other/__init__.py",
+        }
+    )
+
+
+def test_setuptools_predict_scm(tmp_path: Path) -> None:
+    pyproject_toml = """
+        [build-system]
+        requires = ["setuptools", "setuptools-scm"]
+        build-backend = "setuptools.build_meta"
+
+        [project]
+        name = "example"
+        dynamic = ["version"]
+        """
+    files = _write_project(
+        tmp_path,
+        {
+            "pyproject.toml": pyproject_toml,
+            "MANIFEST.in": "prune ci",
+            "example.py": "",
+            "ci/run.sh": "",
+            "build/keep.txt": "",
+        },
+    )
+    pyproject = tomllib.loads(pyproject_toml)
+    assert SetuptoolsBackend().predict_sdist_files(
+        pyproject, files, tmp_path
+    ) == frozenset({"pyproject.toml", "MANIFEST.in", "example.py"})
+
+
+@pytest.mark.parametrize(
+    "setup_py",
+    [
+        "from setuptools import setup\nsetup(**kwargs)",
+        "from setuptools import setup\nsetup(package_data={'': ['*.txt']})",
+        "from setuptools import setup\nsetup(cmdclass={'sdist': MySdist})",
+        "from setuptools import setup\nsetup(",
+    ],
+)
+def test_setuptools_predict_unknown(tmp_path: Path, setup_py: str) -> None:
+    files = _write_project(tmp_path, {"setup.py": setup_py, "example/__init__.py": ""})
+    assert SetuptoolsBackend().predict_sdist_files({}, files, tmp_path) is None
+
+
+def test_setuptools_manifest_excludes(tmp_path: Path) -> None:
+    tmp_path.joinpath("MANIFEST.in").write_text("prune ci\nexclude *.cfg\n")
+    files = frozenset({"ci/run.sh", "tox.cfg", "src/a.cfg", "noxfile.py"})
+    assert SetuptoolsBackend().git_only_excludes({}, files, tmp_path) == frozenset(
+        {"src/a.cfg", "noxfile.py"}
+    )
+
+
+def test_setuptools_manifest_excludes_order(tmp_path: Path) -> None:
+    tmp_path.joinpath("MANIFEST.in").write_text("prune docs\ninclude docs/conf.py\n")
+    files = frozenset({"docs/conf.py", "docs/index.rst", "setup.py"})
+    assert SetuptoolsBackend().git_only_excludes({}, files, tmp_path) == frozenset(
+        {"docs/conf.py", "setup.py"}
+    )
+
+
+def test_hatchling_predict(tmp_path: Path) -> None:
+    pyproject_toml = """
+        [build-system]
+        requires = ["hatchling"]
+        build-backend = "hatchling.build"
+
+        [project]
+        name = "example"
+        version = "0.1.0"
+        readme = "docs/intro.md"
+
+        [tool.hatch.build.targets.sdist]
+        exclude = ["/docs"]
+
+        [tool.hatch.build.targets.sdist.force-include]
+        "extra/data.json" = "example/data.json"
+        """
+    files = _write_project(
+        tmp_path,
+        {
+            "pyproject.toml": pyproject_toml,
+            ".gitignore": "*.log\n",
+            "LICENSE": "",
+            "docs/intro.md": "",
+            "docs/other.md": "",
+            "extra/data.json": "",
+            "example/__init__.py": "",
+            "example/debug.log": "",
+            "tests/test_example.py": "",
+        },
+    )
+    pyproject = tomllib.loads(pyproject_toml)
+    # Force-included files are moved, not copied
+    assert isinstance(HatchlingBackend(), SdistPredictor)
+    assert HatchlingBackend().predict_sdist_files(
+        pyproject, files, tmp_path
+    ) == frozenset(
+        {
+            "pyproject.toml",
+            ".gitignore",
+            "LICENSE",
+            "docs/intro.md",
+            "example/__init__.py",
+            "example/data.json",
+            "tests/test_example.py",
+        }
+    )
+
+    # Custom build hooks can add anything
+    pyproject["tool"]["hatch"]["build"]["hooks"] = {"custom": {}}
+    assert HatchlingBackend().predict_sdist_files(pyproject, files, tmp_path) is None
+
+
+def test_flit_predict(tmp_path: Path) -> None:
+    pyproject_toml = """
+        [build-system]
+        requires = ["flit_core"]
+        build-backend = "flit_core.buildapi"
+
+        [project]
+        name = "example-pkg"
+        version = "0.1.0"
+        readme = "README.md"
+
+        [tool.flit.sdist]
+        include = ["docs/"]
+        exclude = ["docs/drafts"]
+        """
+    files = _write_project(
+        tmp_path,
+        {
+            "pyproject.toml": pyproject_toml,
+            "README.md": "",
+            "docs/index.md": "",
+            "docs/drafts/next.md": "",
+            "example_pkg/__init__.py": "",
+            "example_pkg/__pycache__/x.cpython-311.pyc": "",
+            "tests/test_example.py": "",
+        },
+    )
+    pyproject = tomllib.loads(pyproject_toml)
+    assert FlitBackend().predict_sdist_files(pyproject, files, tmp_path) == frozenset(
+        {"pyproject.toml", "README.md", "docs/index.md", "example_pkg/__init__.py"}
+    )
+
+    # The module can't be excluded
+    pyproject["tool"]["flit"]["sdist"]["exclude"] = ["example_pkg"]
+    assert FlitBackend().predict_sdist_files(pyproject, files, tmp_path) is None
+
+
+def test_pdm_predict(tmp_path: Path) -> None:
+    pyproject_toml = """
+        [build-system]
+        requires = ["pdm-backend"]
+        build-backend = "pdm.backend"
+
+        [project]
+        name = "example"
+        version = "0.1.0"
+        license = {file = "LICENSE.txt"}
+
+        [tool.pdm.build]
+        excludes = ["src/example/skip.py"]
+        """
+    files = _write_project(
+        tmp_path,
+        {
+            "pyproject.toml": pyproject_toml,
+            "LICENSE.txt": "",
+            "src/example/__init__.py": "",
+            "src/example/skip.py": "",
+            "src/example/data.json": "",
+            "tests/test_example.py": "",
+            "noxfile.py": "",
+        },
+    )
+    pyproject = tomllib.loads(pyproject_toml)
+    assert PdmBackend().predict_sdist_files(pyproject, files, tmp_path) == frozenset(
+        {
+            "pyproject.toml",
+            "LICENSE.txt",
+            "src/example/__init__.py",
+            "src/example/data.json",
+            "tests/test_example.py",
+        }
+    )
+
+    # A build hook script can add anything
+    files = _write_project(tmp_path, {"pdm_build.py": ""}) | files
+    assert PdmBackend().predict_sdist_files(pyproject, files, tmp_path) is None
+
+
+def test_uv_predict(tmp_path: Path) -> None:
+    pyproject_toml = """
+        [build-system]
+        requires = ["uv_build"]
+        build-backend = "uv_build"
+
+        [project]
+        name = "Example.Pkg"
+        version = "0.1.0"
+        readme = "README.md"
+
+        [tool.uv.build-backend]
+        source-include = ["docs/*/*.md", "tests/**"]
+        source-exclude = ["*.json"]
+        """
+    files = _write_project(
+        tmp_path,
+        {
+            "pyproject.toml": pyproject_toml,
+            "README.md": "",
+            "noxfile.py": "",
+            "docs/index.md": "",
+            "docs/api/index.md": "",
+            "src/example_pkg/__init__.py": "",
+            "src/example_pkg/data.json": "",
+            "src/example_pkg/__pycache__/x.pyc": "",
+            "tests/test_example.py": "",
+        },
+    )
+    pyproject = tomllib.loads(pyproject_toml)
+    # Files matching the start of an include glob are included too
+    assert UvBackend().predict_sdist_files(pyproject, files, tmp_path) == frozenset(
+        {
+            "pyproject.toml",
+            "README.md",
+            "docs/index.md",
+            "docs/api/index.md",
+            "src/example_pkg/__init__.py",
+            "tests/test_example.py",
+        }
+    )
+
+    # uv_build fails without the module's __init__.py
+    pyproject["tool"]["uv"]["build-backend"]["module-name"] = "other"
+    assert UvBackend().predict_sdist_files(pyproject, files, tmp_path) is None
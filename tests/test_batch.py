@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import inspect
+import subprocess
+
+import pytest
+
+import check_sdist.__main__ as main_mod
+from check_sdist.__main__ import main
+from check_sdist.batch import compare_many, read_manifest
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+GIT_ONLY = 2
+
+
+def make_project(path: Path, *, backend: str) -> Path:
+    path.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    path.joinpath("pyproject.toml").write_text(
+        inspect.cleandoc(f"""
+            [build-system]
+            requires = ["hatchling"]
+            build-backend = "hatchling.build"
+
+            [project]
+            name = "example"
+            version = "0.1.0"
+
+            [tool.hatch]
+            build.targets.sdist.exclude = ["notme.py"]
+
+            [tool.check-sdist]
+            build-backend = "{backend}"
+        """)
+    )
+    path.joinpath("example.py").touch()
+    path.joinpath("notme.py").touch()
+    subprocess.run(["git", "add", "."], cwd=path, check=True)
+    return path
+
+
+def test_read_manifest(tmp_path: Path) -> None:
+    manifest = tmp_path / "projects.txt"
+    manifest.write_text("# Projects\na\n\n  b/c  \n")
+    assert read_manifest(manifest) == [tmp_path / "a", tmp_path / "b/c"]
+
+
+def test_compare_many(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    good = make_project(tmp_path / "good", backend="auto")
+    bad = make_project(tmp_path / "bad", backend="none")
+
+    result = compare_many([good, bad], {"isolated": True, "installer": "pip"}, jobs=2)
+
+    assert result == GIT_ONLY
+    out = capsys.readouterr().out
+    assert out.index(f"==> {good} <==") < out.index("SDist matches git")
+    assert out.index(f"==> {bad} <==") < out.index("SDist does not match git")
+
+
+def test_compare_many_failure(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    good = make_project(tmp_path / "good", backend="auto")
+    broken = make_project(tmp_path / "broken", backend="unknown")
+
+    with pytest.raises(SystemExit, match="failed to check 1 of 2 projects"):
+        compare_many([good, broken], {"isolated": True, "installer": "pip"}, jobs=2)
+
+    out = capsys.readouterr().out
+    assert "SDist matches git" in out
+    assert "Unknown backend: unknown" in out
+
+
+def test_cli_multiple_source_dirs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = []
+
+    def fake_compare_many(
+        source_dirs: list[Path], options: dict[str, object], *, jobs: int
+    ) -> int:
+        calls.append((source_dirs, options, jobs))
+        return GIT_ONLY
+
+    monkeypatch.setattr(main_mod, "compare_many", fake_compare_many)
+    manifest = tmp_path / "projects.txt"
+    manifest.write_text("c\n")
+
+    with pytest.raises(SystemExit) as exc:
+        main(
+            [
+                "--source-dir",
+                "a",
+                "--source-dir",
+                "b",
+                "--manifest",
+                str(manifest),
+                "-j3",
+            ]
+        )
+
+    ((source_dirs, options, jobs),) = calls
+    assert exc.value.code == GIT_ONLY
+    assert [str(p) for p in source_dirs] == ["a", "b", str(tmp_path / "c")]
+    assert options["isolated"]
+    assert jobs == len(source_dirs)
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2"])
+def test_cli_jobs_positive(jobs: str, capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit):
+        main(["--source-dir", "a", "--source-dir", "b", f"--jobs={jobs}"])
+    assert "--jobs must be at least 1" in capsys.readouterr().err
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import inspect
+import json
+import os
+from typing import Literal
+
+import pytest
+
+import check_sdist.buildenv as buildenv_mod
+from check_sdist._storage import cache_dir, file_lock
+from check_sdist.buildenv import BuildEnv, env_key, env_versions, evict
+from check_sdist.sdist import get_uv, sdist_files
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_env_key() -> None:
+    assert env_key(["a", "b"], "pip") == env_key(["b", "a", "a"], "pip")
+    assert env_key(["a"], "pip") != env_key(["a"], "uv")
+    assert env_key(["a"], "pip") != env_key(["a>=1"], "pip")
+
+
+def test_cache_dir_override(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CHECK_SDIST_CACHE_DIR", str(tmp_path))
+    assert cache_dir() == tmp_path
+
+
+def test_file_lock_nonblocking(tmp_path: Path) -> None:
+    lock = tmp_path / "sub" / "x.lock"
+    with file_lock(lock) as locked:
+        assert locked
+        with file_lock(lock, blocking=False) as again:
+            assert not again
+    with file_lock(lock, blocking=False) as locked:
+        assert locked
+
+
+def test_evict_lru(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(buildenv_mod, "MAX_SIZE", 150)
+    for age, name in enumerate(["new", "mid", "old", "busy"]):
+        env = tmp_path / name
+        env.mkdir()
+        env.joinpath("data").write_bytes(b"x" * 100)
+        os.utime(env, (1000 - age, 1000 - age))
+
+    with file_lock(tmp_path / "busy.lock"):
+        evict(tmp_path)
+
+    assert {p.name for p in tmp_path.iterdir() if p.is_dir()} == {"new", "busy"}
+
+
+def test_build_env_ready(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    env = BuildEnv(tmp_path / "env", "pip")
+    assert not env.ready()
+
+    tmp_path.joinpath("env").mkdir()
+    tmp_path.joinpath("env/check-sdist-env.json").write_text(
+        json.dumps({"created": 1.0, "requires": ["x"]})
+    )
+    assert env.installed() == {"x"}
+    monkeypatch.setattr("check_sdist.buildenv.time.time", lambda: 2.0)
+    assert env.ready()
+    monkeypatch.setattr("check_sdist.buildenv.time.time", lambda: 1e9)
+    assert not env.ready()
+
+
+@pytest.mark.parametrize(
+    "installer",
+    [
+        pytest.param(
+            "uv", marks=pytest.mark.skipif(get_uv() is None, reason="uv not found")
+        ),
+        "pip",
+    ],
+)
+def test_reuse_env(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    installer: Literal["uv", "pip"],
+) -> None:
+    monkeypatch.setenv("CHECK_SDIST_CACHE_DIR", str(tmp_path / "cache"))
+    project = tmp_path / "project"
+    project.mkdir()
+    project.joinpath("pyproject.toml").write_text(
+        inspect.cleandoc("""
+            [build-system]
+            requires = ["flit-core"]
+            build-backend = "flit_core.buildapi"
+
+            [project]
+            name = "example"
+            version = "0.1.0"
+            description = "A test package"
+        """)
+    )
+    project.joinpath("example.py").touch()
+
+    created = []
+    original_create = BuildEnv.create
+
+    def create(self: BuildEnv, requires: list[str]) -> None:
+        created.append(self.path)
+        original_create(self, requires)
+
+    monkeypatch.setattr(BuildEnv, "create", create)
+
+    for _ in range(2):
+        files = sdist_files(project, isolated=True, installer=installer, reuse_env=True)
+        assert "example.py" in files
+
+    assert len(created) == 1
+
+    versions = env_versions(project, installer)
+    assert versions is not None
+    assert "flit_core" in versions
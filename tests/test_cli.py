@@ -4,6 +4,7 @@ import pytest
 
 from check_sdist import __version__
 from check_sdist.__main__ import main
+from check_sdist.sdist import find_sdist
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
@@ -37,3 +38,51 @@ def test_inject_junk_present_during_compare(
 
     assert present is True
     assert not tmp_path.joinpath("__pycache__").exists()
+
+
+def test_inject_junk_shadow(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """With --shadow, junk goes in the copy being built, not the source."""
+    options = {}
+
+    def fake_compare(source_dir: Path, **kwargs: object) -> int:
+        options.update(kwargs)
+        assert not source_dir.joinpath("__pycache__").exists()
+        return 0
+
+    monkeypatch.setattr("check_sdist.__main__.compare", fake_compare)
+
+    with pytest.raises(SystemExit):
+        main(["--inject-junk", "--shadow", "--source-dir", str(tmp_path)])
+
+    assert options["shadow"] is True
+    assert options["inject_junk"] is True
+
+
+def test_sdist_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """--sdist accepts a dist/ directory holding one SDist."""
+    options = {}
+
+    def fake_compare(_: Path, **kwargs: object) -> int:
+        options.update(kwargs)
+        return 0
+
+    monkeypatch.setattr("check_sdist.__main__.compare", fake_compare)
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    dist.joinpath("example-0.1.0.tar.gz").touch()
+
+    with pytest.raises(SystemExit):
+        main(["--source-dir", str(tmp_path), "--sdist", str(dist)])
+
+    assert options["prebuilt"] == find_sdist(dist)
+    assert options["keep_sdist"] is None
+
+
+def test_sdist_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(SystemExit):
+        main(["--source-dir", str(tmp_path), "--sdist", str(tmp_path)])
+    assert "No SDist (*.tar.gz) found" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        main(["--sdist", str(tmp_path), "--keep-sdist", str(tmp_path)])
+    assert "can't be combined" in capsys.readouterr().err
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import os
 import subprocess
 import sys
 from pathlib import Path
 from typing import Literal
 
 import pytest
+from corpus import PROJECTS, write_project
 
 from check_sdist.__main__ import compare
 from check_sdist._compat import tomllib
@@ -16,8 +18,7 @@ DIR = Path(__file__).parent.resolve()
 with DIR.joinpath("downstream.toml").open("rb") as f:
     packages = tomllib.load(f)["packages"]
 
-
-@pytest.mark.parametrize(
+installers = pytest.mark.parametrize(
     "installer",
     [
         pytest.param(
@@ -26,6 +27,46 @@ with DIR.joinpath("downstream.toml").open("rb") as f:
         "pip",
     ],
 )
+
+
+@installers
+@pytest.mark.parametrize("name", PROJECTS)
+def test_corpus(name: str, tmp_path: Path, installer: Literal["uv", "pip"]):
+    project = PROJECTS[name]
+    if project.backend is not None:
+        pytest.importorskip(project.backend)
+    write_project(name, tmp_path)
+    # Without isolation, the installed backend is used and nothing is downloaded
+    assert compare(tmp_path, isolated=False, installer=installer) == project.result
+
+
+@pytest.mark.parametrize("name", PROJECTS)
+def test_corpus_prediction(name: str, tmp_path: Path):
+    project = PROJECTS[name]
+    if project.backend is not None:
+        pytest.importorskip(project.backend)
+    write_project(name, tmp_path)
+    # Backends that can't predict are skipped with a note, not a failure
+    assert not compare(tmp_path, isolated=False, verify_prediction=True) & 8
+
+
+@pytest.mark.parametrize("name", PROJECTS)
+def test_corpus_content(name: str, tmp_path: Path):
+    project = PROJECTS[name]
+    if project.backend is not None:
+        pytest.importorskip(project.backend)
+    write_project(name, tmp_path)
+    # Files the backends rewrite (pyproject.toml, setup.cfg) aren't modified
+    assert (
+        not compare(tmp_path, isolated=False, installer="pip", check_content=True) & 16
+    )
+
+
+@pytest.mark.skipif(
+    not os.environ.get("CHECK_SDIST_DOWNSTREAM"),
+    reason="Clones from GitHub, set CHECK_SDIST_DOWNSTREAM=1 to run",
+)
+@installers
 @pytest.mark.parametrize(
     ("repo", "ref", "fail"), [(x["repo"], x["ref"], x.get("fail", 0)) for x in packages]
 )
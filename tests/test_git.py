@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import subprocess
+
+import pytest
+
+import check_sdist.git as git_mod
+from check_sdist.git import git_blobs, git_files, index_files
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FILES = ["a.py", "sp ace.txt", "sub/ä.py", "sub/deep/b.py", "other/c.py"]
+
+
+def git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    for name in FILES:
+        repo.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+        repo.joinpath(name).write_text(name)
+    git(repo, "init", "-q")
+    git(repo, "add", ".")
+    return repo
+
+
+def ls_files(source_dir: Path) -> frozenset[str]:
+    output = subprocess.run(
+        ["git", "ls-files", "-z"], cwd=source_dir, capture_output=True, check=True
+    ).stdout
+    return frozenset(os.fsdecode(p) for p in output.split(b"\0") if p)
+
+
+@pytest.mark.parametrize("version", ["2", "3", "4"])
+def test_index_files(repo: Path, version: str) -> None:
+    git(repo, "update-index", "--index-version", version)
+    if version == "3":
+        # Intent to add entries use the extended flags
+        repo.joinpath("new.py").touch()
+        git(repo, "add", "-N", "new.py")
+
+    assert index_files(repo) == ls_files(repo)
+    assert index_files(repo / "sub") == frozenset({"ä.py", "deep/b.py"})
+
+
+def test_index_files_cached(repo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    parsed = []
+    original = git_mod._parse_index  # noqa: SLF001
+
+    def parse(data: object) -> object:
+        parsed.append(data)
+        return original(data)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(git_mod, "_parse_index", parse)
+    index_files(repo)
+    index_files(repo / "sub")
+    assert len(parsed) == 1
+
+    repo.joinpath("d.py").touch()
+    git(repo, "add", "d.py")
+    assert "d.py" in index_files(repo)  # type: ignore[operator]
+    assert len(parsed) == 2  # noqa: PLR2004
+
+
+def test_index_files_submodule(repo: Path, tmp_path: Path) -> None:
+    inner = tmp_path / "inner"
+    inner.mkdir()
+    inner.joinpath("x.py").touch()
+    git(inner, "init", "-q")
+    git(inner, "add", ".")
+    git(inner, "-c", "user.name=a", "-c", "user.email=a@b", "commit", "-qm", "x")
+    git(repo, "-c", "protocol.file.allow=always", "submodule", "add", "-q", str(inner))
+
+    assert index_files(repo) is None
+    assert "inner" in index_files(repo, recurse_submodules=False)  # type: ignore[operator]
+    assert "inner/x.py" in git_files(repo)
+
+
+def test_git_files_fallback(repo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GIT_INDEX_FILE", str(repo / ".git" / "index"))
+    assert index_files(repo) is None
+    assert git_files(repo) == frozenset(FILES)
+
+
+def test_git_blobs(repo: Path, tmp_path: Path) -> None:
+    git(repo, "update-index", "--chmod=+x", "a.py")
+    blobs = git_blobs(repo / "sub")
+    assert set(blobs) == {"ä.py", "deep/b.py"}
+    object_id = subprocess.run(
+        ["git", "hash-object", "--stdin"],
+        input=b"sub/deep/b.py",
+        capture_output=True,
+        check=True,
+    ).stdout.decode()
+    assert blobs["deep/b.py"] == ("100644", object_id.strip())
+    assert git_blobs(repo)["a.py"][0] == "100755"
+
+    # Submodules are listed by their files, or skipped
+    sub = tmp_path / "submodule"
+    sub.mkdir()
+    sub.joinpath("s.py").write_text("s")
+    git(sub, "init", "-q")
+    git(sub, "add", ".")
+    git(sub, "-c", "user.name=a", "-c", "user.email=a@b", "commit", "-qm", "init")
+    git(repo, "-c", "protocol.file.allow=always", "submodule", "add", "-q", str(sub))
+    assert "submodule/s.py" in git_blobs(repo)
+    assert "submodule" not in git_blobs(repo, recurse_submodules=False)
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import subprocess
+from typing import Any
+
+import pytest
+
+import check_sdist.__main__ as main_mod
+from check_sdist.__main__ import compare
+from check_sdist.backends.none import NoneBackend
+from check_sdist.incremental import (
+    git_changes,
+    record_check,
+    reuse_listing,
+    staged_unaffected,
+)
+from check_sdist.store import DirectoryStore
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+GIT_ONLY = 2
+
+
+def git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=a", "-c", "user.email=a@b", *args],
+        cwd=repo,
+        check=True,
+    )
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q")
+    repo.joinpath("a.py").write_text("a = 1\n")
+    repo.joinpath("docs").mkdir()
+    repo.joinpath("docs/index.md").write_text("# Docs\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-qm", "init")
+    return repo
+
+
+def test_git_changes(git_repo: Path) -> None:
+    git_repo.joinpath("a.py").write_text("a = 2\n")
+    git(git_repo, "mv", "docs/index.md", "docs/main.md")
+    assert sorted(git_changes(git_repo, "HEAD")) == [
+        ("A", "docs/main.md"),
+        ("D", "docs/index.md"),
+        ("M", "a.py"),
+    ]
+    assert git_changes(git_repo / "docs", "HEAD") == [
+        ("D", "index.md"),
+        ("A", "main.md"),
+    ]
+
+
+def test_record_check(git_repo: Path, tmp_path: Path) -> None:
+    git_repo.joinpath("b.py").touch()
+    record = record_check(git_repo, frozenset({"a.py", "PKG-INFO"}))
+    assert record is not None
+    assert record["files"] == ["PKG-INFO", "a.py"]
+    assert record["untracked"] == ["b.py"]
+    assert sorted(record["tracked"]) == ["a.py", "docs/index.md"]
+
+    assert record_check(tmp_path, frozenset()) is None
+
+
+def test_record_check_read_only(git_repo: Path) -> None:
+    git_repo.joinpath("a.py").write_text("a = 2\n")
+    objects = sorted(git_repo.joinpath(".git/objects").rglob("*"))
+    record = record_check(git_repo, frozenset({"a.py"}))
+    assert record is not None
+    assert reuse_listing(record, git_repo, pyproject={}, backend=NoneBackend())
+    assert sorted(git_repo.joinpath(".git/objects").rglob("*")) == objects
+
+
+def touch(repo: Path, name: str, *, add: bool = False) -> None:
+    repo.joinpath(name).touch()
+    if add:
+        git(repo, "add", name)
+
+
+def touch_ignored(repo: Path, name: str) -> None:
+    repo.joinpath(".git/info/exclude").write_text(f"{name}\n")
+    touch(repo, name)
+
+
+CHANGES: dict[str, tuple[Callable[[Path], object], bool]] = {
+    "nothing": (lambda _: None, True),
+    "edit": (lambda r: r.joinpath("a.py").write_text("a = 2\n"), True),
+    "rm-git-only": (lambda r: git(r, "rm", "-q", "docs/index.md"), True),
+    "rm-sdist": (lambda r: git(r, "rm", "-q", "a.py"), False),
+    "untracked": (lambda r: touch(r, "b.py"), False),
+    "untracked-ignored": (lambda r: touch(r, "build.log"), True),
+    "gitignored": (lambda r: touch_ignored(r, "a.so"), False),
+    "gitignored-ignored": (lambda r: touch_ignored(r, "build.log"), True),
+    "rm-unstaged": (lambda r: r.joinpath("a.py").unlink(), False),
+    "add-ignored": (lambda r: touch(r, "docs/b.md", add=True), True),
+    "add": (lambda r: touch(r, "b.py", add=True), False),
+    "config": (lambda r: r.joinpath(".gitignore").write_text("*.md\n"), False),
+    "rename": (lambda r: git(r, "mv", "a.py", "b.py"), False),
+}
+
+
+@pytest.mark.parametrize("name", CHANGES)
+def test_reuse_listing(git_repo: Path, name: str) -> None:
+    change, reused = CHANGES[name]
+    config = {"git-only": ["docs"], "sdist-only": ["*.log"]}
+    pyproject = {"tool": {"check-sdist": config}}
+    listed = frozenset({"a.py", "PKG-INFO"})
+    record = record_check(git_repo, listed)
+    git(git_repo, "commit", "-qm", "empty", "--allow-empty")
+
+    change(git_repo)
+    result = reuse_listing(record, git_repo, pyproject=pyproject, backend=NoneBackend())
+    assert result == (listed if reused else None)
+
+
+def test_reuse_listing_mode_all(git_repo: Path) -> None:
+    pyproject = {"tool": {"check-sdist": {"mode": "all"}}}
+    record = record_check(git_repo, frozenset({"a.py"}))
+    assert (
+        reuse_listing(record, git_repo, pyproject=pyproject, backend=NoneBackend())
+        is None
+    )
+
+
+def test_compare_reuses_last_check(
+    git_repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sdist = {"a.py", "pyproject.toml", "PKG-INFO"}
+    builds = 0
+
+    def fake_sdist_files(*_: object, **__: object) -> frozenset[str]:
+        nonlocal builds
+        builds += 1
+        return frozenset(sdist)
+
+    monkeypatch.setattr(main_mod, "sdist_files", fake_sdist_files)
+    store = DirectoryStore(tmp_path / "store")
+    options: dict[str, Any] = {"isolated": False, "installer": "pip", "store": store}
+
+    git_repo.joinpath("pyproject.toml").write_text(
+        '[tool.check-sdist]\ngit-only = ["docs"]\n'
+    )
+    git(git_repo, "add", "pyproject.toml")
+    git(git_repo, "commit", "-qm", "config")
+    assert compare(git_repo, **options) == 0
+    assert builds == 1
+
+    # A new commit changes the stored SDist key, but nothing that matters
+    git_repo.joinpath("a.py").write_text("a = 2\n")
+    git_repo.joinpath("docs/more.md").touch()
+    git(git_repo, "add", ".")
+    git(git_repo, "commit", "-qm", "edit")
+    assert compare(git_repo, **options) == 0
+    assert builds == 1
+
+    # Adding a file needs a build
+    git_repo.joinpath("b.py").touch()
+    git(git_repo, "add", "b.py")
+    assert compare(git_repo, **options) == GIT_ONLY
+    assert builds == len(["start", "added b.py"])
+
+    assert compare(git_repo, **options, refresh_cache=True) == GIT_ONLY
+    assert builds == len(["start", "added b.py", "refresh"])
+
+
+def test_reuse_listing_undone(git_repo: Path) -> None:
+    # Checked with a staged file, which is then removed again
+    touch(git_repo, "b.py", add=True)
+    listed = frozenset({"a.py", "b.py", "PKG-INFO"})
+    record = record_check(git_repo, listed)
+    git(git_repo, "rm", "-q", "--cached", "b.py")
+    git_repo.joinpath("b.py").unlink()
+    assert reuse_listing(record, git_repo, pyproject={}, backend=NoneBackend()) is None
+
+
+@pytest.mark.parametrize("name", CHANGES)
+def test_staged_unaffected(git_repo: Path, name: str) -> None:
+    change, _ = CHANGES[name]
+    pyproject = {"tool": {"check-sdist": {"git-only": ["docs"]}}}
+    change(git_repo)
+    git(git_repo, "add", "-A")
+    # Removing a file removes it from the SDist too, and ignored files aren't
+    # staged
+    skipped = name in {
+        "nothing",
+        "edit",
+        "rm-git-only",
+        "rm-sdist",
+        "rm-unstaged",
+        "add-ignored",
+        "gitignored",
+        "gitignored-ignored",
+    }
+    assert (
+        staged_unaffected(git_repo, pyproject=pyproject, backend=NoneBackend())
+        == skipped
+    )
+
+
+def test_staged_kept_on_disk(git_repo: Path) -> None:
+    git(git_repo, "rm", "-q", "--cached", "docs/index.md")
+    assert not staged_unaffected(git_repo, pyproject={}, backend=NoneBackend())
+
+
+def test_compare_staged(
+    git_repo: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    def fake_sdist_files(*_: object, **__: object) -> frozenset[str]:
+        return frozenset({"a.py", "PKG-INFO"})
+
+    monkeypatch.setattr(main_mod, "sdist_files", fake_sdist_files)
+
+    git_repo.joinpath("a.py").write_text("a = 2\n")
+    git(git_repo, "add", "a.py")
+    assert compare(git_repo, isolated=True, installer="pip", staged=True) == 0
+    assert "Staged changes don't affect the SDist" in capsys.readouterr().out
+
+    git_repo.joinpath("b.py").touch()
+    git(git_repo, "add", "b.py")
+    assert compare(git_repo, isolated=True, installer="pip", staged=True) == GIT_ONLY
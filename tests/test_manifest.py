@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import inspect
+
+import pytest
+
+from check_sdist.manifest import Template, translate_pattern
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FILES = frozenset(
+    {
+        "README.md",
+        "setup.py",
+        ".hidden.txt",
+        "docs/index.md",
+        "docs/api/index.md",
+        "docs/_build/html/index.html",
+        "src/pkg/__init__.py",
+        "src/pkg/data.json",
+        "src/pkg/sub/data.json",
+        "tests/test_a.py",
+        "tests/__pycache__/test_a.pyc",
+    }
+)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path"),
+    [
+        ("*.md", "README.md"),
+        ("docs/*.md", "docs/index.md"),
+        ("docs/**/*.md", "docs/index.md"),
+        ("docs/**/*.md", "docs/api/index.md"),
+        ("**", "docs/api/index.md"),
+        ("data.[jt]son", "data.json"),
+        ("[", "["),
+        ("*.txt", ".hidden.txt"),
+    ],
+)
+def test_translate_pattern(pattern: str, path: str) -> None:
+    assert translate_pattern(pattern).match(path)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path"),
+    [("*.md", "docs/index.md"), ("data.[!j]son", "data.json")],
+)
+def test_translate_pattern_no_match(pattern: str, path: str) -> None:
+    assert not translate_pattern(pattern).match(path)
+
+
+def test_translate_pattern_not_hidden() -> None:
+    assert not translate_pattern("*.txt", hidden=False).match(".hidden.txt")
+    assert not translate_pattern("**/*.txt", hidden=False).match(".a/b.txt")
+    assert translate_pattern(".*.txt", hidden=False).match(".hidden.txt")
+    assert translate_pattern("**/*.txt", hidden=False).match("a/b.txt")
+
+
+def test_template_parsing() -> None:
+    template = Template(
+        inspect.cleandoc(
+            r"""
+            # A comment
+            include README.md  # trailing comment
+            include weird\#name
+            recursive-include src \
+                *.json *.txt
+            graft
+            prune docs extra
+            unknown foo
+            """
+        )
+    )
+    assert template.commands == [
+        ("include", ("README.md",)),
+        ("include", ("weird#name",)),
+        ("recursive-include", ("src", "*.json", "*.txt")),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("text", "added"),
+    [
+        ("include *.md", {"README.md"}),
+        ("include ./*.md", {"README.md"}),
+        ("include *.txt", {".hidden.txt"}),
+        ("global-include *.json", {"src/pkg/data.json", "src/pkg/sub/data.json"}),
+        (
+            "recursive-include src *.json",
+            {"src/pkg/data.json", "src/pkg/sub/data.json"},
+        ),
+        ("recursive-include src/pkg/sub *.json", {"src/pkg/sub/data.json"}),
+        (
+            "recursive-include . *.md",
+            {"README.md", "docs/index.md", "docs/api/index.md"},
+        ),
+        (
+            "graft docs\nprune docs/_build",
+            {"docs/index.md", "docs/api/index.md"},
+        ),
+        ("graft tests\nglobal-exclude *.py[cod]", {"tests/test_a.py"}),
+        ("graft src\nrecursive-exclude src/pkg/sub *", {"src/pkg/data.json"}),
+    ],
+)
+def test_template_apply(text: str, added: set[str]) -> None:
+    included = {"setup.py", "src/pkg/__init__.py"}
+    assert Template(text).apply(included, FILES) == included | added
+
+
+def test_template_apply_exclude_defaults() -> None:
+    template = Template("exclude setup.py\nglobal-exclude __init__.py")
+    assert template.apply({"setup.py", "src/pkg/__init__.py"}, FILES) == set()
+
+
+def test_template_excluded() -> None:
+    template = Template(
+        "include README.md\nexclude .hidden.txt\nprune docs\nglobal-exclude *.pyc"
+    )
+    assert template.excluded(FILES) == {
+        ".hidden.txt",
+        "docs/index.md",
+        "docs/api/index.md",
+        "docs/_build/html/index.html",
+        "tests/__pycache__/test_a.pyc",
+    }
+
+
+def test_template_excluded_order() -> None:
+    template = Template("prune docs\ninclude docs/index.md\nexclude README.md")
+    assert template.excluded(FILES) == {
+        "README.md",
+        "docs/api/index.md",
+        "docs/_build/html/index.html",
+    }
+
+
+def test_template_read(tmp_path: Path) -> None:
+    assert Template.read(tmp_path) is None
+    tmp_path.joinpath("MANIFEST.in").write_text("include README.md\n")
+    template = Template.read(tmp_path)
+    assert template is not None
+    assert template.commands == [("include", ("README.md",))]
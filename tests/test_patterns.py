@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import pathspec
+import pytest
+
+from check_sdist.backends import glob_filter
+from check_sdist.patterns import FileIndex, compile_patterns, default_ignore
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FILES = frozenset(
+    {
+        "a.py",
+        "a.txt",
+        "build/x.py",
+        "src/build/y.py",
+        "src/pkg/__init__.py",
+        "src/pkg/data/z.txt",
+        "docs/conf.py",
+        ".hidden/a.py",
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        [],
+        ["*.txt"],
+        ["build/"],
+        ["/build"],
+        ["src/**/data"],
+        ["*/", "a.py"],
+        [".*", "docs", "**/__init__.py"],
+        ["*.txt", "!src/pkg/data/z.txt"],
+        ["src/", "!src/pkg/"],
+        ["# comment", "", "a.*"],
+    ],
+)
+def test_matches_pathspec(patterns: list[str]) -> None:
+    spec = pathspec.GitIgnoreSpec.from_lines(patterns)
+    expected = frozenset(p for p in FILES if not spec.match_file(p))
+
+    matcher = compile_patterns(patterns)
+    assert matcher.filter(FILES) == expected
+    assert {p for p in FILES if not matcher.match_file(p)} == expected
+
+
+def test_compile_reused() -> None:
+    assert compile_patterns(["*.txt", "build/"]) is compile_patterns(
+        ("*.txt", "build/")
+    )
+    assert compile_patterns(["*.txt", "build/"]) is not compile_patterns(
+        ["build/", "*.txt"]
+    )
+
+
+def test_default_ignore() -> None:
+    assert "noxfile.py" in default_ignore()
+    assert default_ignore() is default_ignore()
+
+
+TREE = frozenset(
+    {
+        "Cargo.toml",
+        "src/lib.rs",
+        "src/py/mod.py",
+        "target/debug/build/x.rs",
+        "target/debug/out.o",
+        ".venv/lib/site.py",
+        "docs/index.md",
+    }
+)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("Cargo.toml", {"Cargo.toml"}),
+        ("*.toml", {"Cargo.toml"}),
+        ("**/*.rs", {"src/lib.rs", "target/debug/build/x.rs"}),
+        ("src/*", {"src/lib.rs", "src/py/mod.py"}),
+        ("target", {"target/debug/build/x.rs", "target/debug/out.o"}),
+        ("target/**", {"target/debug/build/x.rs", "target/debug/out.o"}),
+        ("./docs/", {"docs/index.md"}),
+        ("*.md/", set()),
+        (".*", {".venv/lib/site.py"}),
+        ("t*/*/[bo]*", {"target/debug/build/x.rs", "target/debug/out.o"}),
+        ("missing/*", set()),
+    ],
+)
+def test_file_index_glob(pattern: str, expected: set[str]) -> None:
+    assert FileIndex(TREE).glob(pattern) == expected
+
+
+@pytest.mark.parametrize(
+    ("pattern", "paths"),
+    [
+        ("docs/*.md", {"docs/index.md"}),
+        ("docs/**", {"docs", "docs/index.md", "docs/api", "docs/api/index.md"}),
+        ("docs/", {"docs"}),
+        ("./src", {"src"}),
+        ("*.txt", set()),
+        ("**/*.md", {"README.md", "docs/index.md", "docs/api/index.md"}),
+    ],
+)
+def test_file_index_match(pattern: str, paths: set[str]) -> None:
+    files = {"README.md", ".a.txt", "docs/index.md", "docs/api/index.md"}
+    files |= {".b/c.md", "src/pkg/__init__.py"}
+    assert FileIndex(files).match(pattern, hidden=False) == paths
+
+
+def test_file_index_hidden() -> None:
+    index = FileIndex({"a.txt", ".a.txt", ".b/c.txt", "d/.e/f.txt"})
+    assert index.match("*.txt") == {"a.txt", ".a.txt"}
+    assert index.match("*.txt", hidden=False) == {"a.txt"}
+    assert index.match(".*", hidden=False) == {".a.txt", ".b"}
+    assert index.glob("**/*.txt") == {"a.txt", ".a.txt", ".b/c.txt", "d/.e/f.txt"}
+    assert index.glob("**/*.txt", hidden=False) == {"a.txt"}
+    # Everything in a matched directory is selected
+    assert index.glob("d", hidden=False) == {"d/.e/f.txt"}
+
+
+def test_glob_filter_no_filesystem(tmp_path: Path) -> None:
+    files = frozenset({"keep.py", "tests/a.py", "tests/data/b.txt"})
+    assert glob_filter(["tests"], files, tmp_path / "missing") == {"keep.py"}
+
+
+def test_which() -> None:
+    matcher = compile_patterns(["*.txt", "build/"])
+    assert matcher.which("src/a.txt") == "*.txt"
+    assert matcher.which("build/x.py") == "build/"
+    assert matcher.which("a.py") is None
+
+    negated = compile_patterns(["*.txt", "!keep.txt", "data/"])
+    assert negated.which("a.txt") == "*.txt"
+    assert negated.which("keep.txt") is None
+    assert negated.which("data/keep.py") == "data/"
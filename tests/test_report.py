@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import inspect
+import io
+import json
+
+import pytest
+from corpus import write_project
+
+import check_sdist.__main__ as main_mod
+from check_sdist.__main__ import compare, main
+from check_sdist.report import file_record, write_report
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+GIT_ONLY = 2
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    tmp_path.joinpath("pyproject.toml").write_text(
+        inspect.cleandoc("""
+            [tool.check-sdist]
+            git-only = ["docs/"]
+        """)
+    )
+    monkeypatch.setattr(
+        main_mod,
+        "git_files",
+        lambda *_, **__: frozenset({"a.py", "docs/index.md", "noxfile.py", "b.py"}),
+    )
+    monkeypatch.setattr(
+        main_mod,
+        "sdist_files",
+        lambda *_, **__: frozenset({"a.py", "PKG-INFO", "x.dist-info/RECORD"}),
+    )
+    return tmp_path
+
+
+def test_write_report_json() -> None:
+    out = io.StringIO()
+    records = [file_record("a.py", "git-only"), file_record("b", "sdist-only", "b")]
+    write_report(iter(records), {"result": 3}, output_format="json", file=out)
+    assert json.loads(out.getvalue()) == {
+        "files": records,
+        "summary": {"type": "summary", "result": 3},
+    }
+
+    out = io.StringIO()
+    write_report(iter([]), {"result": 0}, output_format="json", file=out)
+    assert json.loads(out.getvalue())["files"] == []
+
+
+def test_compare_ndjson(project: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    result = compare(project, isolated=True, installer="pip", output_format="ndjson")
+    assert result == GIT_ONLY
+
+    *files, summary = map(json.loads, capsys.readouterr().out.splitlines())
+    assert sorted(files, key=lambda r: r["path"]) == [
+        file_record("b.py", "git-only"),
+        file_record("docs/index.md", "ignored-git-only", "docs/"),
+        file_record("noxfile.py", "ignored-git-only", "noxfile.py"),
+        file_record("x.dist-info/RECORD", "ignored-sdist-only", "*.dist-info"),
+    ]
+    assert summary == {
+        "type": "summary",
+        "source_dir": str(project),
+        "result": GIT_ONLY,
+        "sdist": 2,
+        "git": 4,
+        "sdist-only": 0,
+        "git-only": 1,
+    }
+
+
+def test_compare_json_verbose(
+    project: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    compare(project, isolated=True, installer="pip", output_format="json", verbose=True)
+    report = json.loads(capsys.readouterr().out)
+    assert file_record("a.py", "sdist") in report["files"]
+
+
+def test_cli_json_several_projects(tmp_path: Path) -> None:
+    with pytest.raises(SystemExit):
+        main(
+            [
+                "--source-dir",
+                str(tmp_path),
+                "--source-dir",
+                str(tmp_path),
+                "--format",
+                "json",
+            ]
+        )
+
+
+def test_cli_json_real_build(tmp_path: Path, capfd: pytest.CaptureFixture[str]) -> None:
+    pytest.importorskip("hatchling")
+    write_project("hatchling", tmp_path)
+    args = ["--source-dir", str(tmp_path), "--no-isolation", "--installer", "pip"]
+    with pytest.raises(SystemExit) as exc:
+        main([*args, "--no-cache", "--wheel", "--format", "json"])
+    assert exc.value.code == 0
+
+    # The build's own output goes to stderr, so stdout is only the report
+    out, err = capfd.readouterr()
+    assert json.loads(out)["summary"]["result"] == 0
+    assert "Successfully built" in err
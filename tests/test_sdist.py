@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import io
+import json
+import subprocess
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+from corpus import write_project
+
+import check_sdist.__main__ as main_mod
+import check_sdist.sdist as sdist_mod
+from check_sdist.__main__ import compare
+from check_sdist.git import git_blobs
+from check_sdist.sdist import (
+    archive_blobs,
+    archive_files,
+    find_sdist,
+    wheel_archive_files,
+    wheel_only_files,
+)
+from check_sdist.store import DirectoryStore
+
+GIT_ONLY = 2
+WHEEL_ONLY = 4
+MODIFIED = 16
+
+
+def make_sdist(path: Path, names: list[str]) -> Path:
+    with tarfile.open(path, "w:gz") as tar:
+        for name in names:
+            info = tarfile.TarInfo(name.rstrip("/"))
+            if name.endswith("/"):
+                info.type = tarfile.DIRTYPE
+            elif name.endswith("@"):
+                info.name = name[:-1]
+                info.type = tarfile.SYMTYPE
+                info.linkname = "target"
+            tar.addfile(info, io.BytesIO(b""))
+    return path
+
+
+def test_archive_files(tmp_path: Path) -> None:
+    sdist = make_sdist(
+        tmp_path / "pkg-1.0.tar.gz",
+        ["pkg-1.0/", "pkg-1.0/a.py", "pkg-1.0/sub/", "pkg-1.0/sub/b.py", "pkg-1.0/c@"],
+    )
+    assert archive_files(sdist) == frozenset({"a.py", "sub/b.py", "c"})
+
+
+def test_archive_files_multiple_packages(tmp_path: Path) -> None:
+    sdist = make_sdist(tmp_path / "pkg-1.0.tar.gz", ["pkg-1.0/a.py", "other/b.py"])
+    with pytest.raises(AssertionError, match="multiple packages"):
+        archive_files(sdist)
+
+
+def test_sdist_files_build_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    outdirs = []
+
+    def fake_run(
+        cmd: list[str], **kwargs: object
+    ) -> subprocess.CompletedProcess[bytes]:
+        outdir = Path(cmd[cmd.index("--outdir") + 1])
+        outdirs.append(outdir)
+        make_sdist(outdir / "pkg-1.0.tar.gz", ["pkg-1.0/a.py"])
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    build_dir = tmp_path / "ram"
+    build_dir.mkdir()
+
+    files = sdist_mod.sdist_files(
+        tmp_path, isolated=True, installer="pip", build_dir=build_dir
+    )
+
+    assert files == frozenset({"a.py"})
+    assert outdirs[0].parent == build_dir
+    assert not any(build_dir.iterdir())
+
+
+def test_sdist_files_keep_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_run(
+        cmd: list[str], **kwargs: object
+    ) -> subprocess.CompletedProcess[bytes]:
+        outdir = Path(cmd[cmd.index("--outdir") + 1])
+        make_sdist(outdir / "pkg-1.0.tar.gz", ["pkg-1.0/a.py"])
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    keep_dir = tmp_path / "keep"
+    keep_dir.mkdir()
+
+    sdist_mod.sdist_files(tmp_path, isolated=True, installer="pip", keep_dir=keep_dir)
+
+    assert archive_files(keep_dir / "pkg-1.0.tar.gz") == frozenset({"a.py"})
+
+
+def test_wheel_archive_files(tmp_path: Path) -> None:
+    path = tmp_path / "pkg-1.0-py3-none-any.whl"
+    with zipfile.ZipFile(path, "w") as whl:
+        for name in [
+            "pkg/",
+            "pkg/a.py",
+            "pkg-1.0.data/scripts/run",
+            "pkg-1.0.dist-info/RECORD",
+        ]:
+            whl.writestr(name, "")
+    assert wheel_archive_files(path) == frozenset(
+        {"pkg/a.py", "pkg-1.0.data/scripts/run"}
+    )
+
+
+def test_wheel_only_files() -> None:
+    wheel = {
+        "pkg/a.py",
+        "pkg/_version.py",
+        "pkg/generated.py",
+        "pkg-1.0.data/scripts/run",
+        "top.py",
+    }
+    sources = {"src/pkg/a.py", "src/pkg/_version.py", "scripts/run", "top.py"}
+    assert wheel_only_files(wheel, sources) == frozenset({"pkg/generated.py"})
+
+
+def pack(source_dir: Path, sdist: Path) -> Path:
+    """Make an SDist of everything in *source_dir* but .git."""
+    with tarfile.open(sdist, "w:gz") as tar:
+        for path in source_dir.iterdir():
+            if path.name != ".git":
+                tar.add(path, f"example-0.1.0/{path.name}")
+    return sdist
+
+
+def test_archive_blobs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source_dir = write_project("hatchling", tmp_path / "src")
+    source_dir.joinpath("README.md").chmod(0o755)
+    source_dir.joinpath("link.md").symlink_to("README.md")
+    subprocess.run(["git", "add", "."], cwd=source_dir, check=True)
+    sdist = pack(source_dir, tmp_path / "example-0.1.0.tar.gz")
+
+    # Large files are hashed in chunks as they're read
+    monkeypatch.setattr(sdist_mod, "CHUNK_SIZE", 16)
+    blobs = archive_blobs(sdist)
+    assert blobs == git_blobs(source_dir)
+    assert blobs["README.md"][0] == "100755"
+    assert blobs["link.md"][0] == "120000"
+
+
+def test_compare_check_content(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    source_dir = write_project("hatchling", tmp_path / "src")
+    sdist = pack(source_dir, tmp_path / "example-0.1.0.tar.gz")
+    result = compare(source_dir, isolated=False, prebuilt=sdist, check_content=True)
+    assert result == 0
+
+    # A local edit, and a mode change, that weren't committed
+    source_dir.joinpath("README.md").write_text("# Edited\n")
+    source_dir.joinpath("docs/index.md").chmod(0o755)
+    sdist = pack(source_dir, tmp_path / "example-0.1.1.tar.gz")
+    assert compare(source_dir, isolated=False, prebuilt=sdist) == 0
+    capsys.readouterr()
+    assert (
+        compare(
+            source_dir,
+            isolated=False,
+            prebuilt=sdist,
+            check_content=True,
+            output_format="json",
+        )
+        == MODIFIED
+    )
+    report = json.loads(capsys.readouterr().out)
+    modified = {r["path"] for r in report["files"] if r["category"] == "modified"}
+    assert modified == {"README.md", "docs/index.md"}
+    assert report["summary"]["modified"] == len(modified)
+
+
+def test_find_sdist(tmp_path: Path) -> None:
+    sdist = make_sdist(tmp_path / "pkg-1.0.tar.gz", ["pkg-1.0/a.py"])
+    assert find_sdist(sdist) == sdist
+    assert find_sdist(tmp_path) == sdist
+
+    with pytest.raises(FileNotFoundError, match="not found"):
+        find_sdist(tmp_path / "pkg-2.0.tar.gz")
+    tmp_path.joinpath("empty").mkdir()
+    with pytest.raises(FileNotFoundError, match="No SDist"):
+        find_sdist(tmp_path / "empty")
+
+    make_sdist(tmp_path / "pkg-0.9.tar.gz", ["pkg-0.9/a.py"])
+    with pytest.raises(ValueError, match="Several SDists"):
+        find_sdist(tmp_path)
+
+
+def test_compare_prebuilt(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source_dir = write_project("hatchling", tmp_path / "src")
+    tracked = subprocess.run(
+        ["git", "ls-files"], cwd=source_dir, capture_output=True, text=True, check=True
+    ).stdout.split()
+    names = [f"example-0.1.0/{p}" for p in [*tracked, "PKG-INFO"]]
+    sdist = make_sdist(tmp_path / "example-0.1.0.tar.gz", names)
+
+    def no_build(*args: object, **kwargs: object) -> frozenset[str]:
+        msg = "The prebuilt SDist should be used"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(main_mod, "list_sdist", no_build)
+    assert compare(source_dir, isolated=False, prebuilt=sdist) == 0
+
+    sdist = make_sdist(sdist, [n for n in names if not n.endswith("README.md")])
+    assert compare(source_dir, isolated=False, prebuilt=sdist) == GIT_ONLY
+
+
+def test_compare_keep_sdist(tmp_path: Path) -> None:
+    pytest.importorskip("hatchling")
+    source_dir = write_project("hatchling", tmp_path / "src")
+    kept = tmp_path / "dist"
+    assert compare(source_dir, isolated=False, installer="pip", keep_sdist=kept) == 0
+    (sdist,) = kept.glob("*.tar.gz")
+
+    # The kept SDist can be checked again, and a wheel built, without a rebuild
+    assert compare(source_dir, isolated=False, prebuilt=sdist, wheel=True) == 0
+    assert list(kept.iterdir()) == [sdist]
+
+
+def test_compare_wheel(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    pytest.importorskip("hatchling")
+    write_project("hatchling", tmp_path)
+    assert compare(tmp_path, isolated=False, installer="pip", wheel=True) == 0
+
+    # A file can be mapped somewhere in the wheel that no source file is
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text(
+        pyproject.read_text()
+        + '\n[tool.hatch.build.targets.wheel.force-include]\n"README.md" = "example/README.md"\n'
+    )
+    capsys.readouterr()
+    assert compare(tmp_path, isolated=False, installer="pip", wheel=True) == WHEEL_ONLY
+    assert "Wheel only (not in the SDist or git):\n  example/README.md" in (
+        capsys.readouterr().out
+    )
+
+
+def test_compare_predict(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    write_project("setuptools-missing-docs", tmp_path)
+
+    def no_build(*args: object, **kwargs: object) -> frozenset[str]:
+        msg = "The SDist should be predicted"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(main_mod, "sdist_files", no_build)
+    assert compare(tmp_path, isolated=False, installer="pip", predict=True) == GIT_ONLY
+
+
+def test_compare_verify_prediction(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    pytest.importorskip("setuptools")
+    write_project("setuptools", tmp_path)
+    assert (
+        compare(tmp_path, isolated=False, installer="pip", verify_prediction=True) == 0
+    )
+
+    # A build option the prediction doesn't know about
+    tmp_path.joinpath("setup.py").write_text(
+        "from setuptools import setup\nsetup(**{})\n"
+    )
+    subprocess.run(["git", "add", "setup.py"], cwd=tmp_path, check=True)
+    capsys.readouterr()
+    assert (
+        compare(tmp_path, isolated=False, installer="pip", verify_prediction=True) == 0
+    )
+    assert "Can't predict the SDist" in capsys.readouterr().err
+
+
+def test_compare_verify_prediction_builds(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    project = tmp_path / "project"
+    write_project("setuptools", project)
+    store = DirectoryStore(tmp_path / "store")
+    builds = []
+
+    def fake_sdist_files(source_dir: Path, **_: object) -> frozenset[str]:
+        builds.append(source_dir)
+        return frozenset({"PKG-INFO"})
+
+    monkeypatch.setattr(main_mod, "sdist_files", fake_sdist_files)
+    options: dict[str, Any] = {"isolated": False, "installer": "pip", "store": store}
+    compare(project, **options)
+    assert len(builds) == 1
+
+    # The stored listing isn't used, it's compared with a real build
+    compare(project, **options, verify_prediction=True)
+    assert len(builds) == len(["first", "verify"])
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import subprocess
+
+import pytest
+from corpus import write_project
+
+from check_sdist.__main__ import compare
+from check_sdist.shadow import shadow_tree
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=a", "-c", "user.email=a@b", *args],
+        cwd=repo,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    repo.joinpath("pkg/sub").mkdir(parents=True)
+    git(repo, "init", "-q")
+    repo.joinpath(".gitignore").write_text("*.log\n")
+    repo.joinpath("pkg/a.py").write_text("a = 1\n")
+    repo.joinpath("pkg/sub/b.py").write_text("b = 1\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-qm", "init")
+    git(repo, "tag", "v1.0")
+    repo.joinpath("pkg/staged.py").touch()
+    git(repo, "add", "pkg/staged.py")
+    repo.joinpath("pkg/untracked.py").touch()
+    repo.joinpath("pkg/ignored.log").touch()
+    return repo
+
+
+def test_shadow_tree(git_repo: Path, tmp_path: Path) -> None:
+    with shadow_tree(git_repo, build_dir=tmp_path) as shadow:
+        assert shadow != git_repo
+        found = {
+            p.relative_to(shadow).as_posix() for p in shadow.rglob("*") if p.is_file()
+        }
+        assert {p for p in found if not p.startswith(".git/")} == {
+            ".gitignore",
+            "pkg/a.py",
+            "pkg/staged.py",
+            "pkg/sub/b.py",
+            "pkg/untracked.py",
+        }
+        # Git sees the same state, and tags, without touching the original
+        assert git(shadow, "status", "--porcelain") == git(
+            git_repo, "status", "--porcelain"
+        )
+        assert git(shadow, "describe", "--tags", "HEAD").strip() == "v1.0"
+
+        shadow.joinpath("pkg/a.py").write_text("a = 2\n")
+        assert git_repo.joinpath("pkg/a.py").read_text() == "a = 1\n"
+    assert not shadow.exists()
+
+
+def test_shadow_tree_subdir(git_repo: Path) -> None:
+    with shadow_tree(git_repo / "pkg") as shadow:
+        assert shadow.name == "pkg"
+        assert shadow.joinpath("sub/b.py").is_file()
+        assert not shadow.parent.joinpath(".gitignore").exists()
+
+
+def test_compare_shadow(tmp_path: Path) -> None:
+    pytest.importorskip("setuptools")
+    write_project("setuptools", tmp_path)
+    before = {p.relative_to(tmp_path) for p in tmp_path.rglob("*")}
+
+    # "graft tests" picks up the injected __pycache__ directories
+    assert (
+        compare(
+            tmp_path,
+            isolated=False,
+            installer="pip",
+            shadow=True,
+            inject_junk=True,
+        )
+        == 1
+    )
+    # But there's no egg-info or junk left in the source directory
+    assert {p.relative_to(tmp_path) for p in tmp_path.rglob("*")} == before
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from check_sdist.__main__ import load_pyproject
+from check_sdist.backends import resolve_backend
+from check_sdist.store import DirectoryStore, sdist_key
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$", re.MULTILINE)
+
+#: Modules only needed for checking a project, or for building it
+CHECKING = {
+    "build",
+    "check_sdist.backends",
+    "check_sdist.git",
+    "check_sdist.patterns",
+    "check_sdist.store",
+    "json",
+    "packaging",
+    "pathspec",
+    "subprocess",
+    "tarfile",
+    "tomli",
+    "tomllib",
+}
+BUILDING = {
+    "build",
+    "check_sdist.buildenv",
+    "check_sdist.sdist",
+    "pyproject_hooks",
+    "tarfile",
+}
+#: Modules only needed by options the commands below don't use
+OPTIONS = {
+    "check_sdist.batch",
+    "check_sdist.inject",
+    "check_sdist.report",
+    "check_sdist.walk",
+    "check_sdist.watch",
+}
+
+#: The modules each command must not import. Without lazy imports
+#: (__lazy_modules__, Python 3.15+) everything is imported up front.
+BUDGETS = {
+    "version": CHECKING | OPTIONS,
+    "help": CHECKING | OPTIONS,
+    "cached": BUILDING | OPTIONS,
+}
+
+lazy_imports = pytest.mark.skipif(
+    sys.version_info < (3, 15), reason="Needs lazy imports (Python 3.15+)"
+)
+
+
+def import_times(stderr: str) -> dict[str, tuple[int, int]]:
+    """Map each module in ``-X importtime`` output to its (self, cumulative) µs."""
+    return {m[4]: (int(m[1]), int(m[2])) for m in IMPORTTIME.finditer(stderr)}
+
+
+def run_cli(*args: str, cwd: Path | None = None) -> dict[str, tuple[int, int]]:
+    # Import the entry point the way the console script does
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "from check_sdist.__main__ import main; main()",
+            *args,
+        ],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONWARNINGS": "ignore"},
+        check=False,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    return import_times(result.stderr)
+
+
+def check_budget(times: dict[str, tuple[int, int]], budget: set[str]) -> None:
+    loaded = {m for m in times if any(m == b or m.startswith(f"{b}.") for b in budget)}
+    if loaded:
+        slowest = sorted(times.items(), key=lambda item: -item[1][0])[:10]
+        breakdown = "\n".join(
+            f"  {name}: {self_us} µs self, {cum_us} µs cumulative"
+            for name, (self_us, cum_us) in [
+                *((m, times[m]) for m in sorted(loaded)),
+                *slowest,
+            ]
+        )
+        pytest.fail(f"Imported {sorted(loaded)}, slowest and unexpected:\n{breakdown}")
+
+
+def test_import_times() -> None:
+    stderr = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:        45 |        300 | pathlib
+import time:        80 |        380 |     pathlib._local
+"""
+    assert import_times(stderr) == {
+        "_io": (120, 120),
+        "pathlib": (45, 300),
+        "pathlib._local": (80, 380),
+    }
+
+
+@lazy_imports
+@pytest.mark.parametrize("arg", ["version", "help"])
+def test_startup(arg: str) -> None:
+    times = run_cli(f"--{arg}")
+    assert "check_sdist.__main__" in times
+    check_budget(times, BUDGETS[arg])
+
+
+@lazy_imports
+def test_startup_cached(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    repo.joinpath("pyproject.toml").write_text(
+        '[tool.check-sdist]\nbuild-backend = "none"\n'
+    )
+    subprocess.run(["git", "add", "."], cwd=repo, check=True)
+
+    pyproject = load_pyproject(repo)
+    key = sdist_key(
+        repo,
+        pyproject=pyproject,
+        backend=resolve_backend("none", pyproject),
+        isolated=False,
+        installer="pip",
+    )
+    assert key is not None
+    store = DirectoryStore(tmp_path / "store")
+    store.put(key, frozenset({"pyproject.toml", "PKG-INFO"}))
+
+    times = run_cli(
+        "--no-isolation", "--installer=pip", f"--cache-dir={store.path}", cwd=repo
+    )
+    check_budget(times, BUDGETS["cached"])
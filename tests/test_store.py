@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import time
+
+import pytest
+
+import check_sdist.__main__ as main_mod
+import check_sdist.buildenv as buildenv_mod
+import check_sdist.store as store_mod
+from check_sdist.__main__ import compare, main
+from check_sdist.backends.none import NoneBackend
+from check_sdist.store import DirectoryStore, sdist_key
+from check_sdist.timings import Timings
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_directory_store(tmp_path: Path) -> None:
+    store = DirectoryStore(tmp_path)
+    assert store.get("abcd") is None
+
+    store.put("abcd", frozenset({"a.py", "b/c.py"}))
+    assert store.get("abcd") == frozenset({"a.py", "b/c.py"})
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+
+def test_directory_store_age(tmp_path: Path) -> None:
+    store = DirectoryStore(tmp_path, max_age=10)
+    store.put("abcd", frozenset({"a.py"}))
+    entry = tmp_path / "ab" / "abcd.json"
+    os.utime(entry, (0, 0))
+    assert store.get("abcd") is None
+
+    store.evict()
+    assert not entry.exists()
+
+
+def test_directory_store_size(tmp_path: Path) -> None:
+    store = DirectoryStore(tmp_path, max_size=40)
+    now = time.time()
+    for i, key in enumerate(["aaaa", "bbbb", "cccc"]):
+        store.put(key, frozenset({"file.py"}))
+        os.utime(tmp_path / key[:2] / f"{key}.json", (now - 10 + i, now - 10 + i))
+    store.evict()
+
+    assert store.get("aaaa") is None
+    assert store.get("cccc") == frozenset({"file.py"})
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    repo.joinpath("a.py").write_text("a = 1\n")
+    subprocess.run(["git", "add", "."], cwd=repo, check=True)
+    return repo
+
+
+def test_sdist_key(git_repo: Path, tmp_path: Path) -> None:
+    def key(*, shadow: bool = False) -> str | None:
+        return sdist_key(
+            git_repo,
+            pyproject={},
+            backend=NoneBackend(),
+            isolated=False,
+            installer="pip",
+            shadow=shadow,
+        )
+
+    original = key()
+    assert original is not None
+    assert key() == original
+    assert key(shadow=True) not in {original, None}
+
+    git_repo.joinpath("b.py").touch()
+    untracked = key()
+    assert untracked != original
+
+    git_repo.joinpath("a.py").write_text("a = 22\n")
+    assert key() not in {original, untracked}
+
+    # MANIFEST.in can package ignored files, like in-place built extensions
+    git_repo.joinpath(".gitignore").write_text("*.so\nbuild/\n")
+    ignores = key()
+    git_repo.joinpath("a.so").touch()
+    assert key() != ignores
+    ignores = key()
+    git_repo.joinpath("build").mkdir()
+    git_repo.joinpath("build/b.py").touch()
+    assert key() != ignores
+
+    # Default junk is left out
+    ignores = key()
+    git_repo.joinpath("a.pyc").touch()
+    git_repo.joinpath(".coverage").touch()
+    assert key() == ignores
+
+    not_git = tmp_path / "not-git"
+    not_git.mkdir()
+    assert (
+        sdist_key(
+            not_git,
+            pyproject={},
+            backend=NoneBackend(),
+            isolated=False,
+            installer="pip",
+        )
+        is None
+    )
+
+
+def test_sdist_key_versions(git_repo: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def key(*, isolated: bool, reuse_env: bool = False) -> str | None:
+        return sdist_key(
+            git_repo,
+            pyproject={},
+            backend=NoneBackend(),
+            isolated=isolated,
+            installer="pip",
+            reuse_env=reuse_env,
+        )
+
+    original = key(isolated=False)
+    monkeypatch.setattr(store_mod, "_installed_version", lambda _: "0.0")
+    assert key(isolated=False) not in {original, None}
+
+    # A fresh isolated environment might get a new backend release
+    assert key(isolated=True) is None
+
+    versions: dict[str, str] | None = None
+    monkeypatch.setattr(buildenv_mod, "env_versions", lambda *_: versions)
+    assert key(isolated=True, reuse_env=True) is None
+    versions = {"setuptools": "70.0"}
+    reused = key(isolated=True, reuse_env=True)
+    assert reused is not None
+    versions = {"setuptools": "71.0"}
+    assert key(isolated=True, reuse_env=True) not in {reused, None}
+
+
+def test_compare_uses_store(
+    git_repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    builds = []
+
+    def fake_sdist_files(source_dir: Path, **_: object) -> frozenset[str]:
+        builds.append(source_dir)
+        return frozenset({"a.py", "PKG-INFO"})
+
+    monkeypatch.setattr(main_mod, "sdist_files", fake_sdist_files)
+    store = DirectoryStore(tmp_path / "store")
+
+    timings = Timings()
+    assert (
+        compare(git_repo, isolated=False, installer="pip", store=store, timings=timings)
+        == 0
+    )
+    assert {"look up stored SDist", "store SDist"} <= timings.phases.keys()
+    assert compare(git_repo, isolated=False, installer="pip", store=store) == 0
+    assert builds == [git_repo]
+
+    assert (
+        compare(
+            git_repo,
+            isolated=False,
+            installer="pip",
+            store=store,
+            refresh_cache=True,
+        )
+        == 0
+    )
+    assert builds == [git_repo, git_repo]
+
+
+@pytest.mark.parametrize("args", [[], ["--no-cache"], ["--inject-junk"]])
+def test_cli_store(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, args: list[str]
+) -> None:
+    stores = []
+
+    def fake_compare(*_: object, **kwargs: object) -> int:
+        stores.append(kwargs["store"])
+        return 0
+
+    monkeypatch.setattr(main_mod, "compare", fake_compare)
+    with pytest.raises(SystemExit):
+        main(
+            [
+                "--source-dir",
+                str(tmp_path),
+                "--cache-dir",
+                str(tmp_path / "store"),
+                *args,
+            ]
+        )
+
+    # Injected junk might be ignored by git, so caching is off
+    (store,) = stores
+    assert isinstance(store, DirectoryStore) == (not args)
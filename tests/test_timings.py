@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+import check_sdist.__main__ as main_mod
+from check_sdist.__main__ import main
+from check_sdist.timings import Timings
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_timings_accumulate(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = iter([1.0, 2.0, 10.0, 14.0])
+    monkeypatch.setattr("check_sdist.timings.time.perf_counter", lambda: next(clock))
+
+    timings = Timings()
+    with timings.phase("build"):
+        pass
+    with timings.phase("build"):
+        pass
+
+    wall, cpu = timings.phases["build"]
+    assert wall == pytest.approx(5.0)
+    assert cpu >= 0
+    report = timings.report()
+    assert "build" in report
+    assert "total" in report
+
+
+def test_background_phase(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = iter([0.0, 8.0, 1.0, 3.0])
+    monkeypatch.setattr("check_sdist.timings.time.perf_counter", lambda: next(clock))
+
+    timings = Timings()
+    with timings.phase("build"):
+        pass
+    with timings.phase("list git files", background=True):
+        pass
+
+    report = timings.report()
+    assert "list git files (background)" in report
+    # Only the build counts towards the total
+    assert report.splitlines()[-1].split()[1] == "8.000s"
+
+
+def test_compare_lists_git_during_build(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    listed = threading.Event()
+
+    def fake_git_files(*_: object, **__: object) -> frozenset[str]:
+        listed.set()
+        return frozenset({"a.py"})
+
+    def fake_sdist_files(*_: object, **__: object) -> frozenset[str]:
+        assert listed.wait(timeout=10), "git wasn't listed while building"
+        return frozenset({"a.py", "PKG-INFO"})
+
+    monkeypatch.setattr(main_mod, "git_files", fake_git_files)
+    monkeypatch.setattr(main_mod, "sdist_files", fake_sdist_files)
+
+    timings = Timings()
+    assert (
+        main_mod.compare(tmp_path, isolated=True, installer="pip", timings=timings) == 0
+    )
+    assert {"compile patterns", "list git files"} <= timings.background
+
+
+def test_compare_phases(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(main_mod, "git_files", lambda *_, **__: frozenset({"a.py"}))
+    monkeypatch.setattr(
+        main_mod, "sdist_files", lambda *_, **__: frozenset({"a.py", "PKG-INFO"})
+    )
+
+    timings = Timings()
+    assert (
+        main_mod.compare(tmp_path, isolated=True, installer="pip", timings=timings) == 0
+    )
+    assert {
+        "load pyproject",
+        "resolve backend",
+        "compile patterns",
+        "list git files",
+        "compare files",
+        "match patterns",
+        "backend rules",
+    } <= timings.phases.keys()
+
+
+def test_cli_timings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    def fake_compare(*_: object, timings: Timings, **__: object) -> int:
+        with timings.phase("build SDist"):
+            pass
+        return 0
+
+    monkeypatch.setattr(main_mod, "compare", fake_compare)
+    with pytest.raises(SystemExit):
+        main(["--source-dir", str(tmp_path), "--no-cache", "--timings"])
+
+    err = capsys.readouterr().err
+    assert "build SDist" in err
+    assert "total" in err
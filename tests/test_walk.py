@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import inspect
+
+import pytest
+
+import check_sdist.__main__ as main_mod
+from check_sdist.__main__ import compare
+from check_sdist.walk import gitignore_patterns, walk_files
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+
+GIT_ONLY = 2
+
+SOURCE = [
+    ".git/HEAD",
+    ".gitignore",
+    "pkg/__init__.py",
+    "pkg/mod.pyc",
+    "pkg/.gitignore",
+    "pkg/gen/out.c",
+    "pkg/sub/gen/out.c",
+    "build/lib/x.py",
+    "docs/gen/index.md",
+]
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    for name in SOURCE:
+        tmp_path.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(name).touch()
+    tmp_path.joinpath(".gitignore").write_text("*.pyc\n/build/\n")
+    tmp_path.joinpath("pkg/.gitignore").write_text("# generated\ngen/\n")
+    return tmp_path
+
+
+def test_gitignore_patterns() -> None:
+    lines = ["# comment", "", "gen/", "/top", "a/b", "!keep.c", "*.o  "]
+    assert list(gitignore_patterns(lines, "")) == [
+        "gen/",
+        "/top",
+        "a/b",
+        "!keep.c",
+        "*.o",
+    ]
+    assert list(gitignore_patterns(lines, "pkg")) == [
+        "pkg/**/gen/",
+        "pkg/top",
+        "pkg/a/b",
+        "!pkg/**/keep.c",
+        "pkg/**/*.o",
+    ]
+
+
+def test_walk_files(source: Path) -> None:
+    assert walk_files(source) == frozenset(SOURCE)
+
+
+def test_walk_files_prune(source: Path) -> None:
+    visited = []
+
+    def prune(directory: str) -> bool:
+        visited.append(directory)
+        return directory in {".git", "pkg/sub"}
+
+    files = walk_files(source, prune=prune)
+    assert files == frozenset(SOURCE) - {".git/HEAD", "pkg/sub/gen/out.c"}
+    assert "pkg/sub/gen" not in visited
+
+
+def test_walk_files_gitignore(source: Path) -> None:
+    assert walk_files(source, gitignore=True) == {
+        ".gitignore",
+        "pkg/__init__.py",
+        "pkg/.gitignore",
+        "docs/gen/index.md",
+    }
+
+
+def test_compare_all_mode(source: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source.joinpath("pyproject.toml").write_text(
+        inspect.cleandoc("""
+            [tool.check-sdist]
+            mode = "all"
+            git-only = [".git", ".gitignore", "build/", "*.pyc", "gen/"]
+        """)
+    )
+    monkeypatch.setattr(
+        main_mod,
+        "sdist_files",
+        lambda *_, **__: frozenset(
+            {"PKG-INFO", "pyproject.toml", "pkg/__init__.py", "pkg/gen/out.c"}
+        ),
+    )
+    # The SDist's gen/ directory is still checked, and matches
+    assert compare(source, isolated=True, installer="pip") == 0
+
+    source.joinpath("pkg/new.py").touch()
+    assert compare(source, isolated=True, installer="pip") == GIT_ONLY
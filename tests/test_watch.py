@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import subprocess
+
+import pytest
+
+import check_sdist.__main__ as main_mod
+from check_sdist.patterns import compile_patterns
+from check_sdist.watch import classify, poll_changes, watch
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+GIT_ONLY = 2
+
+
+@pytest.mark.parametrize(
+    ("changes", "action"),
+    [
+        ({("modified", "src/a.py")}, None),
+        ({("modified", ".git/objects/ab/cdef")}, None),
+        ({("modified", ".git/index")}, "rebuild"),
+        ({("added", "src/b.py")}, "rebuild"),
+        ({("deleted", "src/a.py"), ("modified", ".git/index")}, "rebuild"),
+        ({("modified", "pyproject.toml")}, "rebuild"),
+        ({("modified", "src/.gitignore")}, "rebuild"),
+        ({("modified", "hatch_build.py")}, "rebuild"),
+        ({("modified", "rust/Cargo.toml")}, "rebuild"),
+    ],
+)
+def test_classify(changes: set[tuple[str, str]], action: str | None) -> None:
+    assert classify(changes) == action
+
+
+def test_classify_git_index() -> None:
+    index = {("modified", ".git/index"), ("modified", ".git/objects/ab/cdef")}
+    assert classify(index, reads_git_index=False) == "relist"
+    assert classify(index | {("added", "b.py")}, reads_git_index=False) == "rebuild"
+
+
+def test_classify_ignored() -> None:
+    matcher = compile_patterns(["*.egg-info"])
+    egg_info = {("added", "src/pkg.egg-info/PKG-INFO")}
+    assert classify(egg_info) == "rebuild"
+    assert classify(egg_info, ignored=matcher.match_file) is None
+    # Junk git-only ignores can still end up in the SDist
+    coverage = {("added", ".coverage")}
+    assert classify(coverage, ignored=matcher.match_file) == "rebuild"
+    # Build configuration is never ignored
+    config = {("modified", "noxfile.py"), ("modified", "src/pkg.egg-info/setup.cfg")}
+    assert classify(config, ignored=matcher.match_file) == "rebuild"
+
+
+def test_classify_listed() -> None:
+    assert classify({("deleted", "docs/index.md")}) == "rebuild"
+    assert classify({("deleted", "docs/index.md")}, listed={"a.py"}) is None
+    assert classify({("deleted", "a.py")}, listed={"a.py"}) == "rebuild"
+
+
+def test_poll_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    tmp_path.joinpath("a.py").write_text("a")
+    tmp_path.joinpath("b.py").touch()
+    tmp_path.joinpath(".git").mkdir()
+    tmp_path.joinpath(".git/config").touch()
+
+    edits: Iterator[Callable[[], object]] = iter(
+        [
+            lambda: tmp_path.joinpath("sub").mkdir(),
+            lambda: tmp_path.joinpath("sub/c.py").touch(),
+            lambda: tmp_path.joinpath("b.py").rename(tmp_path / "d.py"),
+            lambda: tmp_path.joinpath("a.py").write_text("aa"),
+            lambda: tmp_path.joinpath(".git/index").touch(),
+        ]
+    )
+    monkeypatch.setattr("check_sdist.watch.time.sleep", lambda _: next(edits)())
+
+    changes = poll_changes(tmp_path, interval=0)
+    # Creating the empty directory isn't a change
+    assert next(changes) == {("added", "sub/c.py")}
+    assert next(changes) == {("deleted", "b.py"), ("added", "d.py")}
+    assert next(changes) == {("modified", "a.py")}
+    assert next(changes) == {("added", ".git/index")}
+
+
+def test_poll_changes_prune(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    tmp_path.joinpath("docs").mkdir()
+    edits: Iterator[Callable[[], object]] = iter(
+        [
+            lambda: tmp_path.joinpath("docs/index.md").touch(),
+            lambda: tmp_path.joinpath("a.py").touch(),
+        ]
+    )
+    monkeypatch.setattr("check_sdist.watch.time.sleep", lambda _: next(edits)())
+
+    changes = poll_changes(tmp_path, interval=0, prune=lambda d: d == "docs")
+    assert next(changes) == {("added", "a.py")}
+
+
+def test_poll_changes_subdirectory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    source_dir = tmp_path / "python"
+    source_dir.mkdir()
+    source_dir.joinpath("a.py").touch()
+    monkeypatch.setattr(
+        "check_sdist.watch.time.sleep",
+        lambda _: subprocess.run(["git", "add", "a.py"], cwd=source_dir, check=True),
+    )
+
+    # The index is above the source directory
+    changes = poll_changes(source_dir, interval=0)
+    assert next(changes) == {("added", ".git/index")}
+
+
+def test_watch(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # flit-core doesn't read git's index
+    tmp_path.joinpath("pyproject.toml").write_text(
+        '[build-system]\nbuild-backend = "flit_core.buildapi"\n'
+    )
+    git = {"a.py"}
+    sdist = {"a.py", "PKG-INFO"}
+    builds = 0
+
+    def fake_sdist_files(*_: object, **__: object) -> frozenset[str]:
+        nonlocal builds
+        builds += 1
+        return frozenset(sdist)
+
+    monkeypatch.setattr(main_mod, "sdist_files", fake_sdist_files)
+    monkeypatch.setattr(main_mod, "git_files", lambda *_, **__: frozenset(git))
+
+    def changes() -> Iterator[set[tuple[str, str]]]:
+        yield {("modified", "a.py")}
+        git.add("b.py")
+        yield {("modified", ".git/index")}
+        sdist.add("b.py")
+        yield {("added", "b.py")}
+        git.add("c.py")
+        yield {("modified", ".git/index")}
+
+    options = {"isolated": True, "installer": "pip"}
+    assert watch(tmp_path, options, changes=changes()) == GIT_ONLY
+    # Only adding b.py needed another build
+    assert builds == len(["start", "added b.py"])
+
+
+def test_watch_git_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    git = {"a.py"}
+    sdist = {"a.py", "PKG-INFO"}
+
+    def fake_sdist_files(*_: object, **__: object) -> frozenset[str]:
+        return frozenset(sdist)
+
+    monkeypatch.setattr(main_mod, "sdist_files", fake_sdist_files)
+    monkeypatch.setattr(main_mod, "git_files", lambda *_, **__: frozenset(git))
+
+    def changes() -> Iterator[set[tuple[str, str]]]:
+        # Like setuptools-scm, the SDist has what git tracks
+        git.add("b.py")
+        sdist.add("b.py")
+        yield {("modified", ".git/index")}
+
+    options = {"isolated": True, "installer": "pip"}
+    assert watch(tmp_path, options, changes=changes()) == 0
+
+
+def test_watch_invalid_pyproject(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr(
+        main_mod, "sdist_files", lambda *_, **__: frozenset({"a.py", "PKG-INFO"})
+    )
+    monkeypatch.setattr(main_mod, "git_files", lambda *_, **__: frozenset({"a.py"}))
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text("[tool.check-sdist\n")
+
+    def changes() -> Iterator[set[tuple[str, str]]]:
+        yield {("modified", "a.py")}
+        pyproject.write_text('[tool.check-sdist]\ngit-only = ["a.py"]\n')
+        yield {("modified", "pyproject.toml")}
+
+    options = {"isolated": True, "installer": "pip"}
+    assert watch(tmp_path, options, changes=changes()) == 0
+    assert "Invalid pyproject.toml" in capsys.readouterr().err